@@ -0,0 +1,24 @@
+"""Baseline: schema as created by app.db.init_db before migrations were introduced
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+Existing databases are marked with `alembic stamp 0001`; nothing is created here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,65 @@
+"""Indexes for the approval queue and month dropdown, phone index and comment summary tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+After upgrading, populate the new tables with
+`python3 -m app.db.rebuild_phone_index` and `python3 -m app.db.rebuild_comment_summary`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_payment_details_status_demand_date", "payment_details",
+        ["repayment_status_id", "demand_date"]
+    )
+    op.create_index(
+        "ix_payment_details_loan_demand_date_id", "payment_details",
+        ["loan_application_id", "demand_date", "id"]
+    )
+    op.create_index("ix_loan_details_applicant_id", "loan_details", ["applicant_id"])
+
+    op.create_table(
+        "contact_phone_index",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("phone", sa.String(20), nullable=False),
+        sa.Column("contact_type", sa.Integer(), nullable=False),
+        sa.Column("source_id", sa.Integer(), nullable=False),
+        sa.Column("applicant_id", sa.String(100)),
+        sa.Column("loan_application_id", sa.Integer()),
+        sa.Column("contact_name", sa.String(255)),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+        sa.UniqueConstraint("contact_type", "source_id", name="uq_contact_phone_index_source"),
+    )
+    op.create_index("ix_contact_phone_index_phone", "contact_phone_index", ["phone"])
+
+    op.create_table(
+        "comment_summary",
+        sa.Column("repayment_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("comment_type", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("comment_count", sa.Integer(), nullable=False),
+        sa.Column("latest_comment_id", sa.Integer()),
+        sa.Column("latest_comment", sa.Text()),
+        sa.Column("latest_user_id", sa.Integer()),
+        sa.Column("latest_user_name", sa.String(100)),
+        sa.Column("latest_commented_at", sa.TIMESTAMP()),
+        sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("comment_summary")
+    op.drop_index("ix_contact_phone_index_phone", table_name="contact_phone_index")
+    op.drop_table("contact_phone_index")
+    op.drop_index("ix_loan_details_applicant_id", table_name="loan_details")
+    op.drop_index("ix_payment_details_loan_demand_date_id", table_name="payment_details")
+    op.drop_index("ix_payment_details_status_demand_date", table_name="payment_details")
@@ -0,0 +1,113 @@
+"""Typed payment_id keys on comments, calling and contact tables (expand + backfill)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+Adds a nullable integer payment_id (FK to payment_details.id) next to the
+legacy text repayment_id on each table, indexes it, and backfills it from
+repayment_id. The legacy column is left in place; see alembic/README for
+the read-mode cutover and the follow-up migration that drops it.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+KEYED_TABLES = ("comments", "calling", "co_applicant", "guarantor", "reference")
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _parse_repayment_id(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backfill_payment_ids(table_name: str) -> None:
+    """Copy numeric repayment_id values that point at an existing payment into payment_id"""
+    bind = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("repayment_id", sa.Text),
+        sa.column("payment_id", sa.Integer),
+    )
+    payments = sa.table("payment_details", sa.column("id", sa.Integer))
+    set_payment_id = (
+        table.update()
+        .where(table.c.id == sa.bindparam("row_id"))
+        .values(payment_id=sa.bindparam("new_payment_id"))
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.repayment_id)
+            .where(table.c.id > last_id, table.c.payment_id.is_(None))
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        candidates = {row.id: _parse_repayment_id(row.repayment_id) for row in rows}
+        wanted = {value for value in candidates.values() if value is not None}
+        if not wanted:
+            continue
+        existing = set(bind.execute(sa.select(payments.c.id).where(payments.c.id.in_(wanted))).scalars())
+
+        updates = [
+            {"row_id": row_id, "new_payment_id": value}
+            for row_id, value in candidates.items()
+            if value in existing
+        ]
+        if updates:
+            bind.execute(set_payment_id, updates)
+
+
+def upgrade() -> None:
+    for table_name in KEYED_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column("payment_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                f"fk_{table_name}_payment_id", "payment_details", ["payment_id"], ["id"]
+            )
+
+    # Composite indexes serving the per-repayment lookups
+    op.create_index(
+        "ix_comments_payment_type_commented_at", "comments",
+        ["payment_id", "comment_type", "commented_at"]
+    )
+    op.create_index(
+        "ix_calling_payment_kind_contact_created", "calling",
+        ["payment_id", "Calling_id", "contact_type", "created_at"]
+    )
+    for table_name in ("co_applicant", "guarantor", "reference"):
+        op.create_index(f"ix_{table_name}_payment_id", table_name, ["payment_id"])
+
+    for table_name in KEYED_TABLES:
+        _backfill_payment_ids(table_name)
+
+
+def downgrade() -> None:
+    # MySQL keeps an index alive while a foreign key uses it: drop the keys first
+    for table_name in KEYED_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_constraint(f"fk_{table_name}_payment_id", type_="foreignkey")
+
+    for table_name in ("co_applicant", "guarantor", "reference"):
+        op.drop_index(f"ix_{table_name}_payment_id", table_name=table_name)
+    op.drop_index("ix_calling_payment_kind_contact_created", table_name="calling")
+    op.drop_index("ix_comments_payment_type_commented_at", table_name="comments")
+
+    for table_name in KEYED_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("payment_id")
@@ -0,0 +1,27 @@
+"""FULLTEXT index on comments.comment for comment search
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+MySQL only. SQLite databases get an FTS5 table from
+app.services.comment_search.ensure_search_index instead.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        op.create_index("ft_comments_comment", "comments", ["comment"], mysql_prefix="FULLTEXT")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        op.drop_index("ft_comments_comment", table_name="comments")
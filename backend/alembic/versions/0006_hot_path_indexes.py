@@ -0,0 +1,71 @@
+"""Indexes for the application list, summary, contacts and recent activity filters
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+Covers the joins and filters behind /application-row, /summary-status,
+/contacts and /recent-activity. After upgrading, check the plans with
+`python3 benchmarks/check_query_plans.py --database-url <url>`.
+"""
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, dialect options)
+INDEXES = [
+    # Month / PTP filters on the application list and summary
+    ("ix_payment_details_demand_date", "payment_details", ["demand_date"], {}),
+    ("ix_payment_details_ptp_date", "payment_details", ["ptp_date"], {}),
+    (
+        "ix_payment_details_year_month_status", "payment_details",
+        ["demand_year", "demand_month", "repayment_status_id"], {}
+    ),
+    # RM / TL / lender filters and joins
+    (
+        "ix_loan_details_Collection_relationship_manager_id", "loan_details",
+        ["Collection_relationship_manager_id"], {}
+    ),
+    (
+        "ix_loan_details_source_relationship_manager_id", "loan_details",
+        ["source_relationship_manager_id"], {}
+    ),
+    ("ix_loan_details_current_team_lead_id", "loan_details", ["current_team_lead_id"], {}),
+    ("ix_loan_details_source_team_lead_id", "loan_details", ["source_team_lead_id"], {}),
+    ("ix_loan_details_lenders_id", "loan_details", ["lenders_id"], {}),
+    # Branch / dealer filters
+    ("ix_applicant_details_branch_id", "applicant_details", ["branch_id"], {}),
+    ("ix_applicant_details_dealer_id", "applicant_details", ["dealer_id"], {}),
+    # Legacy text repayment keys (prefix index on MySQL TEXT)
+    ("ix_calling_repayment_id", "calling", ["repayment_id"], {"mysql_length": 32}),
+    ("ix_comments_repayment_id", "comments", ["repayment_id"], {"mysql_length": 32}),
+    # Contacts per loan
+    ("ix_co_applicant_loan_application_id", "co_applicant", ["loan_application_id"], {}),
+    ("ix_guarantor_loan_application_id", "guarantor", ["loan_application_id"], {}),
+    ("ix_reference_loan_application_id", "reference", ["loan_application_id"], {}),
+    # Recent activity, newest first overall / per loan / per repayment
+    ("ix_payment_details_audit_timestamp", "payment_details_audit", ["action_timestamp"], {}),
+    (
+        "ix_payment_details_audit_loan_timestamp", "payment_details_audit",
+        ["loan_application_id", "action_timestamp"], {}
+    ),
+    (
+        "ix_payment_details_audit_payment_timestamp", "payment_details_audit",
+        ["payment_id", "action_timestamp"], {}
+    ),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, options in INDEXES:
+        op.create_index(name, table, columns, **options)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -1,2 +0,0 @@
-from .routes import user
-from .routes import summary_status
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.deps import get_async_read_db, get_current_user_async
+from app.core.responses import negotiated_response
 from app.schemas.application_row import AppplicationFilterResponse
 from app.crud.application_row import get_filtered_applications
 
 router = APIRouter()
 
 @router.get("/", response_model=AppplicationFilterResponse)
-def filter_applications(
+async def filter_applications(
+    request: Request,
     loan_id: str = Query("", description="Filter by specific loan ID"),  # 🎯 ADDED! Filter by loan_id
     emi_month: str = Query("", description="EMI month in format 'Jul-25'"),
     search: str = Query("", description="Search in applicant name or application ID"),
@@ -22,8 +24,8 @@ def filter_applications(
     demand_num: str = Query("", description="Filter by demand number"),  # 🎯 ADDED! Filter by demand_num
     offset: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     """
     Get filtered applications with essential filtering options.
@@ -35,9 +37,12 @@ def filter_applications(
     - Status, RM, Team Lead
     - PTP date categories
     - Demand number
+    
+    Sent as JSON, or MessagePack for `Accept: application/msgpack`. The crud
+    result already has the response model's shape and is encoded as it is.
     """
-    return get_filtered_applications(
-        db=db,
+    data = await db.run_sync(
+        get_filtered_applications,
         loan_id=loan_id,  # 🎯 ADDED! Pass loan_id parameter
         emi_month=emi_month,
         search=search,
@@ -52,4 +57,5 @@ def filter_applications(
         demand_num=demand_num,  # 🎯 ADDED! Pass demand_num parameter
         offset=offset,
         limit=limit
-    )
\ No newline at end of file
+    )
+    return negotiated_response(request, data)
\ No newline at end of file
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
-from app.schemas.comments import CommentCreate, CommentResponse, CommentListResponse, CommentTypeEnum
-from app.crud.comments import create_comment, get_comments_by_repayment, get_comments_count_by_repayment, get_comments_by_repayment_and_type, get_comments_count_by_repayment_and_type
+from app.core.deps import get_db, get_read_db, get_current_user
+from app.schemas.comments import CommentCreate, CommentResponse, CommentListResponse, CommentTypeEnum, CommentSearchResponse
+from app.crud.comments import create_comment, get_comments_page_by_repayment, get_comments_count_by_repayment, get_comments_count_by_repayment_and_type, search_comments
+from typing import Optional
 
 router = APIRouter()
 
@@ -20,39 +21,68 @@ def create_new_comment(
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to create comment: {str(e)}")
 
+@router.get("/search", response_model=CommentSearchResponse)
+def search_comments_route(
+    q: str = Query(..., min_length=1, max_length=200, description='Words that must all appear; use "double quotes" for phrases'),
+    emi_month: Optional[str] = Query(None, description="Filter by EMI month (e.g. 'Jul-25')"),
+    branch: Optional[str] = Query(None, description="Filter by branch name"),
+    rm_name: Optional[str] = Query(None, description="Filter by RM name"),
+    comment_type: Optional[CommentTypeEnum] = Query(None, description="Comment type: 1 for application details, 2 for paid pending"),
+    offset: int = Query(0, ge=0, description="Number of repayments to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of repayments to return"),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Search comment text across all repayments; returns matching repayments with snippets"""
+    try:
+        return search_comments(
+            db, q, emi_month=emi_month, branch=branch, rm_name=rm_name,
+            comment_type=comment_type, offset=offset, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/repayment/{repayment_id}", response_model=CommentListResponse)
 def get_comments_by_repayment_id(
     repayment_id: str = Path(..., description="The repayment ID (payment_details.id) to get comments for"),
-    skip: int = Query(0, ge=0, description="Number of comments to skip"),
+    skip: int = Query(0, ge=0, description="Number of comments to skip (ignored when cursor is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of comments to return"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all comments for a specific repayment (payment_details.id)"""
-    comments = get_comments_by_repayment(db, repayment_id, skip, limit)
+    """Get all comments for a specific repayment (payment_details.id), newest first"""
+    try:
+        comments, next_cursor = get_comments_page_by_repayment(db, repayment_id, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     total = get_comments_count_by_repayment(db, repayment_id)
     
-    return CommentListResponse(total=total, results=comments)
+    return CommentListResponse(total=total, results=comments, next_cursor=next_cursor)
 
 @router.get("/repayment/{repayment_id}/type/{comment_type}", response_model=CommentListResponse)
 def get_comments_by_repayment_and_type_route(
     repayment_id: str = Path(..., description="The repayment ID (payment_details.id) to get comments for"),
     comment_type: CommentTypeEnum = Path(..., description="Comment type: 1 for application details, 2 for paid pending"),
-    skip: int = Query(0, ge=0, description="Number of comments to skip"),
+    skip: int = Query(0, ge=0, description="Number of comments to skip (ignored when cursor is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of comments to return"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get comments for a specific repayment by comment type"""
-    comments = get_comments_by_repayment_and_type(db, repayment_id, comment_type, skip, limit)
+    """Get comments for a specific repayment by comment type, newest first"""
+    try:
+        comments, next_cursor = get_comments_page_by_repayment(db, repayment_id, comment_type, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     total = get_comments_count_by_repayment_and_type(db, repayment_id, comment_type)
     
-    return CommentListResponse(total=total, results=comments)
+    return CommentListResponse(total=total, results=comments, next_cursor=next_cursor)
 
 @router.get("/repayment/{repayment_id}/count")
 def get_repayment_comments_count(
     repayment_id: str = Path(..., description="The repayment ID (payment_details.id) to get comment count for"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get the count of all comments for a specific repayment (payment_details.id)"""
@@ -63,7 +93,7 @@ def get_repayment_comments_count(
 def get_repayment_comments_count_by_type(
     repayment_id: str = Path(..., description="The repayment ID (payment_details.id) to get comment count for"),
     comment_type: CommentTypeEnum = Path(..., description="Comment type: 1 for application details, 2 for paid pending"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get the count of comments for a specific repayment by comment type"""
@@ -1,20 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
-from app.models.co_applicant import CoApplicant
-from app.models.guarantor import Guarantor
-from app.models.reference import Reference
-from app.models.applicant_details import ApplicantDetails
-from app.models.loan_details import LoanDetails
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.deps import get_async_read_db, get_current_user_async
+from app.crud.contacts import get_contacts_for_loan, get_contacts_for_loans, lookup_contacts_by_phone
+from app.schemas.contacts import (
+    ApplicationContactsResponse, ContactsBatchRequest, ContactsBatchResponse, PhoneLookupResponse
+)
+from app.utils.helpers import normalize_phone
 
 router = APIRouter()
 
-@router.get("/{loan_id}")
-def get_application_contacts(
+@router.post("/batch", response_model=ContactsBatchResponse)
+async def get_contacts_batch(
+    batch_data: ContactsBatchRequest,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
+):
+    """
+    Get contacts for many loans at once (e.g. to prefetch a calling worklist).
+    
+    All loans are served by a single query. Loan IDs without an applicant are
+    returned in not_found.
+    """
+    try:
+        contacts = await db.run_sync(get_contacts_for_loans, batch_data.loan_ids)
+        
+        results = []
+        not_found = []
+        for loan_id in dict.fromkeys(batch_data.loan_ids):
+            if loan_id in contacts:
+                results.append(contacts[loan_id])
+            else:
+                not_found.append(loan_id)
+        
+        return {"total": len(results), "results": results, "not_found": not_found}
+        
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to get contacts: {str(e)}")
+
+@router.get("/lookup", response_model=PhoneLookupResponse)
+async def lookup_contacts_by_phone_route(
+    phone: str = Query(..., description="Caller's phone number in any common format"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
+):
+    """
+    Reverse lookup: find the loans and contact roles (applicant, co-applicant,
+    guarantor, reference) that use a phone number.
+    """
+    normalized = normalize_phone(phone)
+    if not normalized:
+        raise HTTPException(status_code=400, detail=f"Invalid phone number: {phone}")
+    
+    try:
+        matches = await db.run_sync(lookup_contacts_by_phone, normalized)
+        return {"phone": normalized, "total": len(matches), "matches": matches}
+        
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to look up phone number: {str(e)}")
+
+@router.get("/{loan_id}", response_model=ApplicationContactsResponse)
+async def get_application_contacts(
     loan_id: str = Path(..., description="The loan ID to get contacts for"),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     """Get all contacts (applicant, co-applicants, guarantors, references) for an application"""
     try:
@@ -24,102 +72,18 @@ def get_application_contacts(
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid loan_id: {loan_id}. Must be a valid integer.")
         
-        # Get main applicant details
-        applicant = db.query(ApplicantDetails).join(
-            LoanDetails, ApplicantDetails.applicant_id == LoanDetails.applicant_id
-        ).filter(
-            LoanDetails.loan_application_id == loan_id_int
-        ).first()
+        # Applicant, co-applicants, guarantors and references in one query
+        contacts = await db.run_sync(get_contacts_for_loan, loan_id_int)
         
-        if not applicant:
+        if not contacts:
             raise HTTPException(
                 status_code=404, 
                 detail=f"Applicant not found for loan_id: {loan_id_int}"
             )
         
-        # Get co-applicants - these definitely exist in the database
-        co_applicants = db.query(CoApplicant).filter(
-            CoApplicant.loan_application_id == loan_id_int
-        ).all()
-        
-        # Get guarantors - these definitely exist in the database
-        guarantors = db.query(Guarantor).filter(
-            Guarantor.loan_application_id == loan_id_int
-        ).all()
-        
-        # Get references - now using the correct Reference model
-        references = db.query(Reference).filter(
-            Reference.loan_application_id == loan_id_int
-        ).all()
-        
-        # Helper function to extract contact info based on actual database structure
-        def extract_contact_info(contact, contact_type):
-            try:
-                # Based on DDL, we have first_name, middle_name, last_name, mobile
-                name_parts = []
-                
-                if hasattr(contact, 'first_name') and contact.first_name:
-                    name_parts.append(contact.first_name)
-                if hasattr(contact, 'middle_name') and contact.middle_name:
-                    name_parts.append(contact.middle_name)
-                if hasattr(contact, 'last_name') and contact.last_name:
-                    name_parts.append(contact.last_name)
-                
-                name = " ".join(name_parts) if name_parts else "Unknown Name"
-                
-                # Get mobile (this is the correct column name from DDL)
-                mobile = getattr(contact, 'mobile', None)
-                
-                # Try to get email from different possible columns
-                email = None
-                for email_col in ['email', 'email_id']:
-                    if hasattr(contact, email_col):
-                        email_val = getattr(contact, email_col)
-                        if email_val:
-                            email = email_val
-                            break
-                
-                return {
-                    "id": getattr(contact, 'id', None),
-                    "name": name,
-                    "phone": mobile,  # Use mobile from DDL
-                    "email": email,
-                    "type": contact_type
-                }
-            except Exception as e:
-                print(f"Error extracting contact info for {contact_type}: {e}")
-                return {
-                    "id": None,
-                    "name": "Unknown",
-                    "phone": None,
-                    "email": None,
-                    "type": contact_type
-                }
-        
-        # Build response with actual data
-        response = {
-            "loan_id": loan_id_int,
-            "applicant": {
-                "id": applicant.applicant_id,
-                "name": f"{applicant.first_name or ''} {applicant.last_name or ''}".strip(),
-                "phone": getattr(applicant, 'mobile', None) or getattr(applicant, 'phone', None),
-                "email": getattr(applicant, 'email', None),
-                "type": "applicant"
-            },
-            "co_applicants": [extract_contact_info(co, "co_applicant") for co in co_applicants],
-            "guarantors": [extract_contact_info(gu, "guarantor") for gu in guarantors],
-            "references": [extract_contact_info(ref, "reference") for ref in references]
-        }
-        
-        # Debug logging
-        print(f"🔍 Contacts API Debug for loan_id {loan_id_int}:")
-        print(f"   - Applicant: {response['applicant']['name']}")
-        print(f"   - Co-applicants found: {len(co_applicants)}")
-        print(f"   - Guarantors found: {len(guarantors)}")
-        print(f"   - References found: {len(references)}")
-        
-        return response
+        return contacts
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in get_application_contacts: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to get contacts: {str(e)}")
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.deps import get_async_read_db, get_current_user_async
 from app.schemas.filters_main import FiltersOptionsResponse
-from app.crud.filter_main import filter_options
+from app.services.filter_options_cache import filter_options_cache
 
 router = APIRouter()
 
 @router.get("/options", response_model=FiltersOptionsResponse)
-def get_filter_options(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+async def get_filter_options(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
-    return filter_options(db)
\ No newline at end of file
+    return await db.run_sync(filter_options_cache.get)
\ No newline at end of file
@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
-from app.schemas.month_dropdown import MonthDropdownResponse
-from app.crud.month_dropdown import get_month_dropdown_options
+from app.core.deps import get_read_db, get_current_user
+from app.schemas.month_dropdown import MonthDropdownResponse, MonthDropdownBatchRequest, MonthDropdownBatchResponse
+from app.crud.month_dropdown import get_month_dropdown_options, get_month_dropdown_options_batch
 
 router = APIRouter()
 
 @router.get("/{loan_id}/months", response_model=MonthDropdownResponse)
 def get_month_dropdown_route(
     loan_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -33,3 +33,32 @@ def get_month_dropdown_route(
         raise HTTPException(status_code=400, detail=f"Invalid data: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get month options: {str(e)}")
+
+@router.post("/batch", response_model=MonthDropdownBatchResponse)
+def get_month_dropdown_batch_route(
+    batch_data: MonthDropdownBatchRequest,
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get available months for many loan applications in one call.
+    
+    Returns one entry per loan in the same shape as /{loan_id}/months.
+    Loan IDs without payment records are returned in not_found. Only reads,
+    so it is served from the read replica like the GET routes.
+    """
+    try:
+        options = get_month_dropdown_options_batch(db=db, loan_ids=batch_data.loan_ids)
+        
+        results = []
+        not_found = []
+        for loan_id in dict.fromkeys(batch_data.loan_ids):
+            if loan_id in options:
+                results.append(options[loan_id])
+            else:
+                not_found.append(loan_id)
+        
+        return {"total": len(results), "results": results, "not_found": not_found}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get month options: {str(e)}")
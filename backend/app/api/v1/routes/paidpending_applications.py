@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, require_admin
+from app.core.deps import get_read_db, require_admin
 from app.schemas.paidpending_applications import PaidPendingApplicationsResponse
 from app.crud.paidpending_applications import get_paid_pending_applications
 
@@ -10,7 +10,7 @@ router = APIRouter()
 def get_paid_pending_applications_list(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -1,23 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, require_admin
-from app.schemas.paidpending_approval import PaidPendingApprovalRequest, PaidPendingApprovalResponse
-from app.crud.paidpending_approval import process_paidpending_approval
+from app.core.deps import get_db, get_read_db, require_admin
+from app.schemas.paidpending_approval import (
+    PaidPendingApprovalRequest, PaidPendingApprovalResponse,
+    PaidPendingBulkApprovalRequest, PaidPendingBulkApprovalResponse
+)
+from app.crud.paidpending_approval import (
+    process_paidpending_approval, get_paidpending_approval_queue, process_bulk_paidpending_approval
+)
 from app.models.payment_details import PaymentDetails
-from app.models.repayment_status import RepaymentStatus
 from app.models.loan_details import LoanDetails
 from app.models.applicant_details import ApplicantDetails
+from app.services.reference_data import reference_data
 from sqlalchemy import and_
+from typing import Optional
 
 router = APIRouter()
 
 @router.get("/")
 def get_paidpending_applications_list(
-    db: Session = Depends(get_db),
+    sort_by: str = Query("demand_date", description="Sort by: 'demand_date', 'updated_at' or 'amount'"),
+    order: str = Query("desc", description="Sort order: 'asc' or 'desc'"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    branch: Optional[str] = Query(None, description="Filter by branch name"),
+    rm_name: Optional[str] = Query(None, description="Filter by RM name"),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_admin)
 ):
     """
-    Get all applications currently in "Paid(Pending Approval)" status
+    Get applications currently in "Paid(Pending Approval)" status
     
     Shows:
     - Loan ID
@@ -26,69 +38,30 @@ def get_paidpending_applications_list(
     - Amount collected
     - PTP date
     - Demand date
+    
+    Results are keyset paginated: pass the returned next_cursor to fetch the
+    next page. next_cursor is null on the last page.
     """
     try:
-        # Get the "Paid(Pending Approval)" status ID
-        paid_pending_status = db.query(RepaymentStatus).filter(
-            RepaymentStatus.repayment_status == "Paid(Pending Approval)"
-        ).first()
-        
-        if not paid_pending_status:
-            return {"message": "No 'Paid(Pending Approval)' status found", "applications": []}
-        
-        # Get all payment details with this status
-        payment_records = db.query(PaymentDetails).filter(
-            PaymentDetails.repayment_status_id == paid_pending_status.id
-        ).all()
-        
-        applications = []
-        
-        for payment in payment_records:
-            # Get loan details
-            loan = db.query(LoanDetails).filter(
-                LoanDetails.loan_application_id == payment.loan_application_id
-            ).first()
-            
-            if loan:
-                # Get applicant details
-                applicant = db.query(ApplicantDetails).filter(
-                    ApplicantDetails.applicant_id == loan.applicant_id
-                ).first()
-                
-                # Get current status name
-                current_status = db.query(RepaymentStatus).filter(
-                    RepaymentStatus.id == payment.repayment_status_id
-                ).first()
-                
-                application_data = {
-                    "loan_id": payment.loan_application_id,
-                    "repayment_id": str(payment.id),  # 🎯 ADDED! Repayment ID
-                    "applicant_id": loan.applicant_id,
-                    "applicant_name": f"{applicant.first_name or ''} {applicant.last_name or ''}".strip() if applicant else "Unknown",
-                    "current_status": current_status.repayment_status if current_status else "Unknown",
-                    "amount_collected": float(payment.amount_collected) if payment.amount_collected else 0,
-                    "ptp_date": payment.ptp_date.isoformat() if payment.ptp_date else None,
-                    "demand_date": payment.demand_date.isoformat() if payment.demand_date else None,
-                    "demand_amount": float(payment.demand_amount) if payment.demand_amount else 0,
-                    "payment_date": payment.payment_date.isoformat() if payment.payment_date else None,
-                    "updated_at": payment.updated_at.isoformat() if payment.updated_at else None
-                }
-                
-                applications.append(application_data)
-        
-        return {
-            "total_applications": len(applications),
-            "status": "Paid(Pending Approval)",
-            "applications": applications
-        }
+        return get_paidpending_approval_queue(
+            db=db,
+            sort_by=sort_by,
+            order=order,
+            cursor=cursor,
+            limit=limit,
+            branch=branch,
+            rm_name=rm_name
+        )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get paid pending applications: {str(e)}")
 
 @router.get("/{loan_id}")
 def get_paidpending_application_status(
     loan_id: str = Path(..., description="The loan ID to check for paid pending status"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -120,14 +93,10 @@ def get_paidpending_application_status(
             )
         
         # Get current status name
-        current_status = db.query(RepaymentStatus).filter(
-            RepaymentStatus.id == payment_record.repayment_status_id
-        ).first()
+        current_status = reference_data.get_name(db, "repayment_status", payment_record.repayment_status_id)
         
         # Check if it's in "Paid(Pending Approval)" status
-        is_paid_pending = False
-        if current_status:
-            is_paid_pending = current_status.repayment_status == "Paid(Pending Approval)"
+        is_paid_pending = current_status == "Paid(Pending Approval)"
         
         # Get loan and applicant details
         loan = db.query(LoanDetails).filter(
@@ -145,7 +114,7 @@ def get_paidpending_application_status(
             "repayment_id": str(payment_record.id),  # 🎯 ADDED! Repayment ID
             "applicant_id": loan.applicant_id if loan else None,
             "applicant_name": f"{applicant.first_name or ''} {applicant.last_name or ''}".strip() if applicant else "Unknown",
-            "current_status": current_status.repayment_status if current_status else "Unknown",
+            "current_status": current_status or "Unknown",
             "status_id": payment_record.repayment_status_id,
             "is_paid_pending": is_paid_pending,
             "amount_collected": float(payment_record.amount_collected) if payment_record.amount_collected else 0,
@@ -184,3 +153,28 @@ def approve_reject_paidpending(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process approval: {str(e)}")
+
+@router.post("/approve/bulk", response_model=PaidPendingBulkApprovalResponse)
+def bulk_approve_reject_paidpending(
+    bulk_data: PaidPendingBulkApprovalRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Process many paidpending approvals in a single transaction
+    
+    Each item follows the same rules as /approve. Items that are not found or
+    not in "Paid(Pending Approval)" status are reported as failed; the rest
+    are applied together. Item comments are saved as paid pending comments.
+    """
+    try:
+        return process_bulk_paidpending_approval(
+            db=db,
+            items=bulk_data.items,
+            user_id=current_user["id"]
+        )
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process bulk approval: {str(e)}")
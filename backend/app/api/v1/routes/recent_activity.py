@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.deps import get_async_read_db, get_current_user_async
 from app.crud.recent_activity import get_recent_activity
 from app.schemas.recent_activity import RecentActivityResponse
 from typing import Optional
@@ -8,13 +8,13 @@ from typing import Optional
 router = APIRouter()
 
 @router.get("/", response_model=RecentActivityResponse)
-def get_recent_activity_endpoint(
+async def get_recent_activity_endpoint(
     loan_id: Optional[int] = Query(None, description="Filter by loan ID"),
     repayment_id: Optional[int] = Query(None, description="Filter by repayment ID (payment ID)"),
     limit: int = Query(50, description="Maximum number of activities to return"),
     days_back: int = Query(30, description="Number of days to look back"),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     """
     Get recent activity for status management changes.
@@ -26,8 +26,8 @@ def get_recent_activity_endpoint(
     4. Demand Calling Status changes (from calling records)
     """
     try:
-        activities = get_recent_activity(
-            db=db,
+        activities = await db.run_sync(
+            get_recent_activity,
             loan_id=loan_id,
             repayment_id=repayment_id,
             limit=limit,
@@ -46,19 +46,19 @@ def get_recent_activity_endpoint(
         )
 
 @router.get("/loan/{loan_id}", response_model=RecentActivityResponse)
-def get_loan_recent_activity(
+async def get_loan_recent_activity(
     loan_id: int,
     limit: int = Query(50, description="Maximum number of activities to return"),
     days_back: int = Query(30, description="Number of days to look back"),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     """
     Get recent activity for a specific loan.
     """
     try:
-        activities = get_recent_activity(
-            db=db,
+        activities = await db.run_sync(
+            get_recent_activity,
             loan_id=loan_id,
             repayment_id=None,
             limit=limit,
@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from app.core.deps import get_db, get_read_db, get_current_user
 from app.schemas.status_management import StatusManagementUpdate, StatusManagementResponse
 from app.crud.status_management import update_status_management
 from app.models.payment_details import PaymentDetails
-from app.models.repayment_status import RepaymentStatus
-from app.models.demand_calling import DemandCalling
-from app.models.contact_calling import ContactCalling
 from app.models.calling import Calling
+from app.services.reference_data import reference_data
+from app.db.repayment_keys import repayment_id_matches
 from sqlalchemy import and_
 from typing import Optional
 
@@ -52,7 +51,7 @@ def update_application_status(
 def get_application_status(
     loan_id: str,
     repayment_id: str = Query(..., description="Repayment ID (payment details ID) to get status for"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get current status for an application by repayment_id"""
@@ -84,25 +83,19 @@ def get_application_status(
             )
         
         # Get repayment status name
-        repayment_status_name = None
-        if payment_details.repayment_status_id:
-            repayment_status_record = db.query(RepaymentStatus).filter(
-                RepaymentStatus.id == payment_details.repayment_status_id
-            ).first()
-            if repayment_status_record:
-                repayment_status_name = repayment_status_record.repayment_status
+        repayment_status_name = reference_data.get_name(db, "repayment_status", payment_details.repayment_status_id)
         
         # Get latest calling records for this application
         latest_demand_calling = db.query(Calling).filter(
             and_(
-                Calling.repayment_id == str(payment_details.id),
+                repayment_id_matches(Calling, payment_details.id),
                 Calling.Calling_id == 2  # Demand calling
             )
         ).order_by(Calling.created_at.desc()).first()
         
         latest_contact_calling = db.query(Calling).filter(
             and_(
-                Calling.repayment_id == str(payment_details.id),
+                repayment_id_matches(Calling, payment_details.id),
                 Calling.Calling_id == 1  # Contact calling
             )
         ).order_by(Calling.created_at.desc()).first()
@@ -110,19 +103,11 @@ def get_application_status(
         # Get status names from calling records
         demand_calling_status = None
         if latest_demand_calling:
-            demand_calling_record = db.query(DemandCalling).filter(
-                DemandCalling.id == latest_demand_calling.status_id
-            ).first()
-            if demand_calling_record:
-                demand_calling_status = demand_calling_record.demand_calling_status
+            demand_calling_status = reference_data.get_name(db, "demand_calling", latest_demand_calling.status_id)
         
         contact_calling_status = None
         if latest_contact_calling:
-            contact_calling_record = db.query(ContactCalling).filter(
-                ContactCalling.id == latest_contact_calling.status_id
-            ).first()
-            if contact_calling_record:
-                contact_calling_status = contact_calling_record.contact_calling_status
+            contact_calling_status = reference_data.get_name(db, "contact_calling", latest_contact_calling.status_id)
         
         return {
             "loan_id": loan_id_int,
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Query, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.core.deps import get_db, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.deps import get_async_read_db, get_current_user_async
 from app.crud.summary_status import get_summary_status, get_summary_status_with_filters
 from app.schemas.summary_status import SummaryStatusResponse
 
 router = APIRouter()
 
 @router.get('/summary', response_model=SummaryStatusResponse)
-def summary_status_route(
+async def summary_status_route(
     emi_month: str = Query(..., description="EMI month in format 'Jul-25'"),
     branch: str = Query(None, description="Filter by branch name"),
     dealer: str = Query(None, description="Filter by dealer name"),
@@ -18,14 +18,14 @@ def summary_status_route(
     ptp_date_filter: str = Query(None, description="Filter by PTP date category"),
     repayment_id: str = Query(None, description="Filter by repayment ID"),
     demand_num: str = Query(None, description="Filter by demand number"),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
     """
     Get summary status with optional filters applied
     """
-    return get_summary_status_with_filters(
-        db=db,
+    return await db.run_sync(
+        get_summary_status_with_filters,
         emi_month=emi_month,
         branch=branch,
         dealer=dealer,
@@ -0,0 +1,71 @@
+from typing import Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.deps import get_db, require_admin
+from app.db.engine import pool_metrics
+from app.db.session import engine, read_engine
+from app.db.replica import replica_router
+from app.services.filter_options_cache import filter_options_cache
+from app.services.query_metrics import route_query_stats
+from app.services.reference_data import reference_data
+from app.services.slow_query_log import slow_query_log
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def db_pool_stats(current_user: dict = Depends(require_admin)):
+    """
+    Connection pool counters: checkout wait (avg/p95/max), connections in use,
+    overflow and checkout timeouts (Admin only)
+    """
+    return pool_metrics(engine)
+
+@router.get("/read-replica")
+def read_replica_stats(current_user: dict = Depends(require_admin)):
+    """
+    Read routing: replica lag and how it was read, reads sent to the replica
+    vs. the primary and why (no replica, read-your-writes, lag), plus the
+    replica's pool (Admin only)
+    """
+    stats = replica_router.stats()
+    if replica_router.has_replica:
+        stats["pool"] = pool_metrics(read_engine)
+    return stats
+
+@router.get("/queries")
+def query_stats(current_user: dict = Depends(require_admin)):
+    """
+    SQL per route since startup: requests, queries per request (avg/max),
+    DB time and the slowest statement, heaviest routes first (Admin only)
+    """
+    return route_query_stats.snapshot()
+
+@router.get("/slow-queries")
+def slow_queries(limit: Optional[int] = None, current_user: dict = Depends(require_admin)):
+    """
+    Recent statements over SLOW_QUERY_MS, newest first: normalized SQL,
+    parameter types, endpoint, crud function and EXPLAIN plan (Admin only)
+    """
+    return slow_query_log.snapshot(limit)
+
+@router.delete("/slow-queries")
+def clear_slow_queries(current_user: dict = Depends(require_admin)):
+    """
+    Empty the slow-query buffer (Admin only)
+    """
+    slow_query_log.clear()
+    return {"message": "Slow-query log cleared"}
+
+@router.post("/reference-data/refresh")
+def refresh_reference_data(db: Session = Depends(get_db), current_user: dict = Depends(require_admin)):
+    """
+    Reload the cached lookup tables and filter options from the primary after
+    they were edited (Admin only). Caches are per worker: the others pick the
+    change up within REFERENCE_DATA_REFRESH_SECONDS and
+    FILTER_OPTIONS_CACHE_SECONDS
+    """
+    reference_data.invalidate()
+    filter_options_cache.invalidate()
+    reference_data.load(db)
+    filter_options_cache.load(db)
+    return {"message": "Reference data and filter options reloaded"}
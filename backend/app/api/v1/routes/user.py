@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.core.deps import get_db, get_current_user, require_admin
 from app.crud.user import (
-    authenticate_user, create_user, get_user_by_email, 
-    update_user_password, verify_user_password, get_users_by_role,
+    create_user, get_user_by_email, get_users_by_role,
     update_user_role, delete_user, get_users, get_user,
-    update_login_time, update_logout_time, create_bulk_users
+    check_bulk_users, insert_bulk_users,
+    get_user_by_id, set_user_password_hash
 )
 from app.core.security import create_access_token
+from app.services.principal_cache import principal_cache
+from app.services.password_hashing import password_hasher, PasswordHashingBusy
+from app.services.login_activity import login_activity
 from app.schemas.user import (
     UserLogin, Token, UserCreate, UserResponse, 
     PasswordResetRequest, PasswordReset, ChangePassword,
@@ -19,42 +23,82 @@ from app.core.config import settings
 
 router = APIRouter()
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+# Login, register and change-password are async so bcrypt runs in the
+# dedicated hashing pool instead of holding a shared threadpool worker;
+# their database calls still go through run_in_threadpool.
+
+def _release_connection(db: Session, user=None):
+    """End the read transaction so no pooled connection is held while bcrypt runs"""
+    if user is not None:
+        db.expunge(user)  # Keep loaded attributes readable after the rollback
+    db.rollback()
+    return user
+
+def _get_user_by_email_released(db: Session, email: str):
+    return _release_connection(db, get_user_by_email(db, email))
+
+def _get_user_by_id_released(db: Session, user_id: int):
+    return _release_connection(db, get_user_by_id(db, user_id))
+
+def _check_bulk_users_released(db: Session, users):
+    result = check_bulk_users(db, users)
+    db.rollback()
+    return result
+
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+    user = await run_in_threadpool(_get_user_by_email_released, db, form_data.username)
+    try:
+        password_ok = user is not None and await password_hasher.verify(form_data.password, user.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 🎯 UPDATE LOGIN TIME
-    update_login_time(db, user.id)
+    user_id, user_name, role, token_version = user.id, user.user_name, user.role, user.token_version or 0
+    claims = {"name": user.name, "email": user.email, "role": role, "ver": token_version}
+    
+    # 🎯 UPDATE LOGIN TIME (buffered, written by the periodic flush)
+    login_activity.record_login(user_id)
     
-    # Create access token
+    # Create access token; name, email and role travel as signed claims
+    principal_cache.set(user_id, token_version)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
+        subject=user_id,
+        expires_delta=access_token_expires,
+        claims=claims
     )
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        "user_id": user.id,
-        "user_name": user.user_name,
-        "user_role": user.role
+        "user_id": user_id,
+        "user_name": user_name,
+        "user_role": role
     }
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     user: UserCreate,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -63,19 +107,24 @@ def register(
     Register new user (Admin only)
     """
     # Check if user already exists
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await run_in_threadpool(_get_user_by_email_released, db, user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    
     # Create new user
-    db_user = create_user(db=db, user=user)
-    return db_user
+    db_user = await run_in_threadpool(create_user, db, user, hashed_password)
+    return UserResponse.model_validate(db_user, from_attributes=True)
 
 @router.post("/bulk-register", response_model=BulkUserResponse)
-def bulk_register(
+async def bulk_register(
     bulk_data: BulkUserCreate,
     current_user: dict = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -83,8 +132,17 @@ def bulk_register(
     """
     Register multiple users in bulk (Admin only)
     """
-    result = create_bulk_users(db=db, users=bulk_data.users)
-    return result
+    accepted, failed_users = await run_in_threadpool(_check_bulk_users_released, db, bulk_data.users)
+    
+    try:
+        hashed_passwords = await password_hasher.hash_many([u.password for u in accepted])
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    
+    result = await run_in_threadpool(insert_bulk_users, db, accepted, hashed_passwords)
+    result["failed_users"] = failed_users + result["failed_users"]
+    result["failed_count"] = len(result["failed_users"])
+    return BulkUserResponse.model_validate(result, from_attributes=True)
 
 @router.get("/me", response_model=UserResponse)
 def read_users_me(current_user: dict = Depends(get_current_user)):
@@ -97,23 +155,35 @@ def read_users_me(current_user: dict = Depends(get_current_user)):
     return user_data
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_data: ChangePassword,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Change current user password
+    Change current user password; tokens issued before the change, including
+    the one used for this request, stop working
     """
-    # Verify current password
-    if not verify_user_password(db, current_user["id"], password_data.current_password):
+    user = await run_in_threadpool(_get_user_by_id_released, db, current_user["id"])
+    if not user:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Current password is incorrect"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update password"
         )
     
+    try:
+        # Verify current password
+        if not await password_hasher.verify(password_data.current_password, user.password):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Current password is incorrect"
+            )
+        hashed_password = await password_hasher.hash(password_data.new_password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    
     # Update password
-    if update_user_password(db, current_user["id"], password_data.new_password):
+    if await run_in_threadpool(set_user_password_hash, db, current_user["id"], hashed_password):
         return {"message": "Password updated successfully"}
     else:
         raise HTTPException(
@@ -121,6 +191,13 @@ def change_password(
             detail="Failed to update password"
         )
 
+@router.get("/password-hashing/stats")
+def password_hashing_stats(current_user: dict = Depends(require_admin)):
+    """
+    Password hashing pool counters: queue wait (submit to start), run time, rejections (Admin only)
+    """
+    return password_hasher.stats()
+
 @router.get("/", response_model=list[UserResponse])
 def get_all_users(
     skip: int = 0,
@@ -202,15 +279,12 @@ def delete_user_endpoint(
         )
 
 @router.post("/logout")
-def logout(
-    current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def logout(current_user: dict = Depends(get_current_user)):
     """
     Logout user (client should discard token)
     """
-    # 🎯 UPDATE LOGOUT TIME
-    update_logout_time(db, current_user["id"])
+    # 🎯 UPDATE LOGOUT TIME (buffered, written by the periodic flush)
+    login_activity.record_logout(current_user["id"])
     
     return {"message": "Successfully logged out"}
 
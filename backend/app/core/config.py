@@ -9,8 +9,31 @@ class Settings:
     db_port = os.getenv("DB_PORT", "3306")
     db_name = os.getenv("DB_NAME", "prosparity_db_dev")
 
-    # SQLAlchemy connection string
-    DATABASE_URL: str = f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    # SQLAlchemy connection string; DATABASE_URL (e.g. sqlite:///./test.db)
+    # replaces the MySQL one built from the DB_* settings
+    DATABASE_URL: str = os.getenv("DATABASE_URL") or f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    
+    # Connection pool (app.db.engine). Recycle below the server's idle timeout
+    # and pre-ping so connections dropped by the server are replaced, not
+    # handed to a request
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_ISOLATION_LEVEL: Optional[str] = os.getenv("DB_ISOLATION_LEVEL") or None  # e.g. "READ COMMITTED"
+    # Connections all Gunicorn workers together may open to one database
+    # server (MySQL's default max_connections); checked when the server
+    # starts, 0 skips the check
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "151"))
+    
+    # Read replica for GET routes (app.db.replica). Users who wrote within
+    # READ_YOUR_WRITES_SECONDS read from the primary; so does everyone while
+    # the replica is more than REPLICA_MAX_LAG_SECONDS behind
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
     
     # JWT Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-key-change-in-production")
@@ -21,6 +44,71 @@ class Settings:
     PASSWORD_MIN_LENGTH: int = 8
     SESSION_TIMEOUT_MINUTES: int = int(os.getenv("SESSION_TIMEOUT_MINUTES", "60"))
     
+    # How long a user's token version is trusted before it is re-read from the
+    # database; bounds how long a revoked token keeps working on other workers
+    AUTH_PRINCIPAL_CACHE_SECONDS: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_SECONDS", "30"))
+    AUTH_PRINCIPAL_CACHE_SIZE: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+    
+    # Dedicated bcrypt pool (app.services.password_hashing); 0 workers hashes
+    # inline on the shared request threadpool. Bulk registration hashes on its
+    # own pool of PASSWORD_HASH_BULK_WORKERS threads so logins never queue
+    # behind a batch
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_BULK_WORKERS: int = int(os.getenv("PASSWORD_HASH_BULK_WORKERS", str(max(1, PASSWORD_HASH_WORKERS // 2))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    
+    # How often buffered last-login/last-logout times are written to users
+    LOGIN_ACTIVITY_FLUSH_SECONDS: float = float(os.getenv("LOGIN_ACTIVITY_FLUSH_SECONDS", "10"))
+    
+    # Per-request SQL counting and timing (app.services.query_metrics): /metrics
+    # histograms and, when SERVER_TIMING_ENABLED, a Server-Timing header
+    QUERY_METRICS_ENABLED: bool = os.getenv("QUERY_METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    
+    # Statements slower than SLOW_QUERY_MS (0 = off) are logged and kept, with
+    # their EXPLAIN plan, in a ring buffer of SLOW_QUERY_LOG_SIZE entries
+    # (app.services.slow_query_log, GET /api/v1/system/slow-queries)
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "500"))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    
+    # Responses of at least COMPRESSION_MIN_SIZE bytes (0 = off) are
+    # compressed: Brotli at BROTLI_QUALITY for clients that accept br, gzip at
+    # GZIP_LEVEL otherwise (app.services.compression)
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+    
+    # Who writes payment_details_audit rows: "triggers" (the MySQL triggers,
+    # fed by SET @app_user), "orm" (app.services.payment_audit, for databases
+    # without the triggers) or "auto" (triggers on MySQL, orm elsewhere)
+    PAYMENT_AUDIT: str = os.getenv("PAYMENT_AUDIT", "auto")
+    
+    # Reference data (status and lookup tables) refresh interval
+    REFERENCE_DATA_REFRESH_SECONDS: int = int(os.getenv("REFERENCE_DATA_REFRESH_SECONDS", "300"))
+    
+    # Filter dropdown options (GET /api/v1/filters/options) are rebuilt at most
+    # this often per worker; 0 rebuilds them on every request
+    FILTER_OPTIONS_CACHE_SECONDS: int = int(os.getenv("FILTER_OPTIONS_CACHE_SECONDS", "60"))
+    
+    # Threads shared by sync routes and dependencies (anyio's limiter, 40 by default)
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))
+    
+    # Before a worker serves traffic (app.services.warmup): open
+    # WARMUP_DB_CONNECTIONS pooled connections per engine and load reference
+    # data and filter options
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+    WARMUP_DB_CONNECTIONS: int = int(os.getenv("WARMUP_DB_CONNECTIONS", str(DB_POOL_SIZE)))
+    
+    # Country code assumed for phone numbers stored without one
+    PHONE_DEFAULT_COUNTRY_CODE: str = os.getenv("PHONE_DEFAULT_COUNTRY_CODE", "91")
+    
+    # How comments/calling rows are matched to payment_details during the
+    # repayment key cutover: "legacy" (text repayment_id), "dual" (typed
+    # payment_id, falling back to repayment_id for rows not yet backfilled)
+    # or "typed" (payment_id only, once the backfill has completed)
+    REPAYMENT_KEY_READ_MODE: str = os.getenv("REPAYMENT_KEY_READ_MODE", "dual")
+    
     # CORS
     BACKEND_CORS_ORIGINS: list = [
         "http://localhost:3000", 
@@ -34,8 +122,3 @@ class Settings:
     ]
 
 settings = Settings()
-
-# Print database configuration for debugging (remove in production)
-print("Database URL:", settings.DATABASE_URL)
-
-
@@ -1,30 +1,42 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import SessionLocal
-from app.core.security import verify_token
-from app.crud.user import get_user_by_id
-from fastapi import Depends, HTTPException, status
+from app.db.replica import replica_router, WROTE_KEY
+from app.db.async_session import get_async_session_factory
+from app.core.security import decode_access_token
+from app.crud.user import get_user_by_id, get_user_token_version
+from app.services.principal_cache import principal_cache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
     try:
         yield db
     finally:
+        # A user who just wrote reads their own writes from the primary
+        user_id = getattr(request.state, "user_id", None)
+        if db.info.get(WROTE_KEY) and user_id is not None:
+            replica_router.mark_write(user_id)
         db.close()
 
+async def get_async_db():
+    """AsyncSession on the primary; it only connects when first used"""
+    async with get_async_session_factory()() as db:
+        yield db
+
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> dict:
-    """
-    Get current authenticated user from JWT token
-    """
-    token = credentials.credentials
-    user_id = verify_token(token)
+def _token_user_id(request: Request, credentials: HTTPAuthorizationCredentials):
+    """Decoded claims and user id of a valid token, else 401"""
+    payload = decode_access_token(credentials.credentials)
+    try:
+        user_id = int(payload["sub"]) if payload else None
+    except ValueError:
+        user_id = None
     
     if user_id is None:
         raise HTTPException(
@@ -33,7 +45,104 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = get_user_by_id(db, int(user_id))
+    request.state.user_id = user_id
+    return payload, user_id
+
+def _principal(payload: dict, user_id: int, token_version: Optional[int]) -> dict:
+    """The current user from signed claims, once the token version is known to be current"""
+    if token_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if payload["ver"] != token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return {
+        "id": user_id,
+        "name": payload.get("name"),
+        "email": payload.get("email"),
+        "role": payload.get("role")
+    }
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """
+    Get current authenticated user from JWT token.
+    
+    Name, email and role come from the token's signed claims; the database is
+    only consulted to check the token version when it is not cached.
+    """
+    payload, user_id = _token_user_id(request, credentials)
+    
+    if "ver" not in payload:
+        # Token issued before claims were added: load the user
+        return _load_current_user(db, user_id)
+    
+    token_version = principal_cache.get(user_id)
+    if token_version is None:
+        token_version = get_user_token_version(db, user_id)
+        if token_version is not None:
+            principal_cache.set(user_id, token_version)
+    
+    return _principal(payload, user_id, token_version)
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """
+    get_current_user for async routes: runs on the event loop and uses the
+    async engine on a token version cache miss, so no threadpool thread is taken
+    """
+    payload, user_id = _token_user_id(request, credentials)
+    
+    token_version = principal_cache.get(user_id) if "ver" in payload else None
+    if token_version is None:
+        if "ver" not in payload:
+            # Token issued before claims were added: load the user
+            return await db.run_sync(_load_current_user, user_id)
+        token_version = await db.run_sync(get_user_token_version, user_id)
+        if token_version is not None:
+            principal_cache.set(user_id, token_version)
+    
+    return _principal(payload, user_id, token_version)
+
+def get_read_db(current_user: dict = Depends(get_current_user)):
+    """
+    Session for read-only GET routes: the read replica when one is configured
+    and current, otherwise the primary (see app.db.replica)
+    """
+    db = replica_router.session_for(current_user["id"])
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(current_user: dict = Depends(get_current_user_async)):
+    """
+    AsyncSession for async read routes, routed like get_read_db. Routes call
+    the sync crud functions through AsyncSession.run_sync, which runs them on
+    the event loop with the asyncio driver doing the I/O.
+    """
+    if replica_router.lag_check_due():
+        await run_in_threadpool(replica_router.replica_lag)  # The probe uses the sync engine
+    read = replica_router.route(current_user["id"]) == "replica"
+    async with get_async_session_factory(read=read)() as db:
+        yield db
+
+def _load_current_user(db: Session, user_id: int) -> dict:
+    user = get_user_by_id(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,6 +158,7 @@ def get_current_user(
     }
 
 def get_current_user_optional(
+    request: Request,
     db: Session = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> Optional[dict]:
@@ -59,7 +169,7 @@ def get_current_user_optional(
         return None
     
     try:
-        return get_current_user(db, credentials)
+        return get_current_user(request, db, credentials)
     except HTTPException:
         return None
 
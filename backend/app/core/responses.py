@@ -0,0 +1,52 @@
+"""
+Compact encodings for large responses.
+
+Routes whose crud functions already return data in the response model's
+shape (the application list) pass it to negotiated_response. It is encoded
+directly with orjson, or MessagePack when the client's Accept header asks
+for it, without first being validated through the response model. The
+route's response_model still documents the payload.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+import msgpack
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+def _default(value: Any) -> Any:
+    """Values neither encoder handles natively, converted the way the response models serialize them"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not serializable")
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MsgPackResponse(Response):
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_default)
+
+def accepts_msgpack(request: Request) -> bool:
+    """Whether the Accept header lists a MessagePack media type (with a non-zero q)"""
+    for part in request.headers.get("accept", "").split(","):
+        media_type, _, params = part.partition(";")
+        if media_type.strip().lower() in MSGPACK_MEDIA_TYPES:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+def negotiated_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """content as MessagePack when the client accepts it, otherwise as JSON"""
+    response_class = MsgPackResponse if accepts_msgpack(request) else ORJSONResponse
+    return response_class(content, status_code=status_code, headers={"Vary": "Accept"})
@@ -1,18 +1,30 @@
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import desc, func, or_, and_
+from sqlalchemy import desc, func, or_, and_, false
 from app.models.loan_details import LoanDetails
 from app.models.applicant_details import ApplicantDetails
 from app.models.payment_details import PaymentDetails
 from app.models.branch import Branch
 from app.models.dealer import Dealer
 from app.models.lenders import Lender
-from app.models.comments import Comments
 from app.models.user import User
 from app.models.repayment_status import RepaymentStatus
 from app.models.calling import Calling
-from app.models.contact_calling import ContactCalling
 from app.models.ownership_type import OwnershipType  # 🎯 ADDED! For House Ownership
-from datetime import date, timedelta
+from app.services.reference_data import reference_data
+from app.db.dialect import concat
+from app.db.repayment_keys import repayment_id_matches
+from app.crud.comments import get_comment_summaries
+from app.schemas.comments import CommentTypeEnum
+from datetime import date, datetime, timedelta
+
+def _demand_month_clause(emi_month: str):
+    """demand_date within emi_month ('Jul-25') as a range, so the demand_date index applies"""
+    try:
+        start = datetime.strptime(emi_month, '%b-%y').date()
+    except ValueError:
+        return false()  # Unparseable month matches nothing, as the string comparison did
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return and_(PaymentDetails.demand_date >= start, PaymentDetails.demand_date < end)
 
 def get_filtered_applications(
     db: Session,
@@ -68,7 +80,7 @@ def get_filtered_applications(
             .join(
                 PaymentDetails,
                 (PaymentDetails.loan_application_id == LoanDetails.loan_application_id) &
-                (func.date_format(PaymentDetails.demand_date, '%b-%y') == emi_month)  # 🎯 Direct month filter
+                _demand_month_clause(emi_month)  # 🎯 Direct month filter
             )
             .join(Branch, ApplicantDetails.branch_id == Branch.id)
             .join(Dealer, ApplicantDetails.dealer_id == Dealer.id)
@@ -117,7 +129,7 @@ def get_filtered_applications(
     
     if search:
         search_filter = or_(
-            func.concat(ApplicantDetails.first_name, ' ', ApplicantDetails.last_name).ilike(f'%{search}%'),
+            concat(ApplicantDetails.first_name, ' ', ApplicantDetails.last_name).ilike(f'%{search}%'),
             ApplicantDetails.first_name.ilike(f'%{search}%'),
             ApplicantDetails.last_name.ilike(f'%{search}%'),
             ApplicantDetails.applicant_id.ilike(f'%{search}%')
@@ -158,9 +170,9 @@ def get_filtered_applications(
         if ptp_date_filter == "overdue":
             query = query.filter(PaymentDetails.ptp_date < today)
         elif ptp_date_filter == "today":
-            query = query.filter(func.date(PaymentDetails.ptp_date) == today)
+            query = query.filter(PaymentDetails.ptp_date == today)
         elif ptp_date_filter == "tomorrow":
-            query = query.filter(func.date(PaymentDetails.ptp_date) == tomorrow)
+            query = query.filter(PaymentDetails.ptp_date == tomorrow)
         elif ptp_date_filter == "future":
             query = query.filter(PaymentDetails.ptp_date > tomorrow)
         elif ptp_date_filter == "no_ptp":
@@ -171,16 +183,15 @@ def get_filtered_applications(
     
     total = query.count()
     results = []
+    rows = query.offset(offset).limit(limit).all()
 
-    for row in query.offset(offset).limit(limit).all():
-        # Get comments for this payment (only application details comments, comment_type = 1)
-        comments = db.query(Comments).filter(
-            and_(
-                Comments.repayment_id == row.payment_id,
-                Comments.comment_type == 1  # Only application details comments, not paid pending
-            )
-        ).order_by(Comments.commented_at.desc()).all()
-        comment_list = [c.comment for c in comments]
+    # Comment aggregates for the whole page (only application details comments, comment_type = 1);
+    # full histories load lazily from /comments/repayment/{repayment_id}
+    comment_summaries = get_comment_summaries(
+        db, [row.payment_id for row in rows], CommentTypeEnum.application_details
+    )
+
+    for row in rows:
 
         # Get calling status for ALL 4 contact types (1=applicant, 2=co-applicant, 3=guarantor, 4=reference)
         calling_statuses = {
@@ -194,7 +205,7 @@ def get_filtered_applications(
         for contact_type in range(1, 5):  # 1 to 4
             latest_calling = db.query(Calling).filter(
                 and_(
-                    Calling.repayment_id == str(row.payment_id),
+                    repayment_id_matches(Calling, row.payment_id),
                     Calling.Calling_id == 1,  # Only contact calling, not demand calling
                     Calling.contact_type == contact_type
                 )
@@ -202,25 +213,23 @@ def get_filtered_applications(
             
             if latest_calling:
                 # Get contact calling status
-                contact_status = db.query(ContactCalling).filter(
-                    ContactCalling.id == latest_calling.status_id
-                ).first()
+                contact_status = reference_data.get_name(db, "contact_calling", latest_calling.status_id)
                 if contact_status:
                     # Map contact_type number to string key
                     if contact_type == 1:
-                        calling_statuses["applicant"] = contact_status.contact_calling_status
+                        calling_statuses["applicant"] = contact_status
                     elif contact_type == 2:
-                        calling_statuses["co_applicant"] = contact_status.contact_calling_status
+                        calling_statuses["co_applicant"] = contact_status
                     elif contact_type == 3:
-                        calling_statuses["guarantor"] = contact_status.contact_calling_status
+                        calling_statuses["guarantor"] = contact_status
                     elif contact_type == 4:
-                        calling_statuses["reference"] = contact_status.contact_calling_status
+                        calling_statuses["reference"] = contact_status
 
         # Get demand calling status for this payment (repayment_id)
         demand_calling_status = None  # Default value
         latest_demand_calling = db.query(Calling).filter(
             and_(
-                Calling.repayment_id == str(row.payment_id),
+                repayment_id_matches(Calling, row.payment_id),
                 Calling.Calling_id == 2,  # Demand calling (not contact calling)
                 Calling.contact_type == 1  # For applicant only
             )
@@ -228,12 +237,7 @@ def get_filtered_applications(
         
         if latest_demand_calling:
             # Get demand calling status from demand_calling table (not contact_calling)
-            from app.models.demand_calling import DemandCalling
-            demand_status = db.query(DemandCalling).filter(
-                DemandCalling.id == latest_demand_calling.status_id
-            ).first()
-            if demand_status:
-                demand_calling_status = demand_status.demand_calling_status
+            demand_calling_status = reference_data.get_name(db, "demand_calling", latest_demand_calling.status_id)
 
         results.append({
             "application_id": str(row.application_id),
@@ -258,7 +262,7 @@ def get_filtered_applications(
             "loan_amount": float(row.loan_amount) if row.loan_amount else None,  # 🎯 ADDED! Loan Amount
             "disbursement_date": row.disbursement_date.strftime('%Y-%m-%d') if row.disbursement_date else None,  # 🎯 ADDED! Disbursement Date
             "house_ownership": row.house_ownership,  # 🎯 ADDED! House Ownership
-            "comments": comment_list
+            "comment_summary": comment_summaries.get(row.payment_id)
         })
 
     return {
@@ -1,20 +1,152 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from typing import List, Dict, Any
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import desc, func, select, insert, update, delete, and_, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from datetime import datetime
 from app.models.comments import Comments
+from app.models.comment_summary import CommentSummary
 from app.models.user import User
+from app.models.payment_details import PaymentDetails
+from app.models.loan_details import LoanDetails
+from app.models.applicant_details import ApplicantDetails
+from app.models.branch import Branch
 from app.schemas.comments import CommentCreate, CommentTypeEnum
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.db.dialect import dialect_name, sortable_timestamp, sortable_timestamp_value
+from app.db.repayment_keys import repayment_key, repayment_key_values, repayment_id_matches, parse_repayment_id
+from app.services.comment_search import parse_search_terms, comment_match_clause, make_snippet
+
+# Matching comments returned per repayment in search results
+SEARCH_SNIPPETS_PER_REPAYMENT = 3
+
+def _record_comment_in_summary(db: Session, db_comment: Comments, user_name: str) -> None:
+    """Bump the (repayment_id, comment_type) aggregate for a newly flushed comment"""
+    if db_comment.payment_id is None:
+        return
+    
+    key = and_(
+        CommentSummary.repayment_id == db_comment.payment_id,
+        CommentSummary.comment_type == db_comment.comment_type
+    )
+    latest = {
+        "latest_comment_id": db_comment.id,
+        "latest_comment": db_comment.comment,
+        "latest_user_id": db_comment.user_id,
+        "latest_user_name": user_name,
+        "latest_commented_at": db_comment.commented_at
+    }
+    bump = update(CommentSummary).where(key).values(
+        comment_count=CommentSummary.comment_count + 1, **latest
+    )
+    
+    if db.execute(bump).rowcount:
+        return
+    
+    try:
+        with db.begin_nested():
+            db.execute(insert(CommentSummary).values(
+                repayment_id=db_comment.payment_id,
+                comment_type=db_comment.comment_type,
+                comment_count=1,
+                **latest
+            ))
+    except IntegrityError:
+        # A concurrent comment created the aggregate first
+        db.execute(bump)
+
+def refresh_comment_summaries(
+    db: Session,
+    keys: Optional[Iterable[Tuple[int, int]]] = None
+) -> None:
+    """
+    Recompute comment aggregates from the comments table.
+    
+    keys limits the refresh to the given (repayment_id, comment_type) pairs;
+    None rebuilds every aggregate. The caller commits.
+    """
+    key = repayment_key(Comments)
+    latest = (
+        select(
+            key.label("repayment_id"),
+            Comments.comment_type,
+            func.count(Comments.id).label("comment_count"),
+            func.max(Comments.id).label("latest_comment_id")
+        )
+        .where(key > 0)  # Non-numeric legacy repayment_id values cast to 0
+        .group_by(key, Comments.comment_type)
+    )
+    clear = delete(CommentSummary)
+    
+    if keys is not None:
+        keys = list(keys)
+        if not keys:
+            return
+        latest = latest.where(tuple_(key, Comments.comment_type).in_(keys))
+        clear = clear.where(tuple_(CommentSummary.repayment_id, CommentSummary.comment_type).in_(keys))
+    
+    latest = latest.subquery()
+    db.execute(clear)
+    db.execute(
+        insert(CommentSummary).from_select(
+            [
+                "repayment_id", "comment_type", "comment_count", "latest_comment_id",
+                "latest_comment", "latest_user_id", "latest_user_name", "latest_commented_at"
+            ],
+            select(
+                latest.c.repayment_id,
+                latest.c.comment_type,
+                latest.c.comment_count,
+                latest.c.latest_comment_id,
+                Comments.comment,
+                Comments.user_id,
+                User.name,
+                Comments.commented_at
+            )
+            .join(Comments, Comments.id == latest.c.latest_comment_id)
+            .outerjoin(User, Comments.user_id == User.id)
+        )
+    )
+
+def get_comment_summaries(
+    db: Session,
+    repayment_ids: Iterable[Any],
+    comment_type: CommentTypeEnum
+) -> Dict[int, Dict[str, Any]]:
+    """Get comment aggregates for many repayments in one query, keyed by integer repayment_id"""
+    repayment_ids = {parse_repayment_id(repayment_id) for repayment_id in repayment_ids} - {None}
+    if not repayment_ids:
+        return {}
+    
+    rows = db.query(CommentSummary).filter(
+        CommentSummary.repayment_id.in_(repayment_ids),
+        CommentSummary.comment_type == comment_type.value
+    ).all()
+    
+    return {
+        row.repayment_id: {
+            "comment_count": row.comment_count,
+            "latest_comment": row.latest_comment,
+            "latest_user_name": row.latest_user_name,
+            "latest_commented_at": row.latest_commented_at
+        }
+        for row in rows
+    }
 
 def create_comment(db: Session, comment: CommentCreate, user_name: str) -> Dict[str, Any]:
-    """Create a new comment"""
+    """Create a new comment and update its repayment's comment aggregate"""
     db_comment = Comments(
-        repayment_id=comment.repayment_id,
+        **repayment_key_values(comment.repayment_id),
         user_id=comment.user_id,
         comment=comment.comment,
         comment_type=comment.comment_type.value,  # Extract integer value from enum
         commented_at=func.now()
     )
     db.add(db_comment)
+    db.flush()
+    db.refresh(db_comment)
+    
+    _record_comment_in_summary(db, db_comment, user_name)
+    
     db.commit()
     db.refresh(db_comment)
     
@@ -29,15 +161,30 @@ def create_comment(db: Session, comment: CommentCreate, user_name: str) -> Dict[
         "user_name": user_name
     }
 
-def get_comments_by_repayment(db: Session, repayment_id: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-    """Get all comments by repayment_id (which is payment_details.id)"""
-    comments = db.query(Comments, User.name.label('user_name'))\
-        .join(User, Comments.user_id == User.id)\
-        .filter(Comments.repayment_id == repayment_id)\
-        .order_by(desc(Comments.commented_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+def _page_comments(query, skip: int, limit: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Apply newest-first ordering and pagination to a comments query.
+    
+    With a cursor from a previous page, pages by (commented_at, id) keyset and
+    skip is ignored; otherwise falls back to offset paging.
+    """
+    dialect = dialect_name(query.session)
+    commented_at = sortable_timestamp(dialect, Comments.commented_at)
+    if cursor:
+        last_commented_at, last_id = decode_cursor(cursor, datetime.fromisoformat, int)
+        last_commented_at = sortable_timestamp_value(dialect, last_commented_at)
+        query = query.filter(or_(
+            commented_at < last_commented_at,
+            and_(commented_at == last_commented_at, Comments.id < last_id)
+        ))
+    
+    query = query.order_by(desc(commented_at), desc(Comments.id))
+    if not cursor:
+        query = query.offset(skip)
+    
+    comments = query.limit(limit + 1).all()
+    has_more = len(comments) > limit
+    comments = comments[:limit]
     
     # Convert SQLAlchemy models to dictionaries
     result = []
@@ -52,43 +199,188 @@ def get_comments_by_repayment(db: Session, repayment_id: str, skip: int = 0, lim
             "user_name": user_name
         })
     
-    return result
+    next_cursor = None
+    if has_more and comments and comments[-1][0].commented_at:
+        last = comments[-1][0]
+        next_cursor = encode_cursor(last.commented_at, last.id)
+    
+    return result, next_cursor
 
-def get_comments_by_repayment_and_type(db: Session, repayment_id: str, comment_type: CommentTypeEnum, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-    """Get comments by repayment_id and specific comment type"""
-    comments = db.query(Comments, User.name.label('user_name'))\
+def get_comments_page_by_repayment(
+    db: Session,
+    repayment_id: str,
+    comment_type: Optional[CommentTypeEnum] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Get one page of comments for a repayment, newest first, plus the next page's cursor"""
+    query = db.query(Comments, User.name.label('user_name'))\
         .join(User, Comments.user_id == User.id)\
-        .filter(
-            Comments.repayment_id == repayment_id,
-            Comments.comment_type == comment_type.value  # Use integer value for filtering
-        )\
-        .order_by(desc(Comments.commented_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+        .filter(repayment_id_matches(Comments, repayment_id))
     
-    # Convert SQLAlchemy models to dictionaries
-    result = []
-    for comment, user_name in comments:
-        result.append({
-            "id": comment.id,
-            "repayment_id": comment.repayment_id,
-            "user_id": comment.user_id,
-            "comment": comment.comment,
-            "comment_type": comment.comment_type,
-            "commented_at": comment.commented_at,
-            "user_name": user_name
-        })
+    if comment_type is not None:
+        query = query.filter(Comments.comment_type == comment_type.value)  # Use integer value for filtering
     
-    return result
+    return _page_comments(query, skip, limit, cursor)
+
+def get_comments_by_repayment(db: Session, repayment_id: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """Get all comments by repayment_id (which is payment_details.id)"""
+    return get_comments_page_by_repayment(db, repayment_id, skip=skip, limit=limit)[0]
+
+def get_comments_by_repayment_and_type(db: Session, repayment_id: str, comment_type: CommentTypeEnum, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """Get comments by repayment_id and specific comment type"""
+    return get_comments_page_by_repayment(db, repayment_id, comment_type, skip=skip, limit=limit)[0]
 
 def get_comments_count_by_repayment(db: Session, repayment_id: str) -> int:
     """Get count of all comments for a repayment_id"""
-    return db.query(Comments).filter(Comments.repayment_id == repayment_id).count()
+    return db.query(Comments).filter(repayment_id_matches(Comments, repayment_id)).count()
 
 def get_comments_count_by_repayment_and_type(db: Session, repayment_id: str, comment_type: CommentTypeEnum) -> int:
     """Get count of comments for a repayment_id by specific type"""
     return db.query(Comments).filter(
-        Comments.repayment_id == repayment_id,
+        repayment_id_matches(Comments, repayment_id),
         Comments.comment_type == comment_type.value  # Use integer value for filtering
-    ).count()
\ No newline at end of file
+    ).count()
+
+def search_comments(
+    db: Session,
+    q: str,
+    emi_month: Optional[str] = None,
+    branch: Optional[str] = None,
+    rm_name: Optional[str] = None,
+    comment_type: Optional[CommentTypeEnum] = None,
+    offset: int = 0,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Find repayments whose comments contain every search term, most recently
+    matched first, with snippets of the latest matching comments.
+    
+    Matching runs against the full-text index (see app.services.comment_search).
+    Raises ValueError for an empty query or a malformed emi_month.
+    """
+    terms = parse_search_terms(q)
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    
+    match_clause = comment_match_clause(db.get_bind().dialect.name, terms)
+    key = repayment_key(Comments)
+    
+    matched = select(
+        Comments.id,
+        key.label("payment_id"),
+        Comments.commented_at
+    ).where(match_clause)
+    if comment_type is not None:
+        matched = matched.where(Comments.comment_type == comment_type.value)
+    matched = matched.subquery()
+    
+    RM = aliased(User)
+    query = (
+        db.query(
+            PaymentDetails.id.label("repayment_id"),
+            LoanDetails.loan_application_id.label("loan_id"),
+            ApplicantDetails.first_name,
+            ApplicantDetails.last_name,
+            Branch.name.label("branch"),
+            RM.name.label("rm_name"),
+            PaymentDetails.demand_date,
+            func.count(matched.c.id).label("match_count"),
+            func.max(matched.c.commented_at).label("latest_match_at")
+        )
+        .select_from(matched)
+        .join(PaymentDetails, PaymentDetails.id == matched.c.payment_id)
+        .join(LoanDetails, PaymentDetails.loan_application_id == LoanDetails.loan_application_id)
+        .join(ApplicantDetails, LoanDetails.applicant_id == ApplicantDetails.applicant_id)
+        .outerjoin(Branch, ApplicantDetails.branch_id == Branch.id)
+        .outerjoin(RM, LoanDetails.Collection_relationship_manager_id == RM.id)
+    )
+    
+    if emi_month:
+        try:
+            month = datetime.strptime(emi_month, '%b-%y')
+        except ValueError:
+            raise ValueError(f"Invalid emi_month: {emi_month}. Expected format like 'Jul-25'")
+        query = query.filter(
+            PaymentDetails.demand_month == month.month,
+            PaymentDetails.demand_year == month.year
+        )
+    
+    if branch:
+        query = query.filter(Branch.name == branch)
+    
+    if rm_name:
+        query = query.filter(RM.name == rm_name)
+    
+    query = query.group_by(
+        PaymentDetails.id, LoanDetails.loan_application_id, ApplicantDetails.first_name,
+        ApplicantDetails.last_name, Branch.name, RM.name, PaymentDetails.demand_date
+    )
+    
+    total = query.count()
+    rows = query.order_by(desc("latest_match_at"), desc(PaymentDetails.id)).offset(offset).limit(limit).all()
+    
+    # Latest matching comments for the page's repayments, in one query that
+    # keeps SEARCH_SNIPPETS_PER_REPAYMENT rows per repayment
+    snippets = {row.repayment_id: [] for row in rows}
+    if rows:
+        commented_at = sortable_timestamp(dialect_name(db), Comments.commented_at)
+        ranked = select(
+            Comments.id,
+            key.label("payment_id"),
+            Comments.comment,
+            Comments.comment_type,
+            Comments.commented_at,
+            Comments.user_id,
+            func.row_number().over(
+                partition_by=key, order_by=(desc(commented_at), desc(Comments.id))
+            ).label("rank")
+        ).where(
+            match_clause,
+            key.in_(list(snippets))
+        )
+        if comment_type is not None:
+            ranked = ranked.where(Comments.comment_type == comment_type.value)
+        ranked = ranked.subquery()
+        
+        snippet_rows = db.query(
+            ranked.c.id,
+            ranked.c.payment_id,
+            ranked.c.comment,
+            ranked.c.comment_type,
+            ranked.c.commented_at,
+            User.name.label("user_name")
+        ).outerjoin(User, ranked.c.user_id == User.id).filter(
+            ranked.c.rank <= SEARCH_SNIPPETS_PER_REPAYMENT
+        ).order_by(ranked.c.payment_id, ranked.c.rank).all()
+        
+        for comment in snippet_rows:
+            snippets[comment.payment_id].append({
+                "comment_id": comment.id,
+                "snippet": make_snippet(comment.comment, terms),
+                "comment_type": comment.comment_type,
+                "user_name": comment.user_name,
+                "commented_at": comment.commented_at
+            })
+    
+    results = []
+    for row in rows:
+        results.append({
+            "repayment_id": row.repayment_id,
+            "loan_id": row.loan_id,
+            "applicant_name": f"{row.first_name or ''} {row.last_name or ''}".strip(),
+            "branch": row.branch,
+            "rm_name": row.rm_name,
+            "emi_month": row.demand_date.strftime('%b-%y') if row.demand_date else None,
+            "match_count": row.match_count,
+            "latest_match_at": row.latest_match_at,
+            "snippets": snippets[row.repayment_id]
+        })
+    
+    return {
+        "query": q,
+        "terms": terms,
+        "total": total,
+        "results": results
+    }
@@ -0,0 +1,146 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, literal, cast, String, union_all, func, or_, and_
+from typing import Dict, Any, List, Optional
+from app.models.applicant_details import ApplicantDetails
+from app.models.loan_details import LoanDetails
+from app.models.co_applicant import CoApplicant
+from app.models.guarantor import Guarantor
+from app.models.reference import Reference
+from app.models.contact_phone_index import ContactPhoneIndex
+from app.schemas.contact_types import ContactTypeEnum
+
+# Response list key for each secondary contact type
+CONTACT_GROUPS = {
+    "co_applicant": "co_applicants",
+    "guarantor": "guarantors",
+    "reference": "references",
+}
+
+def _contacts_union(loan_ids: List[int]):
+    """Build one UNION ALL over applicant, co-applicant, guarantor and reference rows"""
+    applicant = (
+        select(
+            LoanDetails.loan_application_id.label("loan_id"),
+            literal("applicant").label("contact_type"),
+            literal(0).label("type_order"),
+            ApplicantDetails.id.label("row_id"),
+            cast(ApplicantDetails.applicant_id, String).label("contact_id"),
+            ApplicantDetails.first_name,
+            ApplicantDetails.middle_name,
+            ApplicantDetails.last_name,
+            ApplicantDetails.mobile
+        )
+        .join(ApplicantDetails, ApplicantDetails.applicant_id == LoanDetails.applicant_id)
+        .where(LoanDetails.loan_application_id.in_(loan_ids))
+    )
+
+    parts = [applicant]
+    for type_order, (model, contact_type) in enumerate(
+        [(CoApplicant, "co_applicant"), (Guarantor, "guarantor"), (Reference, "reference")], start=1
+    ):
+        parts.append(
+            select(
+                model.loan_application_id.label("loan_id"),
+                literal(contact_type).label("contact_type"),
+                literal(type_order).label("type_order"),
+                model.id.label("row_id"),
+                cast(model.id, String).label("contact_id"),
+                model.first_name,
+                model.middle_name,
+                model.last_name,
+                model.mobile
+            )
+            .where(model.loan_application_id.in_(loan_ids))
+        )
+
+    contacts = union_all(*parts).subquery()
+    return select(contacts).order_by(contacts.c.loan_id, contacts.c.type_order, contacts.c.row_id)
+
+def get_contacts_for_loans(db: Session, loan_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Get contacts for many loans in a single query.
+
+    Returns {loan_id: contacts} for loans that have an applicant; loans
+    without one are left out.
+    """
+    if not loan_ids:
+        return {}
+
+    rows = db.execute(_contacts_union(list(set(loan_ids)))).all()
+
+    applicants = {}
+    others: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+    for row in rows:
+        if row.contact_type == "applicant":
+            # First applicant row wins, matching the previous .first() lookup
+            applicants.setdefault(row.loan_id, {
+                "id": row.contact_id,
+                "name": f"{row.first_name or ''} {row.last_name or ''}".strip(),
+                "phone": row.mobile,
+                "email": None,
+                "type": "applicant"
+            })
+            continue
+
+        name_parts = [part for part in (row.first_name, row.middle_name, row.last_name) if part]
+        groups = others.setdefault(row.loan_id, {key: [] for key in CONTACT_GROUPS.values()})
+        groups[CONTACT_GROUPS[row.contact_type]].append({
+            "id": int(row.contact_id),
+            "name": " ".join(name_parts) if name_parts else "Unknown Name",
+            "phone": row.mobile,
+            "email": None,
+            "type": row.contact_type
+        })
+
+    contacts = {}
+    for loan_id, applicant in applicants.items():
+        groups = others.get(loan_id, {key: [] for key in CONTACT_GROUPS.values()})
+        contacts[loan_id] = {"loan_id": loan_id, "applicant": applicant, **groups}
+    return contacts
+
+def get_contacts_for_loan(db: Session, loan_id: int) -> Optional[Dict[str, Any]]:
+    """Get all contacts for one loan, or None when it has no applicant"""
+    return get_contacts_for_loans(db, [loan_id]).get(loan_id)
+
+def lookup_contacts_by_phone(db: Session, phone: str) -> List[Dict[str, Any]]:
+    """
+    Find loans and contact roles for a phone number with one probe of
+    contact_phone_index. Applicant entries expand to every loan of that applicant.
+    """
+    contact_types = {member.value: member.name for member in ContactTypeEnum}
+
+    rows = db.execute(
+        select(
+            ContactPhoneIndex.contact_type,
+            ContactPhoneIndex.source_id,
+            ContactPhoneIndex.contact_name,
+            func.coalesce(
+                ContactPhoneIndex.loan_application_id, LoanDetails.loan_application_id
+            ).label("loan_id"),
+            LoanDetails.applicant_id.label("loan_applicant_id"),
+            ContactPhoneIndex.applicant_id
+        )
+        .outerjoin(LoanDetails, or_(
+            and_(
+                ContactPhoneIndex.applicant_id.isnot(None),
+                LoanDetails.applicant_id == ContactPhoneIndex.applicant_id
+            ),
+            and_(
+                ContactPhoneIndex.applicant_id.is_(None),
+                LoanDetails.loan_application_id == ContactPhoneIndex.loan_application_id
+            )
+        ))
+        .where(ContactPhoneIndex.phone == phone)
+        .order_by(ContactPhoneIndex.contact_type, ContactPhoneIndex.source_id)
+    ).all()
+
+    return [
+        {
+            "loan_id": row.loan_id,
+            "applicant_id": row.applicant_id or row.loan_applicant_id,
+            "contact_type": contact_types.get(row.contact_type, str(row.contact_type)),
+            "contact_id": row.source_id,
+            "name": row.contact_name
+        }
+        for row in rows
+    ]
@@ -1,11 +1,9 @@
 from sqlalchemy.orm import Session, aliased
-from app.models.branch import Branch
-from app.models.dealer import Dealer
-from app.models.lenders import Lender
-from app.models.repayment_status import RepaymentStatus
 from app.models.vehicle_status import VehicleStatus
 from app.models.payment_details import PaymentDetails
 from app.models.user import User
+from app.services.reference_data import reference_data
+from app.db.dialect import dialect_name, month_key
 from datetime import date, timedelta
 
 
@@ -15,11 +13,11 @@ def filter_options(db: Session):
     tomorrow = today + timedelta(days=1)
 
 
-    emi_months = sorted(list(set([
-    row[0].strftime("%Y-%m") 
-    for row in db.query(PaymentDetails.demand_date.distinct()).all() 
-    if row[0]
-])))
+    # Distinct months computed by the database, not one row per demand date
+    month = month_key(dialect_name(db), PaymentDetails.demand_date)
+    emi_months = sorted(
+        row[0] for row in db.query(month).filter(PaymentDetails.demand_date != None).distinct().all()
+    )
     
     # FIXED: Use ptp_date for PTP filtering, not payment_date
     raw_dates = [
@@ -57,10 +55,10 @@ def filter_options(db: Session):
 
 
 
-    branches =  [b.name for b in db.query(Branch).all()]
-    dealers = [d.name for d in db.query(Dealer).all()]
-    lenders = [l.name for l in db.query(Lender).all()]
-    statuses = [r.repayment_status for r in db.query(RepaymentStatus).all()]
+    branches = reference_data.get_names(db, "branch")
+    dealers = reference_data.get_names(db, "dealer")
+    lenders = reference_data.get_names(db, "lender")
+    statuses = reference_data.get_names(db, "repayment_status")
     vehicle_statuses = [v.vehicle_status for v in db.query(VehicleStatus).all()]
     team_leads = [u.name for u in db.query(User).filter(User.role == "TL")]
     rms = [u.name for u in db.query(User).filter(User.role == "RM")]
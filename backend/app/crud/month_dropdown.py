@@ -5,29 +5,12 @@ from app.models.payment_details import PaymentDetails
 from app.models.loan_details import LoanDetails
 from datetime import date
 
-def get_month_dropdown_options(
-    db: Session,
-    loan_id: str
-) -> Dict[str, Any]:
-    """Get all available months for a loan application"""
-    
-    try:
-        loan_id_int = int(loan_id)
-    except ValueError:
-        raise ValueError("loan_id must be a valid integer")
-    
-    # Get all payment records for this loan, ordered by demand_date
-    payment_records = db.query(PaymentDetails).filter(
-        PaymentDetails.loan_application_id == loan_id_int
-    ).order_by(PaymentDetails.demand_date).all()
-    
-    if not payment_records:
-        raise ValueError(f"No payment records found for loan_id: {loan_id}")
-    
+def _build_month_options(loan_id: str, payment_rows) -> Dict[str, Any]:
+    """Build the dropdown response from (id, demand_date) rows ordered by demand_date"""
     months = []
     current_date = date.today()
     
-    for payment in payment_records:
+    for payment in payment_rows:
         if payment.demand_date:
             # Format month as "Aug-25"
             month_formatted = payment.demand_date.strftime('%b-%y')
@@ -53,3 +36,51 @@ def get_month_dropdown_options(
         "months": months,
         "message": f"Found {len(months)} months for loan {loan_id}"
     }
+
+def get_month_dropdown_options(
+    db: Session,
+    loan_id: str
+) -> Dict[str, Any]:
+    """Get all available months for a loan application"""
+    
+    try:
+        loan_id_int = int(loan_id)
+    except ValueError:
+        raise ValueError("loan_id must be a valid integer")
+    
+    # Only id and demand_date are needed; served from the
+    # (loan_application_id, demand_date, id) covering index
+    payment_records = db.query(PaymentDetails.id, PaymentDetails.demand_date).filter(
+        PaymentDetails.loan_application_id == loan_id_int
+    ).order_by(PaymentDetails.demand_date).all()
+    
+    if not payment_records:
+        raise ValueError(f"No payment records found for loan_id: {loan_id}")
+    
+    return _build_month_options(loan_id, payment_records)
+
+def get_month_dropdown_options_batch(
+    db: Session,
+    loan_ids: List[int]
+) -> Dict[int, Dict[str, Any]]:
+    """Get available months for many loan applications in one query"""
+    
+    if not loan_ids:
+        return {}
+    
+    payment_records = db.query(
+        PaymentDetails.loan_application_id,
+        PaymentDetails.id,
+        PaymentDetails.demand_date
+    ).filter(
+        PaymentDetails.loan_application_id.in_(set(loan_ids))
+    ).order_by(PaymentDetails.loan_application_id, PaymentDetails.demand_date).all()
+    
+    rows_by_loan: Dict[int, list] = {}
+    for row in payment_records:
+        rows_by_loan.setdefault(row.loan_application_id, []).append(row)
+    
+    return {
+        loan_id: _build_month_options(str(loan_id), rows)
+        for loan_id, rows in rows_by_loan.items()
+    }
@@ -9,8 +9,9 @@ from app.models.branch import Branch
 from app.models.dealer import Dealer
 from app.models.lenders import Lender
 from app.models.user import User
-from app.models.comments import Comments
-from app.models.repayment_status import RepaymentStatus
+from app.crud.comments import get_comment_summaries
+from app.schemas.comments import CommentTypeEnum
+from app.services.reference_data import reference_data
 
 def get_paid_pending_applications(
     db: Session,
@@ -20,11 +21,9 @@ def get_paid_pending_applications(
     """Get all applications that are in 'Paid(Pending Approval)' status"""
     
     # Get the Paid(Pending Approval) status ID
-    paid_pending_approval_status = db.query(RepaymentStatus).filter(
-        RepaymentStatus.repayment_status == "Paid(Pending Approval)"
-    ).first()
+    paid_pending_approval_status_id = reference_data.get_id(db, "repayment_status", "Paid(Pending Approval)")
     
-    if not paid_pending_approval_status:
+    if paid_pending_approval_status_id is None:
         return []
     
     # Create aliases for User table (RM and TL)
@@ -56,24 +55,21 @@ def get_paid_pending_applications(
         .join(Lender, LoanDetails.lenders_id == Lender.id)
         .join(RM, LoanDetails.Collection_relationship_manager_id == RM.id)
         .join(TL, LoanDetails.source_relationship_manager_id == TL.id)
-        .filter(PaymentDetails.repayment_status_id == paid_pending_approval_status.id)
+        .filter(PaymentDetails.repayment_status_id == paid_pending_approval_status_id)
         .order_by(desc(PaymentDetails.demand_date))
     )
     
     total = query.count()
     results = []
     
-    for row in query.offset(skip).limit(limit).all():
-        # Get comments for this payment (type 2 - paid pending comments)
-        comments = db.query(Comments).filter(
-            and_(
-                Comments.repayment_id == str(row.payment_id),
-                Comments.comment_type == 2  # Paid pending comments
-            )
-        ).order_by(desc(Comments.commented_at)).all()
-        
-        comment_list = [c.comment for c in comments]
-        
+    rows = query.offset(skip).limit(limit).all()
+    
+    # Comment aggregates for the whole page (type 2 - paid pending comments)
+    comment_summaries = get_comment_summaries(
+        db, [row.payment_id for row in rows], CommentTypeEnum.paid_pending
+    )
+    
+    for row in rows:
         results.append({
             "loan_id": str(row.loan_id),
             "applicant_name": f"{row.first_name or ''} {row.last_name or ''}".strip(),
@@ -86,7 +82,7 @@ def get_paid_pending_applications(
             "tl_name": row.tl_name,
             "dealer": row.dealer,
             "lender": row.lender,
-            "comments": comment_list
+            "comment_summary": comment_summaries.get(row.payment_id)
         })
     
     return results
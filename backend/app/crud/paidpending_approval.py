@@ -1,15 +1,192 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import DateTime, and_, or_, func, desc, asc, update, insert
+from typing import Optional, Dict, Any, List
+from datetime import date, datetime
+from decimal import Decimal
 from app.models.payment_details import PaymentDetails
-from app.models.repayment_status import RepaymentStatus
-from app.schemas.paidpending_approval import PaidPendingApprovalRequest
+from app.models.loan_details import LoanDetails
+from app.models.applicant_details import ApplicantDetails
+from app.models.branch import Branch
+from app.models.user import User
+from app.models.comments import Comments
+from app.models.audit_payment_details import AuditPaymentDetails
+from app.schemas.paidpending_approval import PaidPendingApprovalRequest, PaidPendingBulkApprovalItem, ApprovalActionEnum
+from app.schemas.comments import CommentTypeEnum
+from app.crud.comments import refresh_comment_summaries
+from app.services.reference_data import reference_data
+from app.services.payment_audit import orm_audit_enabled, status_change_row
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.db.dialect import dialect_name, set_session_user, sortable_timestamp, sortable_timestamp_value
+from app.db.repayment_keys import repayment_key_values
+
+# Sort keys accepted by the approval queue: column and cursor value parser.
+# The queue is ordered and sought on the raw column so an index such as
+# ix_payment_details_status_demand_date serves ORDER BY ... LIMIT; rows whose
+# sort value is NULL are paged as a separate segment (see _queue_segments)
+QUEUE_SORT_COLUMNS = {
+    "demand_date": (PaymentDetails.demand_date, date.fromisoformat),
+    "updated_at": (PaymentDetails.updated_at, datetime.fromisoformat),
+    "amount": (PaymentDetails.amount_collected, Decimal),
+}
+
+def _optional(parser):
+    return lambda value: None if value is None else parser(value)
+
+def _queue_segments(query, sort_expr, order: str, last_value: Any = None, last_id: Optional[int] = None) -> List[Any]:
+    """
+    Queries that together return the queue rows after the cursor (last_value,
+    last_id), or from the start when last_id is None, in page order.
+
+    NULLs sort lowest: last for desc, first for asc. Rather than coalescing
+    them into the sort key, which no index can serve, rows with a value form
+    one range ordered by (sort value, id) and NULL rows another ordered by id.
+    """
+    descending = order == "desc"
+    direction = desc if descending else asc
+    values = query.filter(sort_expr.isnot(None)).order_by(direction(sort_expr), direction(PaymentDetails.id))
+    nulls = query.filter(sort_expr.is_(None)).order_by(direction(PaymentDetails.id))
+
+    if last_id is not None:
+        after_id = PaymentDetails.id < last_id if descending else PaymentDetails.id > last_id
+        if last_value is None:
+            # The cursor is inside the NULL segment
+            nulls = nulls.filter(after_id)
+            return [nulls] if descending else [nulls, values]
+        after_value = sort_expr < last_value if descending else sort_expr > last_value
+        values = values.filter(or_(after_value, and_(sort_expr == last_value, after_id)))
+        if not descending:
+            return [values]
+    return [values, nulls] if descending else [nulls, values]
+
+def get_paidpending_approval_queue(
+    db: Session,
+    sort_by: str = "demand_date",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    branch: Optional[str] = None,
+    rm_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of payments in "Paid(Pending Approval)" status.
+
+    Loan, applicant, branch and RM are joined in a single statement and paged
+    with a (sort value, payment id) keyset, so the number of queries does not
+    grow with the length of the queue.
+    """
+    if sort_by not in QUEUE_SORT_COLUMNS:
+        raise ValueError(f"Invalid sort_by: {sort_by}. Must be one of {', '.join(QUEUE_SORT_COLUMNS)}")
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Invalid order: {order}. Must be 'asc' or 'desc'")
+
+    paid_pending_status_id = reference_data.get_id(db, "repayment_status", "Paid(Pending Approval)")
+    if paid_pending_status_id is None:
+        return {
+            "total_applications": 0,
+            "status": "Paid(Pending Approval)",
+            "sort_by": sort_by,
+            "order": order,
+            "next_cursor": None,
+            "applications": []
+        }
+
+    column, parse_sort_value = QUEUE_SORT_COLUMNS[sort_by]
+    # SQLite timestamps are text in mixed precisions; compare them normalized
+    dialect = dialect_name(db)
+    is_timestamp = isinstance(column.type, DateTime)
+    sort_expr = sortable_timestamp(dialect, column) if is_timestamp else column
+    RM = aliased(User)
+
+    base_query = (
+        db.query(PaymentDetails.id)
+        .select_from(PaymentDetails)
+        .join(LoanDetails, PaymentDetails.loan_application_id == LoanDetails.loan_application_id)
+        .outerjoin(ApplicantDetails, LoanDetails.applicant_id == ApplicantDetails.applicant_id)
+        .outerjoin(Branch, ApplicantDetails.branch_id == Branch.id)
+        .outerjoin(RM, LoanDetails.Collection_relationship_manager_id == RM.id)
+        .filter(PaymentDetails.repayment_status_id == paid_pending_status_id)
+    )
+
+    if branch:
+        base_query = base_query.filter(Branch.name == branch)
+
+    if rm_name:
+        base_query = base_query.filter(RM.name == rm_name)
+
+    total = base_query.order_by(None).count()
+
+    page_query = base_query.with_entities(
+        PaymentDetails.id.label("payment_id"),
+        PaymentDetails.loan_application_id,
+        PaymentDetails.amount_collected,
+        PaymentDetails.demand_amount,
+        PaymentDetails.ptp_date,
+        PaymentDetails.demand_date,
+        PaymentDetails.payment_date,
+        PaymentDetails.updated_at,
+        LoanDetails.applicant_id,
+        ApplicantDetails.first_name,
+        ApplicantDetails.last_name,
+        Branch.name.label("branch"),
+        RM.name.label("rm_name")
+    )
+
+    last_value, last_id = None, None
+    if cursor:
+        try:
+            last_value, last_id = decode_cursor(cursor, _optional(parse_sort_value), int)
+        except ValueError:
+            raise ValueError(f"Invalid cursor for sort_by '{sort_by}'")
+        if is_timestamp and last_value is not None:
+            last_value = sortable_timestamp_value(dialect, last_value)
+
+    rows = []
+    for segment in _queue_segments(page_query, sort_expr, order, last_value, last_id):
+        rows.extend(segment.limit(limit + 1 - len(rows)).all())
+        if len(rows) > limit:
+            break
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    applications = []
+    for row in rows:
+        applications.append({
+            "loan_id": row.loan_application_id,
+            "repayment_id": str(row.payment_id),
+            "applicant_id": row.applicant_id,
+            "applicant_name": f"{row.first_name or ''} {row.last_name or ''}".strip() if row.first_name or row.last_name else "Unknown",
+            "current_status": "Paid(Pending Approval)",
+            "branch": row.branch,
+            "rm_name": row.rm_name,
+            "amount_collected": float(row.amount_collected) if row.amount_collected else 0,
+            "ptp_date": row.ptp_date.isoformat() if row.ptp_date else None,
+            "demand_date": row.demand_date.isoformat() if row.demand_date else None,
+            "demand_amount": float(row.demand_amount) if row.demand_amount else 0,
+            "payment_date": row.payment_date.isoformat() if row.payment_date else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None
+        })
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, column.key), last.payment_id)
+
+    return {
+        "total_applications": total,
+        "status": "Paid(Pending Approval)",
+        "sort_by": sort_by,
+        "order": order,
+        "next_cursor": next_cursor,
+        "applications": applications
+    }
 
 def process_paidpending_approval(
     db: Session,
     approval_data: PaidPendingApprovalRequest
 ) -> dict:
     """Process paidpending approval - accept or reject"""
+    set_session_user(db, approval_data.user_id)
     
     # First, get the payment_details record for this application and repayment_id
     payment_record = db.query(PaymentDetails).filter(
@@ -23,36 +200,20 @@ def process_paidpending_approval(
         raise ValueError(f"No payment record found for application {approval_data.loan_id} and repayment_id {approval_data.repayment_id}")
     
     # Get current repayment status name BEFORE updating (this is the previous status)
-    previous_status_name = None
-    if payment_record.repayment_status_id:
-        current_status_record = db.query(RepaymentStatus).filter(
-            RepaymentStatus.id == payment_record.repayment_status_id
-        ).first()
-        if current_status_record:
-            previous_status_name = current_status_record.repayment_status
+    previous_status_name = reference_data.get_name(db, "repayment_status", payment_record.repayment_status_id)
     
     # Check if current status is "Paid(Pending Approval)" (we need to find the ID for this)
-    paid_pending_approval_status = db.query(RepaymentStatus).filter(
-        RepaymentStatus.repayment_status == "Paid(Pending Approval)"
-    ).first()
+    paid_pending_approval_status_id = reference_data.get_id(db, "repayment_status", "Paid(Pending Approval)")
     
-    if not paid_pending_approval_status:
+    if paid_pending_approval_status_id is None:
         raise ValueError("'Paid(Pending Approval)' status not found in repayment_status table")
     
-    if payment_record.repayment_status_id != paid_pending_approval_status.id:
+    if payment_record.repayment_status_id != paid_pending_approval_status_id:
         raise ValueError(f"Current status is '{previous_status_name}', not 'Paid(Pending Approval)'. Cannot process approval.")
     
     # Process based on action
     if approval_data.action == "accept":
         # ACCEPT: Change to "Paid"
-        paid_status = db.query(RepaymentStatus).filter(
-            RepaymentStatus.repayment_status == "Paid"
-        ).first()
-        
-        if not paid_status:
-            raise ValueError("'Paid' status not found in repayment_status table")
-        
-        payment_record.repayment_status_id = paid_status.id
         new_status_name = "Paid"
         message = "Payment approved successfully. Status changed to Paid."
         
@@ -60,29 +221,19 @@ def process_paidpending_approval(
         # REJECT: Check amount and decide status
         if payment_record.amount_collected and float(payment_record.amount_collected) > 0:
             # Has amount → "Partially Paid"
-            partially_paid_status = db.query(RepaymentStatus).filter(
-                RepaymentStatus.repayment_status == "Partially Paid"
-            ).first()
-            
-            if not partially_paid_status:
-                raise ValueError("'Partially Paid' status not found in repayment_status table")
-            
-            payment_record.repayment_status_id = partially_paid_status.id
             new_status_name = "Partially Paid"
             message = f"Payment rejected. Status changed to Partially Paid due to existing amount: {payment_record.amount_collected}"
         else:
             # No amount → "Paid Rejected"
-            paid_rejected_status = db.query(RepaymentStatus).filter(
-                RepaymentStatus.repayment_status == "Paid Rejected"
-            ).first()
-            
-            if not paid_rejected_status:
-                raise ValueError("'Paid Rejected' status not found in repayment_status table")
-            
-            payment_record.repayment_status_id = paid_rejected_status.id
             new_status_name = "Paid Rejected"
             message = "Payment rejected. Status changed to Paid Rejected due to no amount collected."
     
+    new_status_id = reference_data.get_id(db, "repayment_status", new_status_name)
+    if new_status_id is None:
+        raise ValueError(f"'{new_status_name}' status not found in repayment_status table")
+    
+    payment_record.repayment_status_id = new_status_id
+    
     # Commit changes
     db.commit()
     db.refresh(payment_record)
@@ -97,3 +248,149 @@ def process_paidpending_approval(
         "updated_at": payment_record.updated_at.isoformat() if payment_record.updated_at else None,
         "comments": approval_data.comments
     }
+
+def process_bulk_paidpending_approval(
+    db: Session,
+    items: List[PaidPendingBulkApprovalItem],
+    user_id: int
+) -> Dict[str, Any]:
+    """
+    Process a batch of paidpending approvals in one transaction.
+
+    Current statuses are validated with one query, status changes are applied
+    with one UPDATE per target status and approval comments are written with a
+    single insert. Items that fail validation are reported and skipped; the
+    rest are committed together.
+    """
+    set_session_user(db, user_id)
+
+    # Resolve every status this workflow touches
+    status_ids = {}
+    for required in ("Paid(Pending Approval)", "Paid", "Partially Paid", "Paid Rejected"):
+        status_ids[required] = reference_data.get_id(db, "repayment_status", required)
+        if status_ids[required] is None:
+            raise ValueError(f"'{required}' status not found in repayment_status table")
+
+    # Load current state of every referenced payment, locked for this transaction
+    repayment_ids = []
+    for item in items:
+        try:
+            repayment_ids.append(int(item.repayment_id))
+        except ValueError:
+            pass
+
+    payments = {}
+    if repayment_ids:
+        rows = (
+            db.query(
+                PaymentDetails.id,
+                PaymentDetails.loan_application_id,
+                PaymentDetails.amount_collected,
+                PaymentDetails.ptp_date,
+                PaymentDetails.repayment_status_id
+            )
+            .filter(PaymentDetails.id.in_(repayment_ids))
+            .with_for_update()
+            .all()
+        )
+        payments = {row.id: row for row in rows}
+
+    results = []
+    ids_by_new_status: Dict[int, List[int]] = {}
+    comment_rows = []
+    audit_rows = []
+    seen = set()
+
+    for item in items:
+        result = {
+            "loan_id": str(item.loan_id),
+            "repayment_id": str(item.repayment_id),
+            "action": item.action.value,
+            "success": False,
+            "previous_status": None,
+            "new_status": None,
+            "message": ""
+        }
+        results.append(result)
+
+        try:
+            repayment_id = int(item.repayment_id)
+        except ValueError:
+            result["message"] = f"Invalid repayment_id: {item.repayment_id}"
+            continue
+
+        if repayment_id in seen:
+            result["message"] = f"Duplicate repayment_id {repayment_id} in batch"
+            continue
+        seen.add(repayment_id)
+
+        payment = payments.get(repayment_id)
+        if not payment or str(payment.loan_application_id) != str(item.loan_id):
+            result["message"] = f"No payment record found for application {item.loan_id} and repayment_id {item.repayment_id}"
+            continue
+
+        previous_status_name = reference_data.get_name(db, "repayment_status", payment.repayment_status_id) or "Unknown"
+        result["previous_status"] = previous_status_name
+
+        if payment.repayment_status_id != status_ids["Paid(Pending Approval)"]:
+            result["message"] = f"Current status is '{previous_status_name}', not 'Paid(Pending Approval)'. Cannot process approval."
+            continue
+
+        # Same transition rules as process_paidpending_approval
+        if item.action == ApprovalActionEnum.accept:
+            new_status_name = "Paid"
+            message = "Payment approved successfully. Status changed to Paid."
+        elif payment.amount_collected and float(payment.amount_collected) > 0:
+            new_status_name = "Partially Paid"
+            message = f"Payment rejected. Status changed to Partially Paid due to existing amount: {payment.amount_collected}"
+        else:
+            new_status_name = "Paid Rejected"
+            message = "Payment rejected. Status changed to Paid Rejected due to no amount collected."
+
+        ids_by_new_status.setdefault(status_ids[new_status_name], []).append(repayment_id)
+        audit_rows.append(status_change_row(payment, status_ids[new_status_name], user_id))
+
+        if item.comments:
+            comment_rows.append({
+                **repayment_key_values(repayment_id),
+                "user_id": user_id,
+                "comment": item.comments,
+                "comment_type": CommentTypeEnum.paid_pending.value
+            })
+
+        result.update(success=True, new_status=new_status_name, message=message)
+
+    try:
+        # One UPDATE per target status
+        for new_status_id, ids in ids_by_new_status.items():
+            db.execute(
+                update(PaymentDetails)
+                .where(
+                    PaymentDetails.id.in_(ids),
+                    PaymentDetails.repayment_status_id == status_ids["Paid(Pending Approval)"]
+                )
+                .values(repayment_status_id=new_status_id)
+                .execution_options(synchronize_session=False)
+            )
+
+        # Without the MySQL triggers, audit the status changes here
+        if audit_rows and orm_audit_enabled(dialect_name(db)):
+            db.execute(insert(AuditPaymentDetails), audit_rows)
+
+        if comment_rows:
+            db.execute(insert(Comments).values(commented_at=func.now()), comment_rows)
+            refresh_comment_summaries(
+                db, [(row["payment_id"], row["comment_type"]) for row in comment_rows]
+            )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    success_count = sum(1 for r in results if r["success"])
+    return {
+        "success_count": success_count,
+        "failed_count": len(results) - success_count,
+        "results": results
+    }
@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, or_
 from typing import List, Optional
 from app.models.audit_payment_details import AuditPaymentDetails
-from app.models.repayment_status import RepaymentStatus
 from app.models.user import User
 from app.schemas.recent_activity import RecentActivityItem, ActivityTypeEnum
+from app.services.reference_data import reference_data
+from app.db.dialect import json_text
 from datetime import datetime, timedelta
 
+# Audit row keys (old_data/new_data) that produce an activity
+TRACKED_KEYS = ("Repayment_status_id", "ptp_date", "amount_collected")
+
 def get_recent_activity(
     db: Session,
     loan_id: Optional[int] = None,
@@ -24,9 +28,13 @@ def get_recent_activity(
     activities = []
     cutoff_date = datetime.now() - timedelta(days=days_back)
     
-    # Query audit payment details
+    # Query audit payment details that changed at least one tracked field
     query = db.query(AuditPaymentDetails).filter(
-        AuditPaymentDetails.action_timestamp >= cutoff_date
+        AuditPaymentDetails.action_timestamp >= cutoff_date,
+        or_(*(
+            json_text(AuditPaymentDetails.old_data, key).is_distinct_from(json_text(AuditPaymentDetails.new_data, key))
+            for key in TRACKED_KEYS
+        ))
     )
     
     if loan_id:
@@ -101,8 +109,10 @@ def get_repayment_status_name(db: Session, status_id: Optional[int]) -> Optional
     if not status_id:
         return None
     
-    status = db.query(RepaymentStatus).filter(RepaymentStatus.id == status_id).first()
-    return status.repayment_status if status else None
+    try:
+        return reference_data.get_name(db, "repayment_status", int(status_id))
+    except (TypeError, ValueError):
+        return None
 
 def get_user_name(db: Session, changed_by: Optional[str]) -> str:
     """Get user name by ID or return the changed_by value if it's already a name"""
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, text
+from sqlalchemy import and_, func
 from typing import Dict, Any, Optional
 from app.models.payment_details import PaymentDetails
 from app.models.loan_details import LoanDetails
@@ -8,6 +8,8 @@ from app.models.contact_calling import ContactCalling
 from app.models.repayment_status import RepaymentStatus
 from app.schemas.status_management import StatusManagementUpdate, CallingTypeEnum
 from app.schemas.contact_types import ContactTypeEnum
+from app.db.dialect import set_session_user
+from app.db.repayment_keys import repayment_key_values, repayment_id_matches
 
 def update_status_management(
     db: Session, 
@@ -19,7 +21,7 @@ def update_status_management(
     
     # Set user context before any database operations for audit trail
     if user_id:
-        db.execute(text(f"SET @app_user = {user_id}"))
+        set_session_user(db, user_id)
     
     # Find the payment record for this loan
     if status_data.repayment_id:
@@ -70,7 +72,7 @@ def update_status_management(
     if calling_type == CallingTypeEnum.demand_calling and status_data.demand_calling_status is not None:
         # Create calling record for demand calling
         calling_record = Calling(
-            repayment_id=repayment_id,
+            **repayment_key_values(repayment_id),
             caller_user_id=1,  # Default caller, can be updated later
             Calling_id=2,  # 2 for demand calling
             status_id=status_data.demand_calling_status,
@@ -85,7 +87,7 @@ def update_status_management(
         # Create calling record for contact calling
         contact_type_value = (status_data.contact_type or ContactTypeEnum.applicant).value
         calling_record = Calling(
-            repayment_id=repayment_id,
+            **repayment_key_values(repayment_id),
             caller_user_id=1,  # Default caller, can be updated later
             Calling_id=1,  # 1 for contact calling
             status_id=status_data.contact_calling_status,
@@ -102,14 +104,14 @@ def update_status_management(
     # Get existing calling statuses for response
     existing_demand_calling = db.query(Calling).filter(
         and_(
-            Calling.repayment_id == repayment_id,
+            repayment_id_matches(Calling, repayment_id),
             Calling.Calling_id == 2  # Demand calling
         )
     ).order_by(Calling.created_at.desc()).first()
     
     existing_contact_calling = db.query(Calling).filter(
         and_(
-            Calling.repayment_id == repayment_id,
+            repayment_id_matches(Calling, repayment_id),
             Calling.Calling_id == 1,  # Contact calling
             Calling.contact_type == (status_data.contact_type or ContactTypeEnum.applicant).value
         )
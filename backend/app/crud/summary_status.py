@@ -7,6 +7,7 @@ from app.models.dealer import Dealer
 from app.models.lenders import Lender
 from app.models.user import User
 from app.models.repayment_status import RepaymentStatus
+from app.services.reference_data import reference_data
 from sqlalchemy import func, text, and_, or_
 from fastapi import HTTPException
 from datetime import datetime, date, timedelta
@@ -90,9 +91,9 @@ def get_summary_status_with_filters(
         if ptp_date_filter == "overdue":
             query = query.filter(PaymentDetails.ptp_date < today)
         elif ptp_date_filter == "today":
-            query = query.filter(func.date(PaymentDetails.ptp_date) == today)
+            query = query.filter(PaymentDetails.ptp_date == today)
         elif ptp_date_filter == "tomorrow":
-            query = query.filter(func.date(PaymentDetails.ptp_date) == tomorrow)
+            query = query.filter(PaymentDetails.ptp_date == tomorrow)
         elif ptp_date_filter == "future":
             query = query.filter(PaymentDetails.ptp_date > tomorrow)
         elif ptp_date_filter == "no_ptp":
@@ -129,7 +130,7 @@ def get_summary_status_with_filters(
     }
     
     for status_id, count in results:
-        status_str = db.query(RepaymentStatus.repayment_status).filter(RepaymentStatus.id == status_id).scalar()
+        status_str = reference_data.get_name(db, "repayment_status", status_id)
         if status_str:
             key = status_map.get(status_str)
             if key and key in summary:
@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import insert, update, case, func
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import verify_password, get_password_hash
-from typing import Optional, List, Dict, Any
+from app.services.principal_cache import principal_cache
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -13,9 +16,21 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """Get user by ID"""
     return db.query(User).filter(User.id == user_id).first()
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create new user with hashed password"""
-    hashed_password = get_password_hash(user.password)
+def get_user_token_version(db: Session, user_id: int) -> Optional[int]:
+    """Get the user's current token version, or None if the user does not exist"""
+    row = db.query(User.token_version).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    return row.token_version or 0
+
+def _revoke_tokens(user: User) -> None:
+    """Invalidate every token issued to the user so far; the caller commits"""
+    user.token_version = (user.token_version or 0) + 1
+
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    """Create new user with hashed password; pass hashed_password if already hashed"""
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         name=user.name,
         user_name=user.email.split('@')[0],  # Use email prefix as user_name
@@ -41,14 +56,19 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
 
 def update_user_password(db: Session, user_id: int, new_password: str) -> bool:
     """Update user password"""
+    return set_user_password_hash(db, user_id, get_password_hash(new_password))
+
+def set_user_password_hash(db: Session, user_id: int, hashed_password: str) -> bool:
+    """Store an already hashed password and revoke the user's existing tokens"""
     user = get_user_by_id(db, user_id)
     if not user:
         return False
     
-    hashed_password = get_password_hash(new_password)
     user.password = hashed_password
     user.updated_at = datetime.utcnow()
+    _revoke_tokens(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 def verify_user_password(db: Session, user_id: int, password: str) -> bool:
@@ -70,7 +90,9 @@ def update_user_role(db: Session, user_id: int, new_role: str) -> bool:
     
     user.role = new_role
     user.updated_at = datetime.utcnow()
+    _revoke_tokens(user)  # Tokens carry the role as a claim
     db.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 def delete_user(db: Session, user_id: int) -> bool:
@@ -81,6 +103,7 @@ def delete_user(db: Session, user_id: int) -> bool:
     
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
@@ -118,39 +141,105 @@ def update_logout_time(db: Session, user_id: int) -> bool:
     db.commit()
     return True
 
-def create_bulk_users(db: Session, users: List[UserCreate]) -> Dict[str, Any]:
-    """Create multiple users in bulk with error handling"""
-    created_users = []
-    failed_users = []
+LOGIN_ACTIVITY_CHUNK_SIZE = 500
+
+def apply_login_activity(db: Session, logins: Dict[int, datetime], logouts: Dict[int, datetime]) -> int:
+    """
+    Write buffered login/logout times with one multi-row UPDATE per chunk:
+    each column is set through CASE id WHEN ... so users missing from one
+    map keep their current value.
+    """
+    user_ids = sorted(set(logins) | set(logouts))
+    for start in range(0, len(user_ids), LOGIN_ACTIVITY_CHUNK_SIZE):
+        chunk = user_ids[start:start + LOGIN_ACTIVITY_CHUNK_SIZE]
+        chunk_logins = {user_id: logins[user_id] for user_id in chunk if user_id in logins}
+        chunk_logouts = {user_id: logouts[user_id] for user_id in chunk if user_id in logouts}
+        values = {User.updated_at: func.now()}
+        if chunk_logins:
+            values[User.last_login_time] = case(chunk_logins, value=User.id, else_=User.last_login_time)
+        if chunk_logouts:
+            values[User.last_logout_time] = case(chunk_logouts, value=User.id, else_=User.last_logout_time)
+        db.execute(
+            update(User).where(User.id.in_(chunk)).values(values),
+            execution_options={"synchronize_session": False}
+        )
+    db.commit()
+    return len(user_ids)
+
+def _bulk_failure(user_data: UserCreate, error: str) -> Dict[str, Any]:
+    return {
+        "user_data": {
+            "name": user_data.name,
+            "email": user_data.email,
+            "role": user_data.role
+        },
+        "error": error
+    }
+
+def check_bulk_users(db: Session, users: List[UserCreate]) -> Tuple[List[UserCreate], List[Dict[str, Any]]]:
+    """Split a bulk request into users that can be created and per-user failures, with one email query"""
+    existing_emails = {
+        row.email for row in db.query(User.email).filter(User.email.in_({u.email for u in users}))
+    }
     
+    accepted = []
+    failed_users = []
+    seen = set()
     for user_data in users:
+        if user_data.email in existing_emails:
+            failed_users.append(_bulk_failure(user_data, "Email already registered"))
+        elif user_data.email in seen:
+            failed_users.append(_bulk_failure(user_data, "Duplicate email in request"))
+        else:
+            seen.add(user_data.email)
+            accepted.append(user_data)
+    return accepted, failed_users
+
+def insert_bulk_users(db: Session, users: List[UserCreate], hashed_passwords: List[str]) -> Dict[str, Any]:
+    """
+    Insert pre-checked users with already hashed passwords in one transaction.
+    
+    All rows go in one multi-row INSERT; if a concurrent registration claimed
+    one of the emails in the meantime, rows are retried one by one so only
+    the conflicting users fail.
+    """
+    rows = [
+        {
+            "name": user_data.name,
+            "user_name": user_data.email.split('@')[0],  # Use email prefix as user_name
+            "password": hashed_password,
+            "email": user_data.email,
+            "mobile": user_data.mobile,
+            "role": user_data.role,
+            "status": user_data.status or 'active'
+        }
+        for user_data, hashed_password in zip(users, hashed_passwords)
+    ]
+    
+    failed_users = []
+    created_emails = [row["email"] for row in rows]
+    if rows:
         try:
-            # Check if user already exists
-            existing_user = get_user_by_email(db, user_data.email)
-            if existing_user:
-                failed_users.append({
-                    "user_data": {
-                        "name": user_data.name,
-                        "email": user_data.email,
-                        "role": user_data.role
-                    },
-                    "error": "Email already registered"
-                })
-                continue
-            
-            # Create user
-            db_user = create_user(db, user_data)
-            created_users.append(db_user)
-            
-        except Exception as e:
-            failed_users.append({
-                "user_data": {
-                    "name": user_data.name,
-                    "email": user_data.email,
-                    "role": user_data.role
-                },
-                "error": str(e)
-            })
+            db.execute(insert(User), rows)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            created_emails = []
+            for user_data, row in zip(users, rows):
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(User), [row])
+                    created_emails.append(row["email"])
+                except IntegrityError:
+                    failed_users.append(_bulk_failure(user_data, "Email already registered"))
+            db.commit()
+    
+    created_by_email = {}
+    if created_emails:
+        created_by_email = {
+            user.email: user for user in db.query(User).filter(User.email.in_(created_emails))
+        }
+    created_users = [created_by_email[email] for email in created_emails if email in created_by_email]
     
     return {
         "success_count": len(created_users),
@@ -159,4 +248,10 @@ def create_bulk_users(db: Session, users: List[UserCreate]) -> Dict[str, Any]:
         "failed_users": failed_users
     }
 
- 
\ No newline at end of file
+def create_bulk_users(db: Session, users: List[UserCreate]) -> Dict[str, Any]:
+    """Create multiple users in bulk with error handling (passwords hashed serially)"""
+    accepted, failed_users = check_bulk_users(db, users)
+    result = insert_bulk_users(db, accepted, [get_password_hash(u.password) for u in accepted])
+    result["failed_users"] = failed_users + result["failed_users"]
+    result["failed_count"] = len(result["failed_users"])
+    return result
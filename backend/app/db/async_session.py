@@ -0,0 +1,31 @@
+from functools import lru_cache
+from app.core.config import settings
+from app.db.engine import create_async_db_engine
+
+# The async engines are created on first use so scripts and sync-only
+# deployments do not need the asyncio drivers installed.
+
+@lru_cache(maxsize=None)
+def get_async_engine():
+    return create_async_db_engine()
+
+@lru_cache(maxsize=None)
+def get_async_read_engine():
+    """Replica engine when DATABASE_READ_URL is set, otherwise the primary one"""
+    if settings.DATABASE_READ_URL:
+        return create_async_db_engine(settings.DATABASE_READ_URL)
+    return get_async_engine()
+
+@lru_cache(maxsize=None)
+def get_async_session_factory(read: bool = False):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    engine = get_async_read_engine() if read else get_async_engine()
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+async def dispose_async_engines() -> None:
+    """Close pooled async connections at shutdown, if the engines were ever used"""
+    if get_async_read_engine.cache_info().currsize:
+        await get_async_read_engine().dispose()
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
@@ -0,0 +1,67 @@
+from sqlalchemy import select, update, bindparam
+from app.db.session import SessionLocal
+from app.db.repayment_keys import parse_repayment_id
+from app.models.payment_details import PaymentDetails
+from app.models.comments import Comments
+from app.models.calling import Calling
+from app.models.co_applicant import CoApplicant
+from app.models.guarantor import Guarantor
+from app.models.reference import Reference
+
+KEYED_MODELS = (Comments, Calling, CoApplicant, Guarantor, Reference)
+
+def backfill_model(db, model, batch_size: int = 5000) -> int:
+    """Fill payment_id from repayment_id for rows written without it; returns rows updated"""
+    set_payment_id = (
+        update(model.__table__)
+        .where(model.__table__.c.id == bindparam("row_id"))
+        .values(payment_id=bindparam("new_payment_id"))
+    )
+    updated = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(model.id, model.repayment_id)
+            .where(model.id > last_id, model.payment_id.is_(None))
+            .order_by(model.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        candidates = {row.id: parse_repayment_id(row.repayment_id) for row in rows}
+        wanted = {value for value in candidates.values() if value is not None}
+        if not wanted:
+            continue
+        existing = set(db.execute(select(PaymentDetails.id).where(PaymentDetails.id.in_(wanted))).scalars())
+
+        updates = [
+            {"row_id": row_id, "new_payment_id": value}
+            for row_id, value in candidates.items()
+            if value in existing
+        ]
+        if updates:
+            db.execute(set_payment_id, updates)
+            db.commit()
+            updated += len(updates)
+    return updated
+
+def main():
+    """Backfill payment_id on rows loaded outside the API since the 0003 migration"""
+    db = SessionLocal()
+    
+    try:
+        for model in KEYED_MODELS:
+            updated = backfill_model(db, model)
+            remaining = db.query(model).filter(model.payment_id.is_(None)).count()
+            print(f"{model.__tablename__}: backfilled {updated}, still without payment_id: {remaining}")
+        
+    except Exception as e:
+        print(f"Error backfilling payment ids: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+SQL that MySQL (production) and SQLite (local runs, benchmarks, load tests)
+spell differently. Crud code goes through these helpers instead of calling
+MySQL-only functions, so the whole API runs against either database.
+"""
+from datetime import datetime
+from functools import reduce
+from typing import Any, Optional
+from sqlalchemy import JSON, func, literal, text, type_coerce
+from sqlalchemy.orm import Session
+
+MYSQL = "mysql"
+SQLITE = "sqlite"
+
+# SQLite keeps timestamps as text. Values written by SQLAlchemy carry
+# microseconds, values from CURRENT_TIMESTAMP (server defaults, func.now())
+# do not, and text comparison treats "10:00:00" as less than "10:00:00.000000"
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%f"
+
+def dialect_name(bind) -> str:
+    """"mysql", "sqlite", ... for a Session, Connection or Engine"""
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    return bind.dialect.name
+
+def _unsupported(feature: str, dialect: str) -> RuntimeError:
+    return RuntimeError(f"{feature} is not supported on {dialect}")
+
+def month_key(dialect: str, column):
+    """'2025-07' for a date column, computed in SQL"""
+    if dialect == MYSQL:
+        return func.date_format(column, "%Y-%m")
+    if dialect == SQLITE:
+        return func.strftime("%Y-%m", column)
+    raise _unsupported("month_key", dialect)
+
+def concat(*parts):
+    """
+    String concatenation: concat() on MySQL, || on SQLite (which has no
+    concat() before 3.44); NULL in any part gives NULL on both
+    """
+    parts = [part if hasattr(part, "concat") else literal(part) for part in parts]
+    return reduce(lambda left, right: left.concat(right), parts)
+
+def json_text(column, key: str):
+    """Top-level key of a JSON column as text: JSON_UNQUOTE(JSON_EXTRACT(...)) on MySQL, json_extract on SQLite"""
+    return type_coerce(column, JSON)[key].as_string()
+
+def sortable_timestamp(dialect: str, column):
+    """
+    A timestamp column in a form that orders and compares correctly: the
+    column itself, except on SQLite, where stored text is normalized to
+    millisecond precision (see SQLITE_TIMESTAMP_FORMAT)
+    """
+    if dialect == SQLITE:
+        return func.strftime(SQLITE_TIMESTAMP_FORMAT, column)
+    return column
+
+def sortable_timestamp_value(dialect: str, value: datetime) -> Any:
+    """value in the form sortable_timestamp compares against"""
+    if dialect == SQLITE:
+        return f"{value:%Y-%m-%d %H:%M:%S}.{value.microsecond // 1000:03d}"
+    return value
+
+def set_session_user(db: Session, user_id: Optional[int]) -> None:
+    """
+    Record who makes this session's changes, for the audit trail: MySQL's
+    payment_details triggers read the @app_user session variable; the ORM
+    audit fallback (app.services.payment_audit) reads db.info["app_user"]
+    """
+    db.info["app_user"] = user_id
+    if user_id is not None and dialect_name(db) == MYSQL:
+        db.execute(text("SET @app_user = :user_id"), {"user_id": int(user_id)})
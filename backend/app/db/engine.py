@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+class PoolMetrics:
+    """
+    Checkout wait and in-use counters for one engine's pool.
+
+    Wait time covers pool.connect() end to end: queueing for a free
+    connection, opening a new one and the pre-ping. The last sample_size
+    waits are kept for percentiles.
+    """
+
+    def __init__(self, sample_size: int = 1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self.pool = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self._waits.append(wait_seconds)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._waits.clear()
+            self.checkouts = 0
+            self.timeouts = 0
+            self.max_in_use = self.in_use
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_ms_p95": round(waits[min(len(waits) - 1, int(0.95 * len(waits)))] * 1000, 3) if waits else 0.0,
+            }
+        if isinstance(self.pool, QueuePool):
+            stats.update({
+                "pool_size": self.pool.size(),
+                "checked_in": self.pool.checkedin(),
+                "overflow": self.pool.overflow(),
+                "max_overflow": self.pool._max_overflow,
+                "pool_timeout": self.pool._timeout,
+            })
+        return stats
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait, in-use counts and timeouts to PoolMetrics"""
+
+    def __init__(self, *args, metrics: Optional[PoolMetrics] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+        self.metrics.pool = self
+        if "_dispatch" not in kwargs:  # recreate() copies listeners over
+            event.listen(self, "checkin", lambda *args: self.metrics.record_checkin())
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.pool = pool
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool on the asyncio-safe queue, for async engines"""
+
+# Sync driver -> asyncio driver for the async engine
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# ...and back, for sync work against an async engine's database
+SYNC_DRIVERS = {
+    "mysql": "mysql+pymysql",
+    "sqlite": "sqlite",
+}
+
+def _engine_options(url, async_engine: bool) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_ISOLATION_LEVEL:
+        options["isolation_level"] = settings.DB_ISOLATION_LEVEL
+
+    in_memory_sqlite = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+    if url.get_backend_name() == "sqlite" and not async_engine:
+        options["connect_args"] = {"check_same_thread": False}
+    if not in_memory_sqlite:
+        options.update({
+            "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        })
+    return options
+
+def create_db_engine(database_url: Optional[str] = None, **overrides) -> Engine:
+    """
+    The application's engine, configured from settings.DB_POOL_* and
+    DB_ISOLATION_LEVEL; keyword overrides win over settings (used by the
+    benchmarks to try other pool sizes). In-memory SQLite keeps SQLAlchemy's
+    default single-connection pool.
+    """
+    url = make_url(database_url or settings.DATABASE_URL)
+    options = _engine_options(url, async_engine=False)
+    options.update(overrides)
+    return create_engine(url, **options)
+
+def async_database_url(database_url: Optional[str] = None) -> str:
+    """database_url with its driver swapped for the asyncio one (pymysql -> aiomysql, pysqlite -> aiosqlite)"""
+    url = make_url(database_url or settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def sync_database_url(database_url) -> str:
+    """database_url with an asyncio driver swapped back for the sync one; sync URLs are returned as they are"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.drivername == ASYNC_DRIVERS.get(backend):
+        url = url.set(drivername=SYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+def create_async_db_engine(database_url: Optional[str] = None, **overrides):
+    """
+    Async counterpart of create_db_engine for the async read routes: same
+    pool settings, asyncio driver for the same database.
+    """
+    # Imported here so sync-only scripts don't need greenlet
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(async_database_url(database_url))
+    options = _engine_options(url, async_engine=True)
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+def connections_per_process(database_url: Optional[str] = None) -> int:
+    """
+    Most connections one process can hold to the server: pool_size +
+    max_overflow for each of its sync and async engines. 0 for SQLite, which
+    has no server-side limit.
+    """
+    url = make_url(database_url or settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        return 0
+    return 2 * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+def pool_metrics(engine) -> Dict[str, Any]:
+    """Pool counters for a sync or async engine, or just its status line when the pool is not instrumented"""
+    engine = getattr(engine, "sync_engine", engine)
+    metrics = getattr(engine.pool, "metrics", None)
+    if metrics is None:
+        return {"status": engine.pool.status()}
+    return metrics.snapshot()
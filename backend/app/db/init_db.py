@@ -1,14 +1,12 @@
-from app.core.config import settings
-from sqlalchemy import create_engine
 from app.models import Base
-from app.db.session import SessionLocal
-
-# Create database engine
-engine = create_engine(settings.DATABASE_URL)
+from app.db.session import engine
+from app.services.comment_search import ensure_search_index
 
 # Create all tables
 def init_db():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ensure_search_index(connection)
     print("✅ Database tables created successfully!")
 
 if __name__ == "__main__":
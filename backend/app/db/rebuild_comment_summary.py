@@ -0,0 +1,21 @@
+from app.db.session import SessionLocal
+from app.crud.comments import refresh_comment_summaries
+from app.models.comment_summary import CommentSummary
+
+def main():
+    """Rebuild the comment_summary table from the comments table"""
+    db = SessionLocal()
+    
+    try:
+        refresh_comment_summaries(db)
+        db.commit()
+        print(f"Successfully rebuilt {db.query(CommentSummary).count()} comment summaries")
+        
+    except Exception as e:
+        print(f"Error rebuilding comment summaries: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from app.db.session import SessionLocal
+from app.services.phone_index import rebuild_phone_index
+
+def main():
+    """Rebuild the contact_phone_index table from all four contact tables"""
+    db = SessionLocal()
+    
+    try:
+        counts = rebuild_phone_index(db)
+        for table, count in counts.items():
+            print(f"Indexed {count} numbers from {table}")
+        print(f"Successfully rebuilt phone index with {sum(counts.values())} entries")
+        
+    except Exception as e:
+        print(f"Error rebuilding phone index: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Optional
+from sqlalchemy import Integer, and_, cast, false, func, or_
+from app.core.config import settings
+
+# Read modes for the repayment_id (text) -> payment_id (integer) cutover
+LEGACY_MODE = "legacy"
+DUAL_MODE = "dual"
+TYPED_MODE = "typed"
+READ_MODES = (LEGACY_MODE, DUAL_MODE, TYPED_MODE)
+
+def get_read_mode() -> str:
+    mode = settings.REPAYMENT_KEY_READ_MODE
+    if mode not in READ_MODES:
+        raise ValueError(f"REPAYMENT_KEY_READ_MODE must be one of {', '.join(READ_MODES)}, got {mode!r}")
+    return mode
+
+def parse_repayment_id(repayment_id: Any) -> Optional[int]:
+    """Convert a repayment id (payment_details.id) to int, or None when it is not numeric"""
+    if repayment_id is None:
+        return None
+    try:
+        return int(str(repayment_id).strip())
+    except ValueError:
+        return None
+
+def repayment_key_values(repayment_id: Any) -> Dict[str, Any]:
+    """Column values for a new row: both keys are written until the legacy column is dropped"""
+    return {
+        "repayment_id": str(repayment_id),
+        "payment_id": parse_repayment_id(repayment_id),
+    }
+
+def repayment_key(model):
+    """Integer repayment key expression for grouping and joining"""
+    mode = get_read_mode()
+    if mode == TYPED_MODE:
+        return model.payment_id
+    legacy = cast(model.repayment_id, Integer)
+    if mode == LEGACY_MODE:
+        return legacy
+    return func.coalesce(model.payment_id, legacy)
+
+def repayment_id_matches(model, repayment_id: Any):
+    """Filter clause matching rows of model that belong to the given repayment"""
+    payment_id = parse_repayment_id(repayment_id)
+    if payment_id is None:
+        return false()
+
+    mode = get_read_mode()
+    if mode == TYPED_MODE:
+        return model.payment_id == payment_id
+    if mode == LEGACY_MODE:
+        return model.repayment_id == str(payment_id)
+    return or_(
+        model.payment_id == payment_id,
+        and_(model.payment_id.is_(None), model.repayment_id == str(payment_id))
+    )
@@ -0,0 +1,174 @@
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal, ReadSessionLocal, engine, read_engine
+
+logger = logging.getLogger(__name__)
+
+# Session.info key set once a primary session has committed
+WROTE_KEY = "wrote"
+
+class ReplicaRouter:
+    """
+    Picks the session factory for read-only requests.
+
+    Reads go to the replica unless there is none, the user committed a write
+    within sticky_seconds (read-your-writes), or the replica is more than
+    max_lag_seconds behind, unreachable, or its replication status cannot be
+    read. Lag is probed at most once per lag_check_seconds. Stickiness is per process: with several workers a
+    user's next read may land on a worker that did not see the write, which
+    the lag check keeps to a few seconds of staleness.
+    """
+
+    def __init__(
+        self,
+        primary_factory: Callable[[], Session],
+        replica_factory: Callable[[], Session],
+        replica_engine: Optional[Engine],
+        sticky_seconds: float,
+        max_lag_seconds: float,
+        lag_check_seconds: float,
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.replica_engine = replica_engine
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self._lock = threading.Lock()
+        self._sticky_until: Dict[int, float] = {}
+        self._lag: Optional[float] = None
+        self._lag_status = "not_checked"
+        self._lag_checked_at: Optional[float] = None
+        self._counts = {"replica": 0, "primary_no_replica": 0, "primary_sticky": 0, "primary_lag": 0}
+
+    @property
+    def has_replica(self) -> bool:
+        return self.replica_engine is not None
+
+    def mark_write(self, user_id: int) -> None:
+        """Route user_id's reads to the primary for the next sticky_seconds"""
+        if not self.has_replica:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._sticky_until[user_id] = now + self.sticky_seconds
+            if len(self._sticky_until) > 10000:
+                self._sticky_until = {k: v for k, v in self._sticky_until.items() if v > now}
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._sticky_until.get(user_id)
+            if until is None:
+                return False
+            if time.monotonic() >= until:
+                del self._sticky_until[user_id]
+                return False
+            return True
+
+    def _probe_lag(self) -> Tuple[Optional[float], str]:
+        """
+        (seconds the replica is behind, status). Lag is None when unknown:
+        replication stopped, or its status could not be read
+        """
+        with self.replica_engine.connect() as connection:
+            if connection.dialect.name != "mysql":
+                return 0.0, "not_mysql"
+            for statement, column in (
+                ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),  # MySQL < 8.0.22
+            ):
+                try:
+                    row = connection.execute(text(statement)).mappings().first()
+                except Exception:
+                    continue
+                if row is None:
+                    return 0.0, "not_a_replica"  # e.g. a second schema in development
+                lag = row.get(column)
+                return (float(lag), "ok") if lag is not None else (None, "replication_stopped")
+            # Usually a missing REPLICATION CLIENT privilege; the lag cannot be
+            # trusted, so reads stay on the primary
+            return None, "status_unreadable"
+
+    def replica_lag(self) -> Optional[float]:
+        """Cached replica lag in seconds"""
+        now = time.monotonic()
+        with self._lock:
+            if self._lag_checked_at is not None and now - self._lag_checked_at < self.lag_check_seconds:
+                return self._lag
+            self._lag_checked_at = now  # Other requests keep the old value while this one probes
+
+        try:
+            lag, status = self._probe_lag()
+        except Exception as e:
+            logger.warning("Read replica unreachable, reading from primary: %s", e)
+            lag, status = None, "unreachable"
+        with self._lock:
+            changed = status != self._lag_status
+            self._lag, self._lag_status = lag, status
+        if changed and status == "status_unreadable":
+            logger.warning(
+                "Cannot read the replica's replication status (SHOW REPLICA STATUS needs "
+                "REPLICATION CLIENT); reading from primary"
+            )
+        return lag
+
+    def _replica_usable(self) -> bool:
+        lag = self.replica_lag()
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def lag_check_due(self) -> bool:
+        """True when the next route() call would probe the replica (async callers do that in a thread)"""
+        if not self.has_replica:
+            return False
+        checked_at = self._lag_checked_at
+        return checked_at is None or time.monotonic() - checked_at >= self.lag_check_seconds
+
+    def route(self, user_id: Optional[int]) -> str:
+        """Where user_id's next read goes: "replica" or "primary_<reason>" """
+        if not self.has_replica:
+            route = "primary_no_replica"
+        elif self.is_sticky(user_id):
+            route = "primary_sticky"
+        elif not self._replica_usable():
+            route = "primary_lag"
+        else:
+            route = "replica"
+        with self._lock:
+            self._counts[route] += 1
+        return route
+
+    def session_for(self, user_id: Optional[int]) -> Session:
+        """A read session for user_id on the replica or, when it cannot be trusted, the primary"""
+        return self.replica_factory() if self.route(user_id) == "replica" else self.primary_factory()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "replica_configured": self.has_replica,
+                "replica_lag_seconds": self._lag,
+                "replica_lag_status": self._lag_status,
+                "max_lag_seconds": self.max_lag_seconds,
+                "sticky_users": len(self._sticky_until),
+                "reads": dict(self._counts),
+            }
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_write(session: Session) -> None:
+    session.info[WROTE_KEY] = True
+
+replica_router = ReplicaRouter(
+    primary_factory=SessionLocal,
+    replica_factory=ReadSessionLocal,
+    replica_engine=read_engine if read_engine is not engine else None,
+    sticky_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    lag_check_seconds=settings.REPLICA_LAG_CHECK_SECONDS,
+)
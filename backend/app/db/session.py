@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
 from app.core.config import settings
+from app.db.engine import create_db_engine
 from sqlalchemy.orm import sessionmaker
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+engine = create_db_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read-only GET routes use the replica when DATABASE_READ_URL is set
+# (see app.db.replica); without one, reads share the primary engine
+read_engine = create_db_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
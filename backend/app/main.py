@@ -1,6 +1,22 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import logging
+from anyio import to_thread
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.engine import make_url
 from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.db.async_session import dispose_async_engines
+from app.services.phone_index import register_phone_index_listeners
+from app.services.payment_audit import register_payment_audit_listeners
+from app.services.comment_search import ensure_search_index
+from app.services.password_hashing import password_hasher
+from app.services.login_activity import login_activity
+from app.services.query_metrics import QueryMetricsMiddleware, register_query_listeners, add_statement_hook, render_metrics
+from app.services.slow_query_log import slow_query_log
+from app.services.compression import CompressionMiddleware
+from app.services.warmup import warm_up
 from app.api.v1.routes import (
     application_row,
     filter_main,
@@ -12,10 +28,58 @@ from app.api.v1.routes import (
     paidpending_applications,
     contacts,
     month_dropdown,
-    recent_activity
+    recent_activity,
+    system
 )
 
-app = FastAPI(title="Prosparity Collection Dashboard API", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+def register_listeners() -> None:
+    """
+    Install the ORM and engine listeners the app relies on. Run by the
+    lifespan, not at import, so importing app.main changes nothing for
+    scripts; callers that drive the app without its lifespan (the
+    benchmarks' bind_app) call it themselves. Safe to call more than once.
+    """
+    # Keep contact_phone_index in sync with contact writes made through the ORM
+    register_phone_index_listeners()
+    
+    # Audit payment_details updates from the ORM where no database trigger does
+    register_payment_audit_listeners()
+    
+    # Time every SQL statement and attribute it to the request that issued it
+    if settings.QUERY_METRICS_ENABLED:
+        register_query_listeners()
+    if settings.SLOW_QUERY_MS > 0:
+        add_statement_hook(slow_query_log.observe)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Database: %s", make_url(settings.DATABASE_URL).render_as_string(hide_password=True))
+    register_listeners()
+    
+    # Threads for sync routes; each worker sets its own limiter
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    
+    # Open pooled connections and load reference data and filter options
+    # before serving; without warmup they are loaded on first use
+    if settings.STARTUP_WARMUP:
+        await warm_up()
+    
+    # SQLite keeps comment search in an FTS5 table created on first start
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            ensure_search_index(connection)
+    
+    # Last-login/logout times are buffered and written in batches
+    login_activity.start(SessionLocal)
+    yield
+    await login_activity.stop(SessionLocal)
+    password_hasher.shutdown()
+    slow_query_log.shutdown()
+    await dispose_async_engines()
+
+app = FastAPI(title="Prosparity Collection Dashboard API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -24,8 +88,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Brotli/gzip for large responses (the application list runs to megabytes of JSON)
+if settings.COMPRESSION_MIN_SIZE > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
+
+# Per-request query count / DB time: Server-Timing header and /metrics
+if settings.QUERY_METRICS_ENABLED:
+    app.add_middleware(QueryMetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
 # Include routers
 app.include_router(user.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(application_row.router, prefix="/api/v1/applications", tags=["Applications"])
@@ -38,6 +116,7 @@ app.include_router(paidpending_applications.router, prefix="/api/v1/paidpending-
 app.include_router(contacts.router, prefix="/api/v1/contacts", tags=["Contacts"])
 app.include_router(month_dropdown.router, prefix="/api/v1/month-dropdown", tags=["Month Dropdown"])
 app.include_router(recent_activity.router, prefix="/api/v1/recent-activity", tags=["Recent Activity"])
+app.include_router(system.router, prefix="/api/v1/system", tags=["System"])
 
 @app.get("/")
 def read_root():
@@ -45,4 +124,9 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint: request latency and per-request query histograms by route"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST) 
\ No newline at end of file
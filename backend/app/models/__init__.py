@@ -17,6 +17,8 @@ from .reference import Reference
 from .audit_applicant_details import AuditApplicantDetails
 from .audit_payment_details import AuditPaymentDetails
 from .vehicle_status import VehicleStatus
+from .contact_phone_index import ContactPhoneIndex
+from .comment_summary import CommentSummary
 
 # Import Base for database operations
 from app.db.base import Base 
\ No newline at end of file
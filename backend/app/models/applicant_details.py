@@ -17,8 +17,8 @@ class ApplicantDetails(Base):
     state = Column(Text)
     pincode = Column(Integer)
     ownership_type_id = Column(Integer, ForeignKey("ownership_type.id"))
-    branch_id = Column(Integer, ForeignKey("branch.id"))
-    dealer_id = Column(Integer, ForeignKey("dealer.id"))
+    branch_id = Column(Integer, ForeignKey("branch.id"), index=True)
+    dealer_id = Column(Integer, ForeignKey("dealer.id"), index=True)
     fi_loaction = Column(Text)  # Fixed to match database column name
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, TIMESTAMP, JSON, func
+from sqlalchemy import Column, Integer, String, Enum, TIMESTAMP, JSON, Index, func
 from app.db.base import Base
 import enum
 
@@ -16,4 +16,11 @@ class AuditPaymentDetails(Base):
     old_data = Column(JSON)
     new_data = Column(JSON)
     changed_by = Column(String(45))
-    action_timestamp = Column(TIMESTAMP, server_default=func.now()) 
\ No newline at end of file
+    action_timestamp = Column(TIMESTAMP, server_default=func.now()) 
+
+    __table_args__ = (
+        # Recent activity: newest changes overall, per loan and per repayment
+        Index("ix_payment_details_audit_timestamp", "action_timestamp"),
+        Index("ix_payment_details_audit_loan_timestamp", "loan_application_id", "action_timestamp"),
+        Index("ix_payment_details_audit_payment_timestamp", "payment_id", "action_timestamp"),
+    )
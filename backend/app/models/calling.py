@@ -1,11 +1,12 @@
-from sqlalchemy import Column, Integer, Text, TIMESTAMP, ForeignKey, func
+from sqlalchemy import Column, Integer, Text, TIMESTAMP, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Calling(Base):
     __tablename__ = "calling"
     id = Column(Integer, primary_key=True, index=True)
-    repayment_id = Column(Text)
+    repayment_id = Column(Text)  # Legacy text key, superseded by payment_id
+    payment_id = Column(Integer, ForeignKey("payment_details.id"))  # Links to payment_details.id
     caller_user_id = Column(Integer, ForeignKey("users.id"))
     Calling_id = Column(Integer)
     status_id = Column(Integer)
@@ -16,4 +17,11 @@ class Calling(Base):
 
     # Relationships
     caller = relationship("User", back_populates="calls")
-    # Note: status_id links to calling_status table, but we don't need a direct relationship here 
\ No newline at end of file
+    # Note: status_id links to calling_status table, but we don't need a direct relationship here
+
+    __table_args__ = (
+        # Latest call per repayment, calling kind and contact type
+        Index("ix_calling_payment_kind_contact_created", "payment_id", "Calling_id", "contact_type", "created_at"),
+        # Legacy text key, still read for rows not yet backfilled (prefix index on MySQL TEXT)
+        Index("ix_calling_repayment_id", "repayment_id", mysql_length=32),
+    ) 
\ No newline at end of file
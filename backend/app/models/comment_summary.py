@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, func
+from app.db.base import Base
+
+class CommentSummary(Base):
+    """Per-(repayment_id, comment_type) comment aggregate maintained by create_comment"""
+    __tablename__ = "comment_summary"
+    repayment_id = Column(Integer, primary_key=True)  # payment_details.id the comments belong to
+    comment_type = Column(Integer, primary_key=True)  # 1 for application details, 2 for paid pending
+    comment_count = Column(Integer, nullable=False, default=0)
+    latest_comment_id = Column(Integer)
+    latest_comment = Column(Text)
+    latest_user_id = Column(Integer)
+    latest_user_name = Column(String(100))
+    latest_commented_at = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
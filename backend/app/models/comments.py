@@ -1,11 +1,12 @@
-from sqlalchemy import Column, Integer, Text, TIMESTAMP, ForeignKey, func
+from sqlalchemy import Column, Integer, Text, TIMESTAMP, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Comments(Base):
     __tablename__ = "comments"
     id = Column(Integer, primary_key=True, index=True)
-    repayment_id = Column(Text)
+    repayment_id = Column(Text)  # Legacy text key, superseded by payment_id
+    payment_id = Column(Integer, ForeignKey("payment_details.id"))  # Links to payment_details.id
     user_id = Column(Integer, ForeignKey("users.id"))
     comment = Column(Text)
     comment_type = Column(Integer, default=1)  # 1 for application details, 2 for paid pending
@@ -14,4 +15,13 @@ class Comments(Base):
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="comments") 
\ No newline at end of file
+    user = relationship("User", back_populates="comments")
+
+    __table_args__ = (
+        # Per-repayment history and counts by comment type, newest first
+        Index("ix_comments_payment_type_commented_at", "payment_id", "comment_type", "commented_at"),
+        # Legacy text key, still read for rows not yet backfilled (prefix index on MySQL TEXT)
+        Index("ix_comments_repayment_id", "repayment_id", mysql_length=32),
+        # Comment search (app.services.comment_search); SQLite uses an FTS5 table instead
+        Index("ft_comments_comment", "comment", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    ) 
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Index, UniqueConstraint, func
+from app.db.base import Base
+
+class ContactPhoneIndex(Base):
+    """Normalized mobile numbers from applicant, co_applicant, guarantor and reference"""
+    __tablename__ = "contact_phone_index"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    phone = Column(String(20), nullable=False)  # Canonical digits with country code, e.g. 919876543210
+    contact_type = Column(Integer, nullable=False)  # 1=applicant, 2=co_applicant, 3=guarantor, 4=reference
+    source_id = Column(Integer, nullable=False)  # id in the source contact table
+    applicant_id = Column(String(100))  # Set for applicants; loans are resolved via loan_details.applicant_id
+    loan_application_id = Column(Integer)  # Set for co_applicant, guarantor and reference
+    contact_name = Column(String(255))
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("contact_type", "source_id", name="uq_contact_phone_index_source"),
+        Index("ix_contact_phone_index_phone", "phone"),
+    )
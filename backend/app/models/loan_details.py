@@ -5,16 +5,16 @@ from app.db.base import Base
 class LoanDetails(Base):
     __tablename__ = "loan_details"
     loan_application_id = Column(Integer, primary_key=True, autoincrement=True)
-    applicant_id = Column(String(55), ForeignKey("applicant_details.applicant_id"))
+    applicant_id = Column(String(55), ForeignKey("applicant_details.applicant_id"), index=True)
     approved_amount = Column(DECIMAL(12,2))
     disbursal_amount = Column(DECIMAL(12,2))
     approved_rate = Column(DECIMAL(12,2))
     disbursal_date = Column(DATE)
-    Collection_relationship_manager_id = Column(Integer)
-    source_relationship_manager_id = Column(Integer)
-    source_team_lead_id = Column(Integer)
-    current_team_lead_id = Column(Integer)
-    lenders_id = Column(Integer, ForeignKey("lenders.id"))
+    Collection_relationship_manager_id = Column(Integer, index=True)
+    source_relationship_manager_id = Column(Integer, index=True)
+    source_team_lead_id = Column(Integer, index=True)
+    current_team_lead_id = Column(Integer, index=True)
+    lenders_id = Column(Integer, ForeignKey("lenders.id"), index=True)
     tenure = Column(Integer)
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DECIMAL, DATE, String, TIMESTAMP, ForeignKey, func
+from sqlalchemy import Column, Integer, DECIMAL, DATE, String, TIMESTAMP, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -26,4 +26,17 @@ class PaymentDetails(Base):
 
     # Relationships - now properly defined with foreign keys
     loan_details = relationship("LoanDetails", back_populates="payment_details")
-    repayment_status = relationship("RepaymentStatus", back_populates="payment_details") 
\ No newline at end of file
+    repayment_status = relationship("RepaymentStatus", back_populates="payment_details")
+
+    __table_args__ = (
+        # Paid(Pending Approval) queue: filter by status, page by demand_date
+        Index("ix_payment_details_status_demand_date", "repayment_status_id", "demand_date"),
+        # Month dropdown: covering index for (id, demand_date) per loan
+        Index("ix_payment_details_loan_demand_date_id", "loan_application_id", "demand_date", "id"),
+        # Application list month filter (demand_date range) and month options
+        Index("ix_payment_details_demand_date", "demand_date"),
+        # PTP date filters (overdue / today / tomorrow / future / none)
+        Index("ix_payment_details_ptp_date", "ptp_date"),
+        # Summary and comment search month filters, counted per status
+        Index("ix_payment_details_year_month_status", "demand_year", "demand_month", "repayment_status_id"),
+    ) 
\ No newline at end of file
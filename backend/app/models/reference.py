@@ -5,8 +5,9 @@ from app.db.base import Base
 class Reference(Base):
     __tablename__ = "reference"
     id = Column(Integer, primary_key=True, index=True)
-    loan_application_id = Column(Integer, ForeignKey("loan_details.loan_application_id"))
-    repayment_id = Column(String(55))  # Links to payment_details.id
+    loan_application_id = Column(Integer, ForeignKey("loan_details.loan_application_id"), index=True)
+    repayment_id = Column(String(55))  # Legacy text key, superseded by payment_id
+    payment_id = Column(Integer, ForeignKey("payment_details.id"), index=True)  # Links to payment_details.id
     first_name = Column(String(55))
     middle_name = Column(String(55))
     last_name = Column(String(55))
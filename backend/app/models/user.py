@@ -15,6 +15,7 @@ class User(Base):
     # 🎯 NEW COLUMNS FOR LOGIN/LOGOUT TRACKING
     last_login_time = Column(DateTime, nullable=True)
     last_logout_time = Column(DateTime, nullable=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped to revoke issued tokens
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List, Dict
+from app.schemas.comments import CommentSummaryItem
 
 class ApplicationItem(BaseModel):
     application_id: str
@@ -29,7 +30,7 @@ class ApplicationItem(BaseModel):
     loan_amount: Optional[float] = None  # 🎯 ADDED! Loan Amount
     disbursement_date: Optional[str] = None  # 🎯 ADDED! Disbursement Date  
     house_ownership: Optional[str] = None  # 🎯 ADDED! House Ownership
-    comments: List[str] = []
+    comment_summary: Optional[CommentSummaryItem] = None  # Count and latest comment; history via /comments/repayment/{payment_id}
 
 class ApplicationFilters(BaseModel):
     emi_month: Optional[str] = ""
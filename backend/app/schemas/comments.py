@@ -24,4 +24,35 @@ class CommentResponse(BaseModel):
 
 class CommentListResponse(BaseModel):
     total: int
-    results: List[CommentResponse]
\ No newline at end of file
+    results: List[CommentResponse]
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next (older) page
+
+class CommentSummaryItem(BaseModel):
+    comment_count: int
+    latest_comment: Optional[str] = None
+    latest_user_name: Optional[str] = None
+    latest_commented_at: Optional[datetime] = None
+
+class CommentSearchSnippet(BaseModel):
+    comment_id: int
+    snippet: str
+    comment_type: int
+    user_name: Optional[str] = None
+    commented_at: Optional[datetime] = None
+
+class CommentSearchResult(BaseModel):
+    repayment_id: int
+    loan_id: int
+    applicant_name: str
+    branch: Optional[str] = None
+    rm_name: Optional[str] = None
+    emi_month: Optional[str] = None
+    match_count: int
+    latest_match_at: Optional[datetime] = None
+    snippets: List[CommentSearchSnippet]
+
+class CommentSearchResponse(BaseModel):
+    query: str
+    terms: List[str]  # Terms every matching comment contains
+    total: int  # Matching repayments across all pages
+    results: List[CommentSearchResult]
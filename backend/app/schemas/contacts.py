@@ -0,0 +1,44 @@
+from pydantic import BaseModel, validator
+from typing import List, Optional, Union
+
+class ContactItem(BaseModel):
+    id: Optional[Union[int, str]] = None  # applicant_id for the applicant, row id otherwise
+    name: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    type: str  # applicant, co_applicant, guarantor, reference
+
+class ApplicationContactsResponse(BaseModel):
+    loan_id: int
+    applicant: ContactItem
+    co_applicants: List[ContactItem] = []
+    guarantors: List[ContactItem] = []
+    references: List[ContactItem] = []
+
+class ContactsBatchRequest(BaseModel):
+    loan_ids: List[int]
+
+    @validator('loan_ids')
+    def validate_loan_ids(cls, v):
+        if not v:
+            raise ValueError('loan_ids cannot be empty')
+        if len(v) > 500:  # Limit to 500 loans per batch
+            raise ValueError('Cannot fetch contacts for more than 500 loans at once')
+        return v
+
+class ContactsBatchResponse(BaseModel):
+    total: int
+    results: List[ApplicationContactsResponse]
+    not_found: List[int] = []
+
+class PhoneLookupMatch(BaseModel):
+    loan_id: Optional[int] = None  # None for an applicant with no loan
+    applicant_id: Optional[str] = None
+    contact_type: str  # applicant, co_applicant, guarantor, reference
+    contact_id: int  # id in the contact's own table
+    name: Optional[str] = None
+
+class PhoneLookupResponse(BaseModel):
+    phone: str  # Normalized number that was searched
+    total: int
+    matches: List[PhoneLookupMatch]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from typing import List, Optional
 
 class MonthOption(BaseModel):
@@ -10,6 +10,22 @@ class MonthOption(BaseModel):
 class MonthDropdownResponse(BaseModel):
     loan_id: str
     total_months: int
-    current_month: str  # Current selected month
+    current_month: Optional[str] = None  # Current selected month; None when no payment has a demand date
     months: List[MonthOption]
     message: str
+
+class MonthDropdownBatchRequest(BaseModel):
+    loan_ids: List[int]
+
+    @validator('loan_ids')
+    def validate_loan_ids(cls, v):
+        if not v:
+            raise ValueError('loan_ids cannot be empty')
+        if len(v) > 1000:  # Limit to 1000 loans per batch
+            raise ValueError('Cannot fetch months for more than 1000 loans at once')
+        return v
+
+class MonthDropdownBatchResponse(BaseModel):
+    total: int
+    results: List[MonthDropdownResponse]
+    not_found: List[int] = []
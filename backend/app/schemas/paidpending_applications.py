@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from app.schemas.comments import CommentSummaryItem
 
 class PaidPendingApplication(BaseModel):
     loan_id: str
@@ -13,7 +14,7 @@ class PaidPendingApplication(BaseModel):
     tl_name: str
     dealer: str
     lender: str
-    comments: List[str] = []
+    comment_summary: Optional[CommentSummaryItem] = None  # Count and latest comment; history via /comments/repayment/{repayment_id}
 
 class PaidPendingApplicationsResponse(BaseModel):
     total: int
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, validator
+from typing import Optional, List
 from enum import Enum
 
 class ApprovalActionEnum(str, Enum):
@@ -22,3 +22,36 @@ class PaidPendingApprovalResponse(BaseModel):
     message: str
     updated_at: str
     comments: Optional[str] = None
+
+
+# Bulk Approval Schemas
+class PaidPendingBulkApprovalItem(BaseModel):
+    loan_id: str
+    repayment_id: str
+    action: ApprovalActionEnum  # accept or reject
+    comments: Optional[str] = None  # Stored as a paid pending comment when provided
+
+class PaidPendingBulkApprovalRequest(BaseModel):
+    items: List[PaidPendingBulkApprovalItem]
+
+    @validator('items')
+    def validate_items_list(cls, v):
+        if not v:
+            raise ValueError('Items list cannot be empty')
+        if len(v) > 1000:  # Limit to 1000 approvals per batch
+            raise ValueError('Cannot process more than 1000 approvals at once')
+        return v
+
+class PaidPendingBulkApprovalResult(BaseModel):
+    loan_id: str
+    repayment_id: str
+    action: str
+    success: bool
+    previous_status: Optional[str] = None
+    new_status: Optional[str] = None
+    message: str
+
+class PaidPendingBulkApprovalResponse(BaseModel):
+    success_count: int
+    failed_count: int
+    results: List[PaidPendingBulkApprovalResult]
@@ -76,8 +76,8 @@ class BulkUserCreate(BaseModel):
     def validate_users_list(cls, v):
         if not v:
             raise ValueError('Users list cannot be empty')
-        if len(v) > 100:  # Limit to 100 users per batch
-            raise ValueError('Cannot register more than 100 users at once')
+        if len(v) > 1000:  # Limit to 1000 users per batch
+            raise ValueError('Cannot register more than 1000 users at once')
         return v
 
 class BulkUserResponse(BaseModel):
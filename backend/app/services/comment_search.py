@@ -0,0 +1,95 @@
+import re
+import logging
+from typing import List
+from sqlalchemy import column, select, table, text
+from app.models.comments import Comments
+
+logger = logging.getLogger(__name__)
+
+# MySQL uses the FULLTEXT index declared on comments.comment; SQLite (local
+# runs and tests) uses an external-content FTS5 table kept in sync by triggers.
+FTS_TABLE = "comments_fts"
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+_SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(comment, content='comments', content_rowid='id')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON comments BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, comment) VALUES (new.id, new.comment);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON comments BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, comment) VALUES ('delete', old.id, old.comment);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF comment ON comments BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, comment) VALUES ('delete', old.id, old.comment);
+        INSERT INTO {FTS_TABLE}(rowid, comment) VALUES (new.id, new.comment);
+    END""",
+]
+
+_TERM_PATTERN = re.compile(r'"([^"]*)"|(\w+)', re.UNICODE)
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def ensure_search_index(connection) -> None:
+    """Create the FTS5 table and triggers on SQLite and index existing comments; no-op on MySQL"""
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE}
+    ).first()
+    for statement in _SQLITE_FTS_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        logger.info("Comment search index built")
+
+def parse_search_terms(query: str) -> List[str]:
+    """
+    Split a search string into terms: "quoted phrases" stay together, other
+    words stand alone. Punctuation is dropped so terms are safe to embed in
+    either engine's query syntax.
+    """
+    terms = []
+    for phrase, word in _TERM_PATTERN.findall(query or ""):
+        term = " ".join(_WORD_PATTERN.findall(phrase)) if phrase else word
+        term = term.lower()
+        if term and term not in terms:
+            terms.append(term)
+    return terms
+
+def comment_match_clause(dialect_name: str, terms: List[str]):
+    """WHERE clause selecting comments that contain every term"""
+    if dialect_name == "mysql":
+        # Boolean mode: every term required, phrases matched as phrases
+        return Comments.comment.match(" ".join(f'+"{term}"' if " " in term else f"+{term}" for term in terms))
+
+    if dialect_name == "sqlite":
+        fts_query = " AND ".join(f'"{term}"' for term in terms)
+        return Comments.id.in_(
+            select(_fts.c.rowid).where(text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=fts_query))
+        )
+
+    raise RuntimeError(f"Comment search is not supported on {dialect_name}")
+
+def make_snippet(comment: str, terms: List[str], width: int = 120) -> str:
+    """Cut a window of about width characters around the first matching term"""
+    comment = " ".join((comment or "").split())
+    if len(comment) <= width:
+        return comment
+
+    lowered = comment.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [position for position in positions if position >= 0]
+    first = min(positions) if positions else 0
+
+    start = max(0, first - width // 3)
+    end = min(len(comment), start + width)
+    start = max(0, end - width)
+
+    snippet = comment[start:end].strip()
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(comment):
+        snippet = snippet + "…"
+    return snippet
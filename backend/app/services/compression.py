@@ -0,0 +1,106 @@
+import zlib
+import brotli
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+# Bodies this large are compressed on a worker thread, off the event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+def choose_encoding(accept_encoding: str) -> str:
+    """"br" or "gzip" when the client accepts it (Brotli preferred), else "" """
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(coding.strip().lower())
+    for coding in ("br", "gzip"):
+        if coding in accepted:
+            return coding
+    return ""
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        if self._brotli is not None:
+            data = self._brotli.process(body)
+            return data + (self._brotli.flush() if more_body else self._brotli.finish())
+        data = self._zlib.compress(body)
+        return data + self._zlib.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+class CompressionMiddleware:
+    """
+    Compresses responses of at least minimum_size bytes with Brotli when the
+    client accepts br, otherwise gzip. Smaller responses, partial content and
+    responses that already carry a Content-Encoding are sent as they are.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def compress(body: bytes, more_body: bool) -> bytes:
+            if len(body) >= THREAD_MINIMUM_SIZE:
+                return await to_thread.run_sync(compressor.compress, body, more_body)
+            return compressor.compress(body, more_body)
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or message["status"] == 206
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether to compress
+                    start_message = message
+                return
+            if message_type != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if len(body) < self.minimum_size and not more_body:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                body = await compress(body, more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                start_message = None
+            else:
+                body = await compress(body, more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
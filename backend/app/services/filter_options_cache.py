@@ -0,0 +1,46 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.crud.filter_main import filter_options
+
+class FilterOptionsCache:
+    """
+    Process-wide copy of the filter dropdown options.
+
+    They only change when loans, users or lookup rows are added, so each
+    worker rebuilds them from the caller's session at most every ttl_seconds
+    (0 = every call) or after invalidate().
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._options: Optional[Dict[str, Any]] = None
+        self._loaded_at: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at >= self.ttl_seconds
+
+    def load(self, db: Session) -> Dict[str, Any]:
+        """Rebuild the options from the database"""
+        options = filter_options(db)
+        with self._lock:
+            self._options = options
+            self._loaded_at = time.monotonic()
+        return options
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        """Cached options, rebuilt when stale"""
+        options = self._options
+        if options is None or self.is_stale():
+            return self.load(db)
+        return options
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+filter_options_cache = FilterOptionsCache(ttl_seconds=settings.FILTER_OPTIONS_CACHE_SECONDS)
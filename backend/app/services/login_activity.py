@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.crud.user import apply_login_activity
+
+logger = logging.getLogger(__name__)
+
+class LoginActivityBuffer:
+    """
+    Collects last-login/last-logout timestamps in memory and writes them in
+    one UPDATE per flush instead of a transaction per login.
+
+    Only the newest timestamp per user is kept. A flush that fails puts its
+    entries back (unless a newer one arrived meanwhile) so the next flush
+    retries them; shutdown flushes whatever is left.
+    """
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._logins: Dict[int, datetime] = {}
+        self._logouts: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record_login(self, user_id: int, at: Optional[datetime] = None) -> None:
+        with self._lock:
+            self._logins[user_id] = at or datetime.utcnow()
+
+    def record_logout(self, user_id: int, at: Optional[datetime] = None) -> None:
+        with self._lock:
+            self._logouts[user_id] = at or datetime.utcnow()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._logins) + len(self._logouts)
+
+    def _requeue(self, logins: Dict[int, datetime], logouts: Dict[int, datetime]) -> None:
+        with self._lock:
+            for pending, failed in ((self._logins, logins), (self._logouts, logouts)):
+                for user_id, at in failed.items():
+                    if user_id not in pending or pending[user_id] < at:
+                        pending[user_id] = at
+
+    def flush(self, session_factory: Callable[[], Session]) -> int:
+        """Write buffered timestamps; returns the number of users updated"""
+        with self._flush_lock:
+            with self._lock:
+                logins, self._logins = self._logins, {}
+                logouts, self._logouts = self._logouts, {}
+            if not logins and not logouts:
+                return 0
+
+            db = session_factory()
+            try:
+                updated = apply_login_activity(db, logins, logouts)
+            except Exception:
+                db.rollback()
+                self._requeue(logins, logouts)
+                raise
+            finally:
+                db.close()
+            return updated
+
+    async def _run(self, session_factory: Callable[[], Session]) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await run_in_threadpool(self.flush, session_factory)
+            except Exception as e:
+                logger.warning("Login activity flush failed, will retry: %s", e)
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Start the periodic flush on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(session_factory))
+
+    async def stop(self, session_factory: Callable[[], Session]) -> None:
+        """Cancel the periodic flush and write what is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await run_in_threadpool(self.flush, session_factory)
+        except Exception as e:
+            logger.error("Login activity lost at shutdown (%d users): %s", self.pending(), e)
+
+login_activity = LoginActivityBuffer(flush_seconds=settings.LOGIN_ACTIVITY_FLUSH_SECONDS)
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.security import verify_password, get_password_hash
+
+logger = logging.getLogger(__name__)
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503"""
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification off FastAPI's shared threadpool.
+
+    bcrypt releases the GIL while it works, so a small dedicated thread pool
+    gets full use of the cores without tying up the threads that serve every
+    other sync endpoint. At most max_pending operations may be queued or
+    running; beyond that PasswordHashingBusy is raised instead of queueing.
+    workers=0 keeps the old behaviour (hash inline on the shared threadpool).
+
+    Batches (hash_many) run on a separate pool of bulk_workers threads, at
+    most bulk_workers hashes at a time, each holding its own pending slot.
+    """
+
+    def __init__(self, workers: int, max_pending: int, bulk_workers: int = 1):
+        self.workers = workers
+        self.bulk_workers = max(1, bulk_workers)
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._bulk_executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {
+            "completed": 0,
+            "rejected": 0,
+            "in_flight": 0,
+            "queue_seconds_total": 0.0,
+            "queue_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+        return self._executor
+
+    def _get_bulk_executor(self) -> ThreadPoolExecutor:
+        if self._bulk_executor is None:
+            with self._lock:
+                if self._bulk_executor is None:
+                    self._bulk_executor = ThreadPoolExecutor(
+                        max_workers=self.bulk_workers, thread_name_prefix="password-hash-bulk"
+                    )
+        return self._bulk_executor
+
+    def _timed(self, func: Callable, *args) -> Callable[[], Any]:
+        submitted_at = time.perf_counter()
+
+        def run():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                queued = started_at - submitted_at
+                with self._lock:
+                    self._stats["completed"] += 1
+                    self._stats["queue_seconds_total"] += queued
+                    self._stats["queue_seconds_max"] = max(self._stats["queue_seconds_max"], queued)
+                    self._stats["run_seconds_total"] += finished_at - started_at
+        return run
+
+    @contextmanager
+    def _reserve(self, count: int = 1):
+        """Hold count pending slots, all or none"""
+        acquired = 0
+        while acquired < count and self._slots.acquire(blocking=False):
+            acquired += 1
+        if acquired < count:
+            for _ in range(acquired):
+                self._slots.release()
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise PasswordHashingBusy("Too many password operations in progress, retry shortly")
+
+        with self._lock:
+            self._stats["in_flight"] += count
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= count
+            for _ in range(count):
+                self._slots.release()
+
+    async def _run(self, job: Callable[[], Any]) -> Any:
+        if self.workers <= 0:
+            return await run_in_threadpool(job)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), job)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        with self._reserve():
+            return await self._run(self._timed(verify_password, plain_password, hashed_password))
+
+    async def hash(self, password: str) -> str:
+        with self._reserve():
+            return await self._run(self._timed(get_password_hash, password))
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch on the bulk pool, bulk_workers at a time; each hash in flight holds a pending slot"""
+        width = min(self.bulk_workers, len(passwords))
+        hashed: List[str] = []
+        if not width:
+            return hashed
+        loop = asyncio.get_running_loop()
+        with self._reserve(width):
+            executor = self._get_bulk_executor()
+            for start in range(0, len(passwords), width):
+                hashed.extend(await asyncio.gather(*(
+                    loop.run_in_executor(executor, self._timed(get_password_hash, password))
+                    for password in passwords[start:start + width]
+                )))
+        return hashed
+
+    def configure(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                  bulk_workers: Optional[int] = None) -> None:
+        """Resize the pools; waits for running operations to finish"""
+        self.shutdown()
+        if workers is not None:
+            self.workers = workers
+        if bulk_workers is not None:
+            self.bulk_workers = max(1, bulk_workers)
+        if max_pending is not None:
+            self.max_pending = max_pending
+            self._slots = threading.BoundedSemaphore(max_pending)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                if key != "in_flight":
+                    self._stats[key] = 0 if isinstance(self._stats[key], int) else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool counters; queue time is submit-to-start"""
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats["completed"]
+        stats["workers"] = self.workers
+        stats["bulk_workers"] = self.bulk_workers
+        stats["max_pending"] = self.max_pending
+        stats["queue_seconds_avg"] = stats["queue_seconds_total"] / completed if completed else 0.0
+        stats["run_seconds_avg"] = stats["run_seconds_total"] / completed if completed else 0.0
+        return stats
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._bulk_executor is not None:
+            self._bulk_executor.shutdown(wait=True)
+            self._bulk_executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    bulk_workers=settings.PASSWORD_HASH_BULK_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import object_session
+from app.core.config import settings
+from app.db.dialect import MYSQL
+from app.models.audit_payment_details import AuditPaymentDetails
+from app.models.payment_details import PaymentDetails
+
+# payment_details attribute -> key in the audit row's old_data/new_data, as
+# the MySQL triggers write them (recent activity reads these keys)
+AUDITED_FIELDS = {
+    "repayment_status_id": "Repayment_status_id",
+    "ptp_date": "ptp_date",
+    "amount_collected": "amount_collected",
+}
+
+AUDIT_MODES = ("auto", "triggers", "orm")
+
+def orm_audit_enabled(dialect: str) -> bool:
+    """
+    Whether payment_details changes are audited from the ORM on this
+    dialect: PAYMENT_AUDIT=orm always, triggers never, auto everywhere but
+    MySQL (where the database triggers do it)
+    """
+    mode = settings.PAYMENT_AUDIT
+    if mode not in AUDIT_MODES:
+        raise ValueError(f"PAYMENT_AUDIT must be one of {', '.join(AUDIT_MODES)}, got {mode!r}")
+    return mode == "orm" or (mode == "auto" and dialect != MYSQL)
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def audit_row(target, changed_by) -> Optional[Dict[str, Any]]:
+    """Audit row for a flushed payment_details update, or None when no audited field changed"""
+    state = inspect(target)
+    old_data, new_data = {}, {}
+    for attribute, key in AUDITED_FIELDS.items():
+        history = state.attrs[attribute].history
+        if history.has_changes():
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+        else:
+            old = new = history.unchanged[0] if history.unchanged else None
+        old_data[key], new_data[key] = _json_value(old), _json_value(new)
+
+    if old_data == new_data:
+        return None
+    return {
+        "payment_id": target.id,
+        "loan_application_id": target.loan_application_id,
+        "action_type": "UPDATE",
+        "old_data": old_data,
+        "new_data": new_data,
+        "changed_by": str(changed_by) if changed_by is not None else None,
+    }
+
+def status_change_row(payment, new_status_id: int, changed_by) -> Dict[str, Any]:
+    """Audit row for a status change made with a Core UPDATE, which the ORM listener does not see"""
+    unchanged = {"ptp_date": _json_value(payment.ptp_date), "amount_collected": _json_value(payment.amount_collected)}
+    return {
+        "payment_id": payment.id,
+        "loan_application_id": payment.loan_application_id,
+        "action_type": "UPDATE",
+        "old_data": {"Repayment_status_id": payment.repayment_status_id, **unchanged},
+        "new_data": {"Repayment_status_id": new_status_id, **unchanged},
+        "changed_by": str(changed_by) if changed_by is not None else None,
+    }
+
+def _after_update(mapper, connection, target):
+    if not orm_audit_enabled(connection.dialect.name):
+        return
+    session = object_session(target)
+    row = audit_row(target, session.info.get("app_user") if session is not None else None)
+    if row:
+        connection.execute(insert(AuditPaymentDetails), [row])
+
+def register_payment_audit_listeners() -> None:
+    """Audit ORM updates to payment_details where no database trigger does (see orm_audit_enabled)"""
+    if not event.contains(PaymentDetails, "after_update", _after_update):
+        event.listen(PaymentDetails, "after_update", _after_update)
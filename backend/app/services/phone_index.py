@@ -0,0 +1,115 @@
+import logging
+from typing import Dict, Any, Optional
+from sqlalchemy import event, insert, delete, select
+from sqlalchemy.orm import Session
+from app.models.applicant_details import ApplicantDetails
+from app.models.co_applicant import CoApplicant
+from app.models.guarantor import Guarantor
+from app.models.reference import Reference
+from app.models.contact_phone_index import ContactPhoneIndex
+from app.schemas.contact_types import ContactTypeEnum
+from app.utils.helpers import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# Source contact model -> contact type stored in the index
+INDEXED_MODELS = {
+    ApplicantDetails: ContactTypeEnum.applicant.value,
+    CoApplicant: ContactTypeEnum.co_applicant.value,
+    Guarantor: ContactTypeEnum.guarantor.value,
+    Reference: ContactTypeEnum.reference.value,
+}
+
+def _contact_name(contact) -> Optional[str]:
+    name_parts = [part for part in (contact.first_name, contact.middle_name, contact.last_name) if part]
+    return " ".join(name_parts)[:255] if name_parts else None
+
+def build_index_row(contact, contact_type: int) -> Optional[Dict[str, Any]]:
+    """Build the index row for a contact, or None when it has no usable mobile"""
+    phone = normalize_phone(contact.mobile)
+    if not phone:
+        return None
+
+    return {
+        "phone": phone,
+        "contact_type": contact_type,
+        "source_id": contact.id,
+        "applicant_id": contact.applicant_id if contact_type == ContactTypeEnum.applicant.value else None,
+        "loan_application_id": None if contact_type == ContactTypeEnum.applicant.value else contact.loan_application_id,
+        "contact_name": _contact_name(contact),
+    }
+
+def _remove_entry(connection, contact_type: int, source_id: int) -> None:
+    connection.execute(
+        delete(ContactPhoneIndex).where(
+            ContactPhoneIndex.contact_type == contact_type,
+            ContactPhoneIndex.source_id == source_id
+        )
+    )
+
+def _make_listeners(contact_type: int):
+    def after_insert(mapper, connection, target):
+        row = build_index_row(target, contact_type)
+        if row:
+            connection.execute(insert(ContactPhoneIndex), [row])
+
+    def after_update(mapper, connection, target):
+        _remove_entry(connection, contact_type, target.id)
+        after_insert(mapper, connection, target)
+
+    def after_delete(mapper, connection, target):
+        _remove_entry(connection, contact_type, target.id)
+
+    return after_insert, after_update, after_delete
+
+_listeners_registered = False
+
+def register_phone_index_listeners() -> None:
+    """Keep contact_phone_index in sync with ORM writes to the contact tables"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+
+    for model, contact_type in INDEXED_MODELS.items():
+        after_insert, after_update, after_delete = _make_listeners(contact_type)
+        event.listen(model, "after_insert", after_insert)
+        event.listen(model, "after_update", after_update)
+        event.listen(model, "after_delete", after_delete)
+    _listeners_registered = True
+
+def rebuild_phone_index(db: Session, batch_size: int = 5000) -> Dict[str, int]:
+    """Rebuild contact_phone_index from scratch; returns rows indexed per contact table"""
+    db.execute(delete(ContactPhoneIndex))
+
+    counts = {}
+    for model, contact_type in INDEXED_MODELS.items():
+        columns = [model.id, model.first_name, model.middle_name, model.last_name, model.mobile]
+        if model is ApplicantDetails:
+            columns.append(model.applicant_id)
+        else:
+            columns.append(model.loan_application_id)
+
+        indexed = 0
+        last_id = 0
+        while True:
+            # Page by primary key so no cursor stays open while inserting
+            contacts = db.execute(
+                select(*columns)
+                .where(model.id > last_id, model.mobile.isnot(None))
+                .order_by(model.id)
+                .limit(batch_size)
+            ).all()
+            if not contacts:
+                break
+            last_id = contacts[-1].id
+
+            batch = [row for row in (build_index_row(c, contact_type) for c in contacts) if row]
+            if batch:
+                db.execute(insert(ContactPhoneIndex), batch)
+                indexed += len(batch)
+
+        counts[model.__tablename__] = indexed
+
+    db.commit()
+    logger.info("Phone index rebuilt: %s", counts)
+    return counts
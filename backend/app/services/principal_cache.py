@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.core.config import settings
+
+class PrincipalCache:
+    """
+    Process-wide user_id -> current token_version map.
+
+    get_current_user trusts the signed name/role claims and only needs to know
+    whether the token's version is still current; entries expire after
+    ttl_seconds so revocations from other workers apply within that window.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[int]:
+        """Cached token version, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            token_version, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            return token_version
+
+    def set(self, user_id: int, token_version: int) -> None:
+        with self._lock:
+            self._entries[user_id] = (token_version, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_SECONDS,
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE
+)
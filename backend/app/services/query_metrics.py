@@ -0,0 +1,231 @@
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+registry = CollectorRegistry()
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route",
+    ["method", "route", "status"], buckets=SECONDS_BUCKETS, registry=registry
+)
+REQUEST_QUERIES = Histogram(
+    "db_queries_per_request", "SQL statements executed per request",
+    ["method", "route"], buckets=QUERY_BUCKETS, registry=registry
+)
+REQUEST_DB_SECONDS = Histogram(
+    "db_seconds_per_request", "Time spent in SQL statements per request",
+    ["method", "route"], buckets=SECONDS_BUCKETS, registry=registry
+)
+REQUEST_SLOWEST_SECONDS = Histogram(
+    "db_slowest_query_seconds", "Slowest SQL statement of each request",
+    ["method", "route"], buckets=SECONDS_BUCKETS, registry=registry
+)
+REQUEST_ROWS = Histogram(
+    "db_rows_per_request", "Rows reported by the driver per request (MySQL counts SELECT rows, SQLite only DML)",
+    ["method", "route"], buckets=ROW_BUCKETS, registry=registry
+)
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_statement(statement: str, max_length: int = 500) -> str:
+    """One-line statement with expanded IN lists collapsed, so repeats of a query compare equal"""
+    statement = _IN_LIST.sub("(?, ...)", _WHITESPACE.sub(" ", statement).strip())
+    return statement if len(statement) <= max_length else statement[:max_length] + " ..."
+
+class RequestQueries:
+    """SQL statements executed on behalf of one request (shared with the threads serving it)"""
+
+    def __init__(self, scope=None):
+        self._lock = threading.Lock()
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    @property
+    def endpoint(self) -> Optional[str]:
+        """"GET /api/v1/contacts/{loan_id}" once the request has been routed"""
+        if self.scope is None:
+            return None
+        return f"{self.scope['method']} {_route_label(self.scope)}"
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            if rows > 0:
+                self.rows += rows
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_statement = statement
+
+    def server_timing(self, elapsed_seconds: float) -> str:
+        with self._lock:
+            return (
+                f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries, {self.rows} rows", '
+                f"db-slowest;dur={self.slowest_seconds * 1000:.2f}, "
+                f"app;dur={elapsed_seconds * 1000:.2f}"
+            )
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+def current_request_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+class RouteQueryStats:
+    """
+    Per-route totals for the admin endpoint: requests, queries per request
+    (average and max), DB time and the slowest statement seen, normalized.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, queries: RequestQueries) -> None:
+        with self._lock:
+            stats = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "max_queries": 0, "db_seconds": 0.0, "rows": 0,
+                "slowest_ms": 0.0, "slowest_statement": None,
+            })
+            stats["requests"] += 1
+            stats["queries"] += queries.count
+            stats["max_queries"] = max(stats["max_queries"], queries.count)
+            stats["db_seconds"] += queries.seconds
+            stats["rows"] += queries.rows
+            if queries.slowest_statement is not None and queries.slowest_seconds * 1000 >= stats["slowest_ms"]:
+                stats["slowest_ms"] = round(queries.slowest_seconds * 1000, 3)
+                stats["slowest_statement"] = normalize_statement(queries.slowest_statement)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Routes ordered by total DB time, heaviest first"""
+        with self._lock:
+            routes = [dict(stats, route=route) for route, stats in self._routes.items()]
+        for stats in routes:
+            stats["avg_queries"] = round(stats["queries"] / stats["requests"], 2)
+            stats["avg_db_ms"] = round(stats["db_seconds"] / stats["requests"] * 1000, 3)
+            stats["db_seconds"] = round(stats["db_seconds"], 4)
+        return sorted(routes, key=lambda stats: stats["db_seconds"], reverse=True)
+
+route_query_stats = RouteQueryStats()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+# Called as hook(conn, statement, parameters, seconds, executemany) after every statement
+_statement_hooks: List[Callable] = []
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+    queries = _current.get()
+    if queries is not None:
+        queries.record(statement, seconds, cursor.rowcount)
+    for hook in _statement_hooks:
+        hook(conn, statement, parameters, seconds, executemany)
+
+def _handle_error(exception_context):
+    # The statement failed: after_cursor_execute will not run for it
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+def register_query_listeners() -> None:
+    """Time every statement on every engine (sync, async, replica) and attribute it to the current request"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+def add_statement_hook(hook: Callable) -> None:
+    """Also pass every timed statement to hook (e.g. the slow-query log)"""
+    register_query_listeners()
+    if hook not in _statement_hooks:
+        _statement_hooks.append(hook)
+
+_PATH_PARAM = re.compile(r"{(\w+)(?::\w+)?}")
+
+def _route_label(scope) -> str:
+    """Route template with its router prefix (/api/v1/contacts/{loan_id}), or "unmatched" """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # Routes of included routers may only know their path below the prefix;
+    # recover the prefix from the request path
+    params = scope.get("path_params", {})
+    concrete = _PATH_PARAM.sub(lambda match: str(params.get(match.group(1), match.group(0))), template)
+    path = scope.get("path", "")
+    if path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + template
+    return template
+
+class QueryMetricsMiddleware:
+    """
+    Counts and times the SQL each request issues. Adds a Server-Timing header
+    (db total, slowest statement, whole request) and feeds the /metrics
+    histograms and the per-route stats, labelled with the route template so
+    /contacts/17 and /contacts/18 aggregate together.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current.set(queries)
+        started_at = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", queries.server_timing(time.perf_counter() - started_at))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started_at
+            method, route = scope["method"], _route_label(scope)
+            REQUEST_SECONDS.labels(method, route, str(status)).observe(elapsed)
+            REQUEST_QUERIES.labels(method, route).observe(queries.count)
+            REQUEST_DB_SECONDS.labels(method, route).observe(queries.seconds)
+            REQUEST_SLOWEST_SECONDS.labels(method, route).observe(queries.slowest_seconds)
+            REQUEST_ROWS.labels(method, route).observe(queries.rows)
+            route_query_stats.record(f"{method} {route}", queries)
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition; merges all workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        merged = CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)
+        return generate_latest(merged)
+    return generate_latest(registry)
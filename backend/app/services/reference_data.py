@@ -0,0 +1,106 @@
+import threading
+import time
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.repayment_status import RepaymentStatus
+from app.models.contact_calling import ContactCalling
+from app.models.demand_calling import DemandCalling
+from app.models.ownership_type import OwnershipType
+from app.models.branch import Branch
+from app.models.dealer import Dealer
+from app.models.lenders import Lender
+
+logger = logging.getLogger(__name__)
+
+# Reference table name -> (id column, name column)
+REFERENCE_TABLES = {
+    "repayment_status": (RepaymentStatus.id, RepaymentStatus.repayment_status),
+    "contact_calling": (ContactCalling.id, ContactCalling.contact_calling_status),
+    "demand_calling": (DemandCalling.id, DemandCalling.demand_calling_status),
+    "ownership_type": (OwnershipType.id, OwnershipType.ownership_type_name),
+    "branch": (Branch.id, Branch.name),
+    "dealer": (Dealer.id, Dealer.name),
+    "lender": (Lender.id, Lender.name),
+}
+
+def _as_name(value) -> Optional[str]:
+    """Enum columns come back as enum members; store their plain string value"""
+    if value is None:
+        return None
+    return getattr(value, "value", value)
+
+class ReferenceDataRegistry:
+    """
+    Process-wide id <-> name maps for the small lookup tables.
+
+    Loaded once at startup and reloaded from the caller's session when older
+    than settings.REFERENCE_DATA_REFRESH_SECONDS or after invalidate().
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._id_to_name: Dict[str, Dict[int, str]] = {}
+        self._name_to_id: Dict[str, Dict[str, int]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def load(self, db: Session) -> None:
+        """(Re)load every reference table"""
+        id_to_name = {}
+        name_to_id = {}
+        for table, (id_column, name_column) in REFERENCE_TABLES.items():
+            rows = db.query(id_column, name_column).order_by(id_column).all()
+            id_to_name[table] = {row[0]: _as_name(row[1]) for row in rows}
+            names = {}
+            for row in rows:
+                name = _as_name(row[1])
+                if name is not None and name not in names:
+                    names[name] = row[0]
+            name_to_id[table] = names
+
+        with self._lock:
+            self._id_to_name = id_to_name
+            self._name_to_id = name_to_id
+            self._loaded_at = time.monotonic()
+        logger.info("Reference data loaded: %s", {t: len(m) for t, m in id_to_name.items()})
+
+    def invalidate(self) -> None:
+        """Force a reload on next access"""
+        with self._lock:
+            self._loaded_at = None
+
+    def is_stale(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self.is_stale():
+            self.load(db)
+
+    def get_name(self, db: Session, table: str, id_: Optional[int]) -> Optional[str]:
+        """Get the name for an id, or None when unknown"""
+        if id_ is None:
+            return None
+        self._ensure_fresh(db)
+        return self._id_to_name[table].get(id_)
+
+    def get_id(self, db: Session, table: str, name: Optional[str]) -> Optional[int]:
+        """Get the id for a name, or None when unknown"""
+        if name is None:
+            return None
+        self._ensure_fresh(db)
+        return self._name_to_id[table].get(name)
+
+    def get_names(self, db: Session, table: str) -> List[str]:
+        """Get all names in id order"""
+        self._ensure_fresh(db)
+        return [name for name in self._id_to_name[table].values() if name is not None]
+
+    def get_id_map(self, db: Session, table: str) -> Dict[int, str]:
+        """Get a copy of the id -> name map"""
+        self._ensure_fresh(db)
+        return dict(self._id_to_name[table])
+
+reference_data = ReferenceDataRegistry(refresh_seconds=settings.REFERENCE_DATA_REFRESH_SECONDS)
@@ -0,0 +1,177 @@
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.db.engine import sync_database_url
+from app.services.query_metrics import current_request_queries, normalize_statement
+
+logger = logging.getLogger(__name__)
+
+def _crud_function() -> Optional[str]:
+    """The innermost app.crud function on the stack, e.g. app.crud.application_row.get_filtered_applications"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.crud."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+def _shape(value: Any) -> str:
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+def parameter_shape(parameters, executemany: bool) -> Any:
+    """Bound parameter types (and string lengths) without their values"""
+    if executemany:
+        parameters = list(parameters)
+        return {"rows": len(parameters), "row": parameter_shape(parameters[0], False) if parameters else None}
+    if isinstance(parameters, dict):
+        return {key: _shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_shape(value) for value in parameters]
+    return None
+
+class SlowQueryLog:
+    """
+    Statements slower than threshold_ms, newest last, at most size entries.
+
+    Each entry has the normalized SQL, bound parameter shapes (never values),
+    the endpoint and crud function that issued it, and its plan. SELECTs are
+    EXPLAINed after the fact on a separate connection by one background
+    thread, so the request that ran slow is not delayed further; a plan is
+    reused for explain_cache_seconds for the same normalized statement, and
+    explains are skipped while max_pending_explains are already queued.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        size: int,
+        explain: bool,
+        explain_cache_seconds: float = 300,
+        max_pending_explains: int = 10,
+    ):
+        self.threshold_seconds = threshold_ms / 1000
+        self.explain = explain
+        self.explain_cache_seconds = explain_cache_seconds
+        self.max_pending_explains = max_pending_explains
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=size)
+        self._recorded = 0
+        self._plans: Dict[str, tuple] = {}
+        self._pending_explains = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._explain_engines: Dict[str, Engine] = {}
+
+    def observe(self, conn, statement: str, parameters, seconds: float, executemany: bool) -> None:
+        """Statement hook (app.services.query_metrics): keep the statement if it was slow"""
+        if seconds < self.threshold_seconds:
+            return
+
+        queries = current_request_queries()
+        normalized = normalize_statement(statement, max_length=2000)
+        entry = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "duration_ms": round(seconds * 1000, 2),
+            "statement": normalized,
+            "parameters": parameter_shape(parameters, executemany),
+            "endpoint": queries.endpoint if queries is not None else None,
+            "crud_function": _crud_function(),
+            "database": conn.engine.url.render_as_string(hide_password=True),
+            "plan": None,
+            "plan_error": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self._recorded += 1
+        logger.warning(
+            "Slow query %.1f ms at %s (%s): %s",
+            entry["duration_ms"], entry["endpoint"] or "-", entry["crud_function"] or "-", normalized[:500]
+        )
+
+        if self.explain and not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self._explain_later(entry, conn.engine.url, statement, parameters, normalized)
+
+    def _explain_later(self, entry: Dict[str, Any], url, statement: str, parameters, normalized: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._plans.get(normalized)
+            if cached is not None and now - cached[0] < self.explain_cache_seconds:
+                entry["plan"] = cached[1]
+                return
+            if self._pending_explains >= self.max_pending_explains:
+                entry["plan_error"] = "Skipped: too many explains pending"
+                return
+            self._pending_explains += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._executor.submit(self._explain, entry, url, statement, parameters, normalized)
+
+    def _explain_engine(self, url) -> Engine:
+        # A separate NullPool engine: explains never take a connection from the request pools
+        key = sync_database_url(url)
+        if key not in self._explain_engines:
+            self._explain_engines[key] = create_engine(key, poolclass=NullPool)
+        return self._explain_engines[key]
+
+    def _explain(self, entry: Dict[str, Any], url, statement: str, parameters, normalized: str) -> None:
+        plan, error = None, None
+        url = make_url(url)
+        try:
+            if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+                raise ValueError("In-memory SQLite cannot be explained from another connection")
+            with self._explain_engine(url).connect() as connection:
+                if connection.dialect.name == "sqlite":
+                    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                    plan = [row[-1] for row in rows]
+                else:
+                    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                    plan = [{key: str(value) if value is not None else None for key, value in row.items()} for row in rows.mappings()]
+        except Exception as e:
+            error = str(e)[:500]
+        with self._lock:
+            entry["plan"], entry["plan_error"] = plan, error
+            self._pending_explains -= 1
+            if plan is not None:
+                if len(self._plans) > 1000:
+                    self._plans.clear()
+                self._plans[normalized] = (time.monotonic(), plan)
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Newest entries first"""
+        with self._lock:
+            entries = [dict(entry) for entry in reversed(self._entries)]
+            recorded = self._recorded
+        return {
+            "threshold_ms": round(self.threshold_seconds * 1000, 2),
+            "recorded": recorded,
+            "entries": entries[:limit] if limit else entries,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for engine in self._explain_engines.values():
+            engine.dispose()
+        self._explain_engines.clear()
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
@@ -0,0 +1,75 @@
+"""
+Startup work done before a worker accepts traffic, so its first requests do
+not pay for opening connections or loading the process-wide caches.
+"""
+import logging
+from app.core.config import settings
+from app.db.session import SessionLocal, engine, read_engine
+from app.db.async_session import get_async_engine, get_async_read_engine
+from app.services.reference_data import reference_data
+from app.services.filter_options_cache import filter_options_cache
+
+logger = logging.getLogger(__name__)
+
+def _distinct(*engines):
+    return list({id(e): e for e in engines}.values())
+
+def _pool_capacity(db_engine, connections: int) -> int:
+    """connections, capped at the pool's persistent size (overflow connections are not kept)"""
+    pool = getattr(db_engine, "sync_engine", db_engine).pool
+    size = getattr(pool, "size", None)
+    return min(connections, size()) if callable(size) else min(connections, 1)
+
+def open_pool(db_engine, connections: int) -> None:
+    """Check out `connections` connections at once and return them, leaving them open in the pool"""
+    connections = _pool_capacity(db_engine, connections)
+    checked_out = []
+    try:
+        for _ in range(connections):
+            checked_out.append(db_engine.connect())
+    finally:
+        for connection in checked_out:
+            connection.close()
+
+async def open_async_pool(db_engine, connections: int) -> None:
+    connections = _pool_capacity(db_engine, connections)
+    checked_out = []
+    try:
+        for _ in range(connections):
+            checked_out.append(await db_engine.connect())
+    finally:
+        for connection in checked_out:
+            await connection.close()
+
+def warm_caches() -> None:
+    """Load reference data and the filter dropdown options"""
+    db = SessionLocal()
+    try:
+        reference_data.load(db)
+        filter_options_cache.load(db)
+    finally:
+        db.close()
+
+async def warm_up() -> None:
+    """
+    Open pooled connections on the sync and async engines (primary and
+    replica) and fill the caches. Failures are logged, not raised: a worker
+    whose database is briefly unreachable still starts and loads lazily.
+    """
+    connections = settings.WARMUP_DB_CONNECTIONS
+    if connections > 0:
+        for db_engine in _distinct(engine, read_engine):
+            try:
+                open_pool(db_engine, connections)
+            except Exception as e:
+                logger.warning("Connection pool not warmed for %s: %s", db_engine.url, e)
+        try:
+            for db_engine in _distinct(get_async_engine(), get_async_read_engine()):
+                await open_async_pool(db_engine, connections)
+        except Exception as e:
+            logger.warning("Async connection pool not warmed: %s", e)
+
+    try:
+        warm_caches()
+    except Exception as e:
+        logger.warning("Reference data and filter options not loaded at startup: %s", e)
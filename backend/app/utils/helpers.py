@@ -1 +1,54 @@
-# Placeholder for helper functions 
\ No newline at end of file
+import re
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, Any, List
+from app.core.config import settings
+
+def normalize_phone(raw: Optional[str], default_country_code: str = None) -> Optional[str]:
+    """
+    Normalize a phone number to canonical E.164-style digits (no '+').
+
+    "+91 98765-43210", "09876543210", "0091 9876543210" and "9876543210"
+    all become "919876543210". Returns None when too few digits remain.
+    """
+    if not raw:
+        return None
+
+    country_code = default_country_code or settings.PHONE_DEFAULT_COUNTRY_CODE
+    digits = re.sub(r"\D", "", str(raw))
+
+    if digits.startswith("00"):
+        # International dialling prefix
+        digits = digits[2:]
+    elif digits.startswith("0"):
+        # National trunk prefix
+        digits = country_code + digits.lstrip("0")
+    elif len(digits) == 10:
+        digits = country_code + digits
+
+    if len(digits) < 8 or len(digits) > 15:
+        return None
+    return digits
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the last row's keyset values (e.g. sort value, id) as an opaque cursor"""
+    encoded = []
+    for value in values:
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        encoded.append(value)
+    return base64.urlsafe_b64encode(json.dumps(encoded).encode()).decode()
+
+def decode_cursor(cursor: str, *parsers) -> List[Any]:
+    """Decode a cursor from encode_cursor, applying one parser per value"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(parsers):
+            raise ValueError("cursor length mismatch")
+        return [parser(value) for parser, value in zip(parsers, values)]
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Many concurrent dashboard polls served by the async read routes versus the
+same crud calls behind sync routes (the previous implementation), with an
+emulated database round trip per statement.
+
+Sync routes hold a threadpool thread for the whole request, so concurrency
+is capped by the threadpool (40 threads by default) and requests queue for
+a thread. Async routes wait on the event loop; only the driver's I/O runs
+elsewhere (aiosqlite uses one thread per connection, aiomysql none).
+
+    python3 benchmarks/async_concurrency.py --clients 200 --db-latency-ms 5
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+import anyio.to_thread
+import common
+import httpx
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.deps import get_read_db, get_current_user
+from app.core.security import create_access_token
+from app.crud.application_row import get_filtered_applications
+from app.crud.contacts import get_contacts_for_loan
+from app.crud.filter_main import filter_options
+from app.crud.recent_activity import get_recent_activity
+from app.db.engine import pool_metrics
+from pool_sizing import seed
+
+ENDPOINTS = [
+    "/api/v1/applications/?limit=20",
+    "/api/v1/filters/options",
+    "/api/v1/recent-activity/",
+    "/api/v1/contacts/1",
+]
+
+class SlowCursor(sqlite3.Cursor):
+    """Sleeps before each statement to stand in for a network round trip"""
+    latency_seconds = 0.0
+
+    def execute(self, *args):
+        time.sleep(SlowCursor.latency_seconds)
+        return super().execute(*args)
+
+    def executemany(self, *args):
+        time.sleep(SlowCursor.latency_seconds)
+        return super().executemany(*args)
+
+class SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=SlowCursor):
+        return super().cursor(factory)
+
+# The pre-port sync versions of the async read routes
+sync_router = APIRouter()
+
+@sync_router.get("/applications/")
+def sync_applications(limit: int = 20, db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user)):
+    return get_filtered_applications(db, limit=limit)
+
+@sync_router.get("/filters/options")
+def sync_filter_options(db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user)):
+    return filter_options(db)
+
+@sync_router.get("/recent-activity/")
+def sync_recent_activity(db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user)):
+    activities = get_recent_activity(db, loan_id=None, repayment_id=None, limit=50, days_back=30)
+    return {"activities": activities, "total_count": len(activities)}
+
+@sync_router.get("/contacts/{loan_id}")
+def sync_contacts(loan_id: int, db: Session = Depends(get_read_db), current_user: dict = Depends(get_current_user)):
+    return get_contacts_for_loan(db, loan_id)
+
+async def run_mode(app, prefix: str, clients: int, requests_per_client: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {create_access_token(1, claims={'name': 'Admin', 'email': 'admin@bench.local', 'role': 'admin', 'ver': 0})}"}
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    latencies = []
+    statuses = {}
+    peaks = {"threads": threading.active_count(), "threadpool_in_use": 0}
+    done = asyncio.Event()
+
+    async def sample():
+        while not done.is_set():
+            peaks["threads"] = max(peaks["threads"], threading.active_count())
+            peaks["threadpool_in_use"] = max(peaks["threadpool_in_use"], limiter.borrowed_tokens)
+            await asyncio.sleep(0.005)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker(offset: int):
+            for i in range(requests_per_client):
+                started = time.perf_counter()
+                response = await client.get(prefix + ENDPOINTS[(offset + i) % len(ENDPOINTS)], headers=headers)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        await worker(0)  # Warm up
+        latencies.clear()
+        statuses.clear()
+        sampler = asyncio.create_task(sample())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        seconds = time.perf_counter() - started
+        done.set()
+        await sampler
+
+    return {
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(len(latencies) / seconds, 1),
+        "statuses": statuses,
+        "latency": common.percentiles(latencies),
+        "peak_threads": peaks["threads"],
+        "peak_threadpool_in_use": peaks["threadpool_in_use"],
+        "threadpool_size": int(limiter.total_tokens),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent pollers")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per client")
+    parser.add_argument("--db-latency-ms", type=float, default=5, help="Emulated round trip per statement")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=20)
+    parser.add_argument("--loans", type=int, default=200, help="Loans to seed (3 demands each)")
+    parser.add_argument("--output", default=None, help="Write results JSON here as well as stdout")
+    args = parser.parse_args()
+
+    pool_options = {"pool_size": args.pool_size, "max_overflow": args.max_overflow}
+    engine = common.create_benchmark_engine(
+        None, connect_args={"check_same_thread": False, "factory": SlowConnection}, **pool_options
+    )
+    async_engine = common.async_engine_for(engine, connect_args={"factory": SlowConnection}, **pool_options)
+    app, session_factory = common.bind_app(engine)
+    app.include_router(sync_router, prefix="/sync/api/v1")
+    seed(session_factory, args.loans)
+    SlowCursor.latency_seconds = args.db_latency_ms / 1000
+
+    results = {
+        "clients": args.clients, "requests_per_client": args.requests,
+        "db_latency_ms": args.db_latency_ms, "endpoints": ENDPOINTS, "runs": {}
+    }
+    for mode, prefix in (("sync_routes", "/sync"), ("async_routes", "")):
+        engine.pool.metrics.reset()
+        async_engine.sync_engine.pool.metrics.reset()
+        run = common.run_async(engine, run_mode(app, prefix, args.clients, args.requests))
+        run["pool"] = pool_metrics(engine if mode == "sync_routes" else async_engine)
+        results["runs"][mode] = run
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
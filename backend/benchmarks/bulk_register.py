@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+End-to-end time to create a batch of users: the old per-user loop (one email
+lookup, one hash and one commit per user) against POST
+/api/v1/users/bulk-register (one IN query, hashes spread over the bulk
+hashing pool, one multi-row INSERT).
+
+    python3 benchmarks/bulk_register.py --users 1000
+    python3 benchmarks/bulk_register.py --users 1000 --rounds 4   # cheaper bcrypt for quick runs
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import common
+import httpx
+from app.core import security
+from app.core.security import create_access_token, get_password_hash
+from app.crud.user import create_user, get_user_by_email
+from app.models import User
+from app.schemas.user import UserCreate
+from app.services.password_hashing import password_hasher
+
+def make_users(prefix: str, count: int) -> list:
+    return [
+        {
+            "name": f"{prefix} user {i}",
+            "email": f"{prefix}{i}@bench.example.com",
+            "password": "Bulk@12345",
+            "role": "RM",
+        }
+        for i in range(count)
+    ]
+
+def seed_admin(session_factory) -> None:
+    db = session_factory()
+    try:
+        db.add(User(
+            id=1, name="Admin", user_name="admin", password=get_password_hash("Admin@12345"),
+            email="admin@bench.local", role="admin"
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+def run_per_user_loop(session_factory, users: list) -> dict:
+    """The pre-bulk behaviour: check, hash and commit each user in turn"""
+    db = session_factory()
+    created = failed = 0
+    started = time.perf_counter()
+    try:
+        for user_data in users:
+            user = UserCreate(**user_data)
+            if get_user_by_email(db, user.email):
+                failed += 1
+                continue
+            create_user(db, user)
+            created += 1
+    finally:
+        db.close()
+    return {"seconds": round(time.perf_counter() - started, 3), "created": created, "failed": failed}
+
+async def run_bulk_endpoint(app, users: list) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {create_access_token(1, claims={'name': 'Admin', 'email': 'admin@bench.local', 'role': 'admin', 'ver': 0})}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        response = await client.post("/api/v1/users/bulk-register", json={"users": users}, headers=headers)
+        seconds = time.perf_counter() - started
+    response.raise_for_status()
+    body = response.json()
+    return {"seconds": round(seconds, 3), "created": body["success_count"], "failed": body["failed_count"]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Users per batch (max 1000 per request)")
+    parser.add_argument("--rounds", type=int, default=None, help="Override bcrypt cost for both runs")
+    parser.add_argument("--pool-workers", type=int, default=password_hasher.workers, help="Hashing pool size")
+    parser.add_argument("--bulk-workers", type=int, default=password_hasher.bulk_workers, help="Bulk hashing pool size")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--output", default=None, help="Write results JSON here as well as stdout")
+    args = parser.parse_args()
+
+    if args.rounds is not None:
+        security.pwd_context.update(bcrypt__rounds=args.rounds)
+
+    engine = common.create_benchmark_engine(args.database_url)
+    app, session_factory = common.bind_app(engine)
+    seed_admin(session_factory)
+    password_hasher.configure(workers=args.pool_workers, bulk_workers=args.bulk_workers)
+
+    results = {"users": args.users, "pool_workers": args.pool_workers, "bulk_workers": args.bulk_workers, "runs": {}}
+    results["runs"]["per_user_loop"] = run_per_user_loop(session_factory, make_users("loop", args.users))
+    password_hasher.reset_stats()
+    results["runs"]["bulk_endpoint"] = common.run_async(engine, run_bulk_endpoint(app, make_users("bulk", args.users)))
+    results["runs"]["bulk_endpoint"]["hashing_stats"] = password_hasher.stats()
+
+    password_hasher.shutdown()
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Fails when importing the app gets slow or starts doing work at import.
+
+Imports app.main in a fresh interpreter under `python -X importtime`
+(best of --runs) and checks that:
+
+- the whole import stays under --max-ms,
+- the app's own modules (self time of app.*, excluding libraries) stay
+  under --max-app-ms,
+- nothing is printed to stdout,
+- none of LAZY_MODULES is imported. Each of these is loaded on first use.
+- no ORM or engine listener is registered. The app's lifespan installs
+  them (app.main.register_listeners).
+
+A new worker cannot accept traffic until this import finishes. Gunicorn
+preloads the app once in the master, but a fresh container or a
+`--preload`-less run pays the full cost in every process.
+
+    python3 benchmarks/check_import_time.py
+    python3 benchmarks/check_import_time.py --runs 5 --top 30
+
+Exits 1 when a budget is exceeded, something is printed, a lazy module
+is imported, or a listener is registered at import.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use, never by importing the app: async drivers when the
+# async engine is created, tooling by the scripts that need it
+LAZY_MODULES = ("aiosqlite", "aiomysql", "alembic", "httpx", "pytest")
+
+# Run after `import app.main`; prints which of the app's listeners are installed
+_LISTENER_PROBE = """
+import json
+import app.main
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.models import PaymentDetails
+from app.services import payment_audit, phone_index, query_metrics
+print(json.dumps({
+    "query metrics (Engine cursor events)": event.contains(Engine, "before_cursor_execute", query_metrics._before_cursor_execute),
+    "statement hooks (slow-query log)": bool(query_metrics._statement_hooks),
+    "payment audit (mapper events)": event.contains(PaymentDetails, "after_update", payment_audit._after_update),
+    "phone index (mapper events)": phone_index._listeners_registered,
+}))
+"""
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """`-X importtime` lines as {module, self_us, cumulative_us, depth}"""
+    modules = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return modules
+
+def measure(database_url: str) -> Dict[str, Any]:
+    """Import app.main once in a subprocess and summarize the importtime report"""
+    env = dict(os.environ, DATABASE_URL=database_url)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import app.main failed:\n{result.stderr[-2000:]}")
+
+    modules = parse_importtime(result.stderr)
+    app_main = next(m for m in modules if m["module"] == "app.main")
+    own = [m for m in modules if m["module"] == "app" or m["module"].startswith("app.")]
+    return {
+        "total_ms": app_main["cumulative_us"] / 1000,
+        "app_ms": sum(m["self_us"] for m in own) / 1000,
+        "stdout": result.stdout,
+        "modules": modules,
+    }
+
+def listeners_at_import(database_url: str) -> List[str]:
+    """The app listeners that importing app.main leaves installed"""
+    env = dict(os.environ, DATABASE_URL=database_url)
+    result = subprocess.run(
+        [sys.executable, "-c", _LISTENER_PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"listener probe failed:\n{result.stderr[-2000:]}")
+    return [name for name, registered in json.loads(result.stdout.splitlines()[-1]).items() if registered]
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite://",
+                        help="DATABASE_URL for the import; nothing connects (default: in-memory SQLite)")
+    parser.add_argument("--runs", type=int, default=3, help="Imports to run; the fastest counts")
+    parser.add_argument("--max-ms", type=float, default=2000, help="Budget for the whole import of app.main")
+    parser.add_argument("--max-app-ms", type=float, default=400, help="Budget for the app's own modules")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list in the report")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.database_url) for _ in range(max(1, args.runs))]
+    best = min(runs, key=lambda run: run["total_ms"])
+    imported = {m["module"] for m in best["modules"]}
+
+    failures = []
+    if best["total_ms"] > args.max_ms:
+        failures.append(f"import app.main took {best['total_ms']:.0f} ms (budget {args.max_ms:.0f} ms)")
+    if best["app_ms"] > args.max_app_ms:
+        failures.append(f"app modules took {best['app_ms']:.0f} ms (budget {args.max_app_ms:.0f} ms)")
+    if any(run["stdout"] for run in runs):
+        failures.append(f"import printed to stdout: {best['stdout'].strip()[:200]!r}")
+    for module in LAZY_MODULES:
+        if module in imported:
+            failures.append(f"{module} is imported at startup")
+    listeners = listeners_at_import(args.database_url)
+    for name in listeners:
+        failures.append(f"{name} registered at import")
+
+    slowest = sorted(best["modules"], key=lambda m: m["self_us"], reverse=True)[:args.top]
+    print(json.dumps({
+        "total_ms": round(best["total_ms"], 1),
+        "app_ms": round(best["app_ms"], 1),
+        "runs_ms": [round(run["total_ms"], 1) for run in runs],
+        "modules_imported": len(imported),
+        "listeners_at_import": listeners,
+        "slowest_modules": [
+            {"module": m["module"], "self_ms": round(m["self_us"] / 1000, 1), "cumulative_ms": round(m["cumulative_us"] / 1000, 1)}
+            for m in slowest
+        ],
+        "failed": failures,
+    }, indent=2))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Shared setup for the benchmark scripts: an isolated database, the app wired
+to it, and percentile helpers. Benchmarks never touch settings.DATABASE_URL.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Depends
+from sqlalchemy.orm import sessionmaker
+from app.db.engine import create_db_engine, create_async_db_engine
+from app.models import Base
+from app.services.comment_search import ensure_search_index
+
+def create_benchmark_engine(database_url: Optional[str] = None, **pool_options):
+    """
+    Engine for database_url, or a fresh SQLite file in a temp directory, built
+    by the app's engine factory; pool_options override the DB_POOL_* settings
+    """
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="prosparity-bench-"), "bench.db")
+        database_url = f"sqlite:///{path}"
+
+    engine = create_db_engine(database_url, **pool_options)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        ensure_search_index(connection)
+    return engine
+
+_async_engines = {}
+
+def async_engine_for(engine, **pool_options):
+    """The async engine bind_app uses for engine's database (created once per engine)"""
+    if engine not in _async_engines:
+        _async_engines[engine] = create_async_db_engine(
+            engine.url.render_as_string(hide_password=False), **pool_options
+        )
+    return _async_engines[engine]
+
+def run_async(engine, coroutine):
+    """
+    asyncio.run(coroutine), closing the async engine's connections before the
+    loop ends: async pool connections cannot be reused from another loop
+    """
+    async def run():
+        try:
+            return await coroutine
+        finally:
+            await async_engine_for(engine).dispose()
+
+    return asyncio.run(run())
+
+def bind_app(engine):
+    """
+    Point the app's sync and async database dependencies at engine's
+    database and install the listeners its lifespan would; returns (app,
+    session factory)
+    """
+    from app.main import app, register_listeners
+    from app.core.deps import get_db, get_read_db, get_current_user, get_async_db, get_async_read_db
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_benchmark_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def get_benchmark_read_db(current_user: dict = Depends(get_current_user)):
+        yield from get_benchmark_db()
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    app.dependency_overrides[get_read_db] = get_benchmark_read_db
+
+    # Async routes get an async engine on the same database
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    async_session_factory = async_sessionmaker(async_engine_for(engine), autoflush=False, expire_on_commit=False)
+
+    async def get_benchmark_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = get_benchmark_async_db
+    app.dependency_overrides[get_async_read_db] = get_benchmark_async_db
+    register_listeners()
+    return app, session_factory
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max in milliseconds for samples given in seconds"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Dashboard latency during a login burst, with bcrypt hashed inline on the
+shared threadpool (--workers 0, the old behaviour) and in the dedicated
+password hashing pool.
+
+    python3 benchmarks/login_burst.py --logins 200 --pool-workers 4
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import common
+import httpx
+from app.core.security import get_password_hash, create_access_token
+from app.models import User, RepaymentStatus, Branch, Dealer, Lender
+from app.services.password_hashing import password_hasher
+
+PASSWORD = "Burst@12345"
+
+def seed(session_factory, users: int) -> None:
+    db = session_factory()
+    try:
+        for index, name in enumerate(["Future", "Partially Paid", "Paid", "Overdue", "Foreclose"], 1):
+            db.add(RepaymentStatus(id=index, repayment_status=name))
+        db.add(Branch(id=1, name="Branch 1"))
+        db.add(Dealer(id=1, name="Dealer 1"))
+        db.add(Lender(id=1, name="Lender 1"))
+        hashed = get_password_hash(PASSWORD)  # One hash reused; verification cost is the same
+        for user_id in range(1, users + 1):
+            db.add(User(
+                id=user_id, name=f"Agent {user_id}", user_name=f"agent{user_id}",
+                password=hashed, email=f"agent{user_id}@bench.local",
+                role="admin" if user_id == 1 else "RM"
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+async def run_scenario(app, logins: int, dashboard_clients: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {create_access_token(1, claims={'name': 'Agent 1', 'email': 'agent1@bench.local', 'role': 'admin', 'ver': 0})}"}
+    dashboard_latencies = []
+    login_latencies = []
+    login_statuses = {}
+    burst_done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login(user_id: int):
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/v1/users/login",
+                data={"username": f"agent{user_id}@bench.local", "password": PASSWORD}
+            )
+            login_latencies.append(time.perf_counter() - started)
+            login_statuses[response.status_code] = login_statuses.get(response.status_code, 0) + 1
+
+        async def dashboard():
+            while not burst_done.is_set():
+                started = time.perf_counter()
+                response = await client.get("/api/v1/filters/options", headers=headers)
+                response.raise_for_status()
+                dashboard_latencies.append(time.perf_counter() - started)
+
+        # Warm up reference data and connections
+        await client.get("/api/v1/filters/options", headers=headers)
+
+        pollers = [asyncio.create_task(dashboard()) for _ in range(dashboard_clients)]
+        started = time.perf_counter()
+        await asyncio.gather(*(login((i % logins) + 1) for i in range(logins)))
+        burst_seconds = time.perf_counter() - started
+        burst_done.set()
+        await asyncio.gather(*pollers)
+
+    return {
+        "burst_seconds": round(burst_seconds, 3),
+        "login_statuses": login_statuses,
+        "login_latency": common.percentiles(login_latencies),
+        "dashboard_latency": common.percentiles(dashboard_latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200, help="Concurrent logins in the burst")
+    parser.add_argument("--dashboard-clients", type=int, default=4, help="Concurrent dashboard pollers")
+    parser.add_argument("--pool-workers", type=int, default=password_hasher.workers, help="Hashing pool size for the 'after' run")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--output", default=None, help="Write results JSON here as well as stdout")
+    args = parser.parse_args()
+
+    engine = common.create_benchmark_engine(args.database_url)
+    app, session_factory = common.bind_app(engine)
+    seed(session_factory, args.logins)
+
+    results = {"logins": args.logins, "dashboard_clients": args.dashboard_clients, "runs": {}}
+    for label, workers in (("inline_threadpool", 0), ("hashing_pool", args.pool_workers)):
+        # Let the burst queue rather than be rejected
+        password_hasher.configure(workers=workers, max_pending=max(password_hasher.max_pending, args.logins))
+        password_hasher.reset_stats()
+        run = common.run_async(engine, run_scenario(app, args.logins, args.dashboard_clients))
+        run["hashing_stats"] = password_hasher.stats()
+        results["runs"][label] = run
+
+    password_hasher.shutdown()
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
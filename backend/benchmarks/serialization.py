@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Serialization time and bytes on the wire for the application list.
+
+Encoders: one page of get_filtered_applications output (--page-sizes rows)
+encoded four ways, each timed as the median of --iterations runs.
+
+- model_json: validate into AppplicationFilterResponse, model_dump, then
+  stdlib json. This is the path on FastAPI releases before dump_json.
+- model_dump_json: validate, then pydantic's Rust serializer. This is
+  FastAPI's current default for response_model routes.
+- orjson and msgpack: the crud data encoded directly (app.core.responses).
+
+Each encoded body is also compressed with gzip (GZIP_LEVEL) and Brotli
+(BROTLI_QUALITY) to give its size and compression time. The orjson and
+msgpack output must decode to the same document as the validated model.
+Otherwise the direct path would change the API, and the script exits 1.
+
+HTTP: GET /api/v1/applications/ in-process for each page size, with JSON or
+MessagePack and identity, gzip or br. Reports p50 latency and Content-Length.
+
+    python3 benchmarks/serialization.py
+    python3 benchmarks/serialization.py --loans 5000 --page-sizes 100 1000 --output serialization.json
+"""
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import brotli
+import common
+import httpx
+import msgpack
+import orjson
+from portfolio import ADMIN_EMAIL, seed_portfolio
+from app.core.config import settings
+from app.core.responses import MsgPackResponse, ORJSONResponse
+from app.core.security import create_access_token
+from app.crud.application_row import get_filtered_applications
+from app.schemas.application_row import AppplicationFilterResponse
+
+# (name, Accept, Accept-Encoding) for the HTTP comparison
+HTTP_VARIANTS = (
+    ("json", "application/json", "identity"),
+    ("json+gzip", "application/json", "gzip"),
+    ("json+br", "application/json", "br"),
+    ("msgpack", "application/msgpack", "identity"),
+    ("msgpack+br", "application/msgpack", "br"),
+)
+
+def _median_ms(function: Callable[[], Any], iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1000, 2)
+
+def _encoders(data: Dict[str, Any]) -> Dict[str, Callable[[], bytes]]:
+    return {
+        "model_json": lambda: json.dumps(AppplicationFilterResponse.model_validate(data).model_dump(mode="json")).encode(),
+        "model_dump_json": lambda: AppplicationFilterResponse.model_validate(data).model_dump_json().encode(),
+        "orjson": lambda: ORJSONResponse(data).body,
+        "msgpack": lambda: MsgPackResponse(data).body,
+    }
+
+def compare_encoders(data: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    expected = json.loads(AppplicationFilterResponse.model_validate(data).model_dump_json())
+    results = {}
+    for name, encode in _encoders(data).items():
+        body = encode()
+        decoded = msgpack.unpackb(body) if name == "msgpack" else orjson.loads(body)
+        results[name] = {
+            "encode_ms": _median_ms(encode, iterations),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, settings.GZIP_LEVEL)),
+            "gzip_ms": _median_ms(lambda: gzip.compress(body, settings.GZIP_LEVEL), iterations),
+            "br_bytes": len(brotli.compress(body, quality=settings.BROTLI_QUALITY)),
+            "br_ms": _median_ms(lambda: brotli.compress(body, quality=settings.BROTLI_QUALITY), iterations),
+            "matches_model": decoded == expected,
+        }
+    return results
+
+async def compare_http(app, page_sizes: List[int], iterations: int) -> Dict[str, Any]:
+    token = create_access_token(1, claims={"name": "User 1", "email": ADMIN_EMAIL, "role": "admin", "ver": 0})
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    results: Dict[str, Any] = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for page_size in page_sizes:
+            for name, accept, accept_encoding in HTTP_VARIANTS:
+                headers = {"Authorization": f"Bearer {token}", "Accept": accept, "Accept-Encoding": accept_encoding}
+                latencies, response = [], None
+                for i in range(iterations + 1):
+                    started = time.perf_counter()
+                    response = await client.get("/api/v1/applications/", params={"limit": page_size}, headers=headers)
+                    if i:
+                        latencies.append(time.perf_counter() - started)
+                results[f"{page_size} rows {name}"] = {
+                    "status": response.status_code,
+                    "content_type": response.headers.get("content-type"),
+                    "content_encoding": response.headers.get("content-encoding", "identity"),
+                    "wire_bytes": int(response.headers.get("content-length", len(response.content))),
+                    "latency": common.percentiles(latencies),
+                }
+    return results
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Empty database to seed (default: a fresh SQLite file)")
+    parser.add_argument("--loans", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic portfolio")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--iterations", type=int, default=20, help="Runs per encoder")
+    parser.add_argument("--http-iterations", type=int, default=5, help="Requests per HTTP variant")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    engine = common.create_benchmark_engine(args.database_url)
+    seed_portfolio(engine, loans=args.loans, seed=args.seed)
+    app, session_factory = common.bind_app(engine)
+
+    encoders = {}
+    db = session_factory()
+    try:
+        for page_size in args.page_sizes:
+            data = get_filtered_applications(db, limit=page_size)
+            encoders[f"{page_size} rows"] = {"rows": len(data["results"]), **compare_encoders(data, args.iterations)}
+    finally:
+        db.close()
+    http = common.run_async(engine, compare_http(app, args.page_sizes, args.http_iterations))
+
+    mismatched = [
+        f"{page} {name}" for page, result in encoders.items()
+        for name, encoded in result.items() if isinstance(encoded, dict) and not encoded["matches_model"]
+    ]
+    report = {
+        "dialect": engine.dialect.name,
+        "loans": args.loans,
+        "gzip_level": settings.GZIP_LEVEL,
+        "brotli_quality": settings.BROTLI_QUALITY,
+        "encoders": encoders,
+        "http": http,
+        "mismatched": mismatched,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    engine.dispose()
+    return 1 if mismatched else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Production server settings. Gunicorn reads this file when started from the
+backend directory:
+
+    gunicorn app.main:app
+
+Each worker runs the app's lifespan (app.services.warmup) before it accepts
+connections. Every worker has its own connection pools, so the database sees
+up to workers x 2 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections (sync and
+async engines). Unless WEB_CONCURRENCY is set, workers default to one per
+core, capped so that this fits DB_MAX_CONNECTIONS. An explicit
+WEB_CONCURRENCY that does not fit stops the server at startup.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+def _connections_per_worker() -> int:
+    from app.core.config import settings
+    from app.db.engine import connections_per_process
+
+    return max(
+        connections_per_process(settings.DATABASE_URL),
+        connections_per_process(settings.DATABASE_READ_URL or settings.DATABASE_URL),
+    )
+
+def _default_workers() -> int:
+    """One per core, but no more than DB_MAX_CONNECTIONS has connections for"""
+    from app.core.config import settings
+
+    per_worker = _connections_per_worker()
+    if not settings.DB_MAX_CONNECTIONS or not per_worker:
+        return multiprocessing.cpu_count()
+    return max(1, min(multiprocessing.cpu_count(), settings.DB_MAX_CONNECTIONS // per_worker))
+
+# Uvicorn workers run the ASGI app on an event loop, so one per core keeps
+# every core busy; sync routes use each worker's threadpool (THREADPOOL_SIZE)
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY") or _default_workers())
+
+# Import the app once in the master and fork it, so workers share its memory
+# and an import error stops the server instead of every worker crash-looping
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# A worker silent for `timeout` seconds is restarted; on shutdown and reload,
+# workers get `graceful_timeout` seconds to finish in-flight requests
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+def on_starting(server):
+    from app.core.config import settings
+    from app.db.engine import connections_per_process
+
+    for name, url in (("DATABASE_URL", settings.DATABASE_URL), ("DATABASE_READ_URL", settings.DATABASE_READ_URL)):
+        if not url or not settings.DB_MAX_CONNECTIONS:
+            continue
+        needed = server.cfg.workers * connections_per_process(url)
+        if needed > settings.DB_MAX_CONNECTIONS:
+            raise RuntimeError(
+                f"{server.cfg.workers} workers x {connections_per_process(url)} connections each can open "
+                f"{needed} connections to the {name} server, over DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS}. "
+                "Lower WEB_CONCURRENCY, DB_POOL_SIZE or DB_MAX_OVERFLOW, or raise DB_MAX_CONNECTIONS "
+                "to match the server's max_connections."
+            )
+
+def post_fork(server, worker):
+    # The preloaded engines must not hand a connection inherited from the
+    # master to a worker; drop them without closing the master's sockets
+    from app.db.session import engine, read_engine
+
+    engine.dispose(close=False)
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
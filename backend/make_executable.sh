@@ -3,7 +3,7 @@
 echo "🔧 Making scripts executable..."
 
 # Make backend script executable
-chmod +x start_network.sh
+chmod +x start_network.sh start_prod.sh
 echo "✅ Backend script is now executable"
 
 # Make frontend script executable (if it exists)
@@ -15,4 +15,5 @@ fi
 echo "🎉 All scripts are now executable!"
 echo ""
 echo "To start backend: ./start_network.sh"
+echo "To start backend in production: ./start_prod.sh"
 echo "To start frontend: cd ../Front-end && ./start_network.sh"
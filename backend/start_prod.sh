@@ -0,0 +1,22 @@
+#!/bin/bash
+
+# Prosparity Collection Dashboard Backend - production server
+# Gunicorn with uvicorn workers; settings in gunicorn.conf.py and env.example
+
+if [ ! -f "app/main.py" ]; then
+    echo "❌ Error: Please run this script from the backend directory"
+    exit 1
+fi
+
+if [ -d "venv" ]; then
+    source venv/bin/activate
+fi
+
+# Metric files from the previous run would be merged into /metrics
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+echo "🚀 Starting Prosparity backend with gunicorn on ${BIND:-0.0.0.0:8000}"
+exec gunicorn app.main:app -c gunicorn.conf.py